@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Benchmark Face Detector - Membandingkan backend Haar Cascade dengan model DNN (YuNet / SSD)
+Script ini menjalankan setiap backend pada gambar sampel lokal dan melaporkan
+latency, jumlah wajah dan kecocokan deteksi terhadap backend acuan
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Import modul dari src/
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from detection.face_detector import FaceDetector
+
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def load_images(sample_dir, max_images):
+    """
+    Memuat gambar sampel dari direktori
+    
+    Args:
+        sample_dir: Direktori berisi gambar (.jpg/.png)
+        max_images: Jumlah gambar maksimal
+    
+    Returns:
+        List (nama file, gambar BGR)
+    """
+    images = []
+    for path in sorted(Path(sample_dir).iterdir()):
+        if len(images) >= max_images:
+            break
+        if path.suffix.lower() in IMAGE_EXTENSIONS:
+            image = cv2.imread(str(path))
+            if image is not None:
+                images.append((path.name, image))
+    return images
+
+
+def benchmark(detector, images, warmup=3):
+    """
+    Jalankan deteksi wajah pada semua gambar dan ukur latency
+    
+    Returns:
+        Tuple (wajah per gambar, statistik latency dalam ms)
+    """
+    for _, image in images[:warmup]:
+        detector.detect_faces(image)
+    
+    faces, latencies = [], []
+    for _, image in images:
+        start = time.perf_counter()
+        faces.append(detector.detect_faces(image))
+        latencies.append((time.perf_counter() - start) * 1000)
+    
+    latencies = np.array(latencies)
+    return faces, {
+        'mean_ms': round(float(latencies.mean()), 2),
+        'p50_ms': round(float(np.percentile(latencies, 50)), 2),
+        'p95_ms': round(float(np.percentile(latencies, 95)), 2)
+    }
+
+
+def iou(a, b):
+    """IoU dua box (x, y, w, h)"""
+    inter_w = min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0])
+    inter_h = min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1])
+    if inter_w <= 0 or inter_h <= 0:
+        return 0.0
+    inter = inter_w * inter_h
+    return inter / (a[2] * a[3] + b[2] * b[3] - inter)
+
+
+def agreement(reference, candidate, threshold=0.3):
+    """
+    Kecocokan deteksi kandidat terhadap acuan per gambar (greedy IoU)
+    
+    Returns:
+        Dictionary matched, only_reference, only_candidate
+    """
+    matched = only_reference = only_candidate = 0
+    for reference_faces, candidate_faces in zip(reference, candidate):
+        used = set()
+        for face in reference_faces:
+            best, best_iou = None, threshold
+            for index, other in enumerate(candidate_faces):
+                score = iou(face, other)
+                if index not in used and score >= best_iou:
+                    best, best_iou = index, score
+            if best is None:
+                only_reference += 1
+            else:
+                used.add(best)
+                matched += 1
+        only_candidate += len(candidate_faces) - len(used)
+    
+    return {'matched': matched, 'only_reference': only_reference, 'only_candidate': only_candidate}
+
+
+def main():
+    """Fungsi main"""
+    parser = argparse.ArgumentParser(description="Benchmark backend face detector (Haar vs DNN)")
+    parser.add_argument("--samples", default="data/faces", help="Direktori gambar sampel")
+    parser.add_argument("--backends", default="haar,yunet", help="Backend dipisah koma (haar, yunet, ssd)")
+    parser.add_argument("--yunet-model", help="Path model YuNet")
+    parser.add_argument("--ssd-model", help="Path model SSD .caffemodel (deploy.prototxt di direktori yang sama)")
+    parser.add_argument("--input-size", type=int, default=320, help="Ukuran input model DNN")
+    parser.add_argument("--score-threshold", type=float, default=0.6, help="Confidence minimal DNN")
+    parser.add_argument("--max-images", type=int, default=200, help="Gambar sampel maksimal")
+    parser.add_argument("--output", default="face_detector_benchmark.json", help="Path laporan JSON")
+    args = parser.parse_args()
+    
+    print("="*60)
+    print("🙂 BENCHMARK FACE DETECTOR")
+    print("="*60)
+    
+    if not Path(args.samples).is_dir():
+        print(f"❌ Error: direktori sampel {args.samples} tidak ditemukan")
+        print("   Isi dengan snapshot (.jpg) dari kamera sendiri, termasuk wajah samping dan malam hari")
+        sys.exit(1)
+    
+    images = load_images(args.samples, args.max_images)
+    if not images:
+        print(f"❌ Error: tidak ada gambar di {args.samples}")
+        sys.exit(1)
+    print(f"📁 {len(images)} gambar sampel")
+    
+    model_paths = {'yunet': args.yunet_model, 'ssd': args.ssd_model}
+    results = {}
+    for backend in [b.strip() for b in args.backends.split(',') if b.strip()]:
+        detector = FaceDetector(
+            backend=backend,
+            model_path=model_paths.get(backend),
+            input_size=args.input_size,
+            score_threshold=args.score_threshold
+        )
+        if detector.backend != backend:
+            print(f"⚠️  Model {backend} tidak bisa dimuat, dilewati")
+            continue
+        
+        print(f"⏱️  Benchmark {backend}...")
+        faces, latency = benchmark(detector, images)
+        results[backend] = {
+            'faces': faces,
+            'latency': latency,
+            'total_faces': sum(len(f) for f in faces),
+            'images_with_faces': sum(1 for f in faces if f)
+        }
+    
+    if not results:
+        print("❌ Error: tidak ada backend yang bisa dijalankan")
+        sys.exit(1)
+    
+    reference = next(iter(results))
+    report = {
+        'samples': args.samples,
+        'images': len(images),
+        'input_size': args.input_size,
+        'reference': reference,
+        'backends': {}
+    }
+    for backend, result in results.items():
+        report['backends'][backend] = {
+            'latency': result['latency'],
+            'total_faces': result['total_faces'],
+            'images_with_faces': result['images_with_faces'],
+            'agreement_vs_reference': agreement(results[reference]['faces'], result['faces'])
+        }
+    # Gambar yang hasilnya berbeda, untuk diperiksa manual
+    report['disagreements'] = [
+        name for index, (name, _) in enumerate(images)
+        if len({len(result['faces'][index]) for result in results.values()}) > 1
+    ]
+    
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    
+    # Print ringkasan
+    print("\n" + "="*60)
+    print("📋 LAPORAN FACE DETECTOR")
+    print("="*60)
+    print(f"{'Backend':10}{'Mean ms':>10}{'P95 ms':>10}{'Wajah':>8}{'Gambar':>8}{'Cocok':>8}{'Baru':>8}")
+    for backend, data in report['backends'].items():
+        match = data['agreement_vs_reference']
+        print(
+            f"{backend:10}{data['latency']['mean_ms']:>10}{data['latency']['p95_ms']:>10}"
+            f"{data['total_faces']:>8}{data['images_with_faces']:>8}{match['matched']:>8}{match['only_candidate']:>8}"
+        )
+    print("-"*60)
+    print(f"Acuan: {reference}; 'Baru' = wajah yang tidak ditemukan acuan (bisa wajah samping atau false positive)")
+    print(f"{len(report['disagreements'])} gambar dengan jumlah wajah berbeda antar backend")
+    print("="*60)
+    print(f"💾 Laporan disimpan ke: {args.output}")
+    print("\n🔄 Aktifkan dengan detection.face_detector_backend di config.yaml")
+
+
+if __name__ == "__main__":
+    main()
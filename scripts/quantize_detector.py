@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Quantize Detector - Membuat model YOLO ONNX INT8 (kuantisasi statis) dan laporan perbandingan
+Script ini mengkalibrasi model dengan frame dari direktori sampel lokal, lalu
+membandingkan akurasi (proxy mAP), latency per frame dan memori terhadap model FP32
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+import yaml
+
+# Import modul dari src/
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from detection.person_detector import PersonDetector
+
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mkv', '.mov')
+
+
+def load_config(config_path):
+    """
+    Load section detection dari config.yaml (atau template)
+    
+    Args:
+        config_path: Path ke config.yaml
+    
+    Returns:
+        Dictionary section detection
+    """
+    for path in (Path(config_path), Path("config/config.yaml.template")):
+        if path.exists():
+            with open(path, 'r') as f:
+                return (yaml.safe_load(f) or {}).get('detection', {})
+    return {}
+
+
+def load_sample_frames(sample_dir, max_frames, video_stride=25):
+    """
+    Memuat frame sampel dari gambar dan/atau video di direktori
+    
+    Args:
+        sample_dir: Direktori berisi gambar (.jpg/.png) atau rekaman (.mp4)
+        max_frames: Jumlah frame maksimal
+        video_stride: Ambil satu frame setiap N frame video
+    
+    Returns:
+        List frame BGR
+    """
+    frames = []
+    for path in sorted(Path(sample_dir).iterdir()):
+        if len(frames) >= max_frames:
+            break
+        
+        suffix = path.suffix.lower()
+        if suffix in IMAGE_EXTENSIONS:
+            frame = cv2.imread(str(path))
+            if frame is not None:
+                frames.append(frame)
+        elif suffix in VIDEO_EXTENSIONS:
+            cap = cv2.VideoCapture(str(path))
+            index = 0
+            while len(frames) < max_frames:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if index % video_stride == 0:
+                    frames.append(frame)
+                index += 1
+            cap.release()
+    
+    return frames
+
+
+class FrameCalibrationReader:
+    """CalibrationDataReader ONNX Runtime dari frame sampel (preprocessing sama dengan runtime)"""
+    
+    def __init__(self, detector, frames, input_name, input_size):
+        """
+        Args:
+            detector: PersonDetector FP32 (dipakai untuk preprocess)
+            frames: List frame BGR kalibrasi
+            input_name: Nama input model
+            input_size: Ukuran input model
+        """
+        self.detector = detector
+        self.frames = frames
+        self.input_name = input_name
+        self.input_size = input_size
+        self.index = 0
+    
+    def get_next(self):
+        if self.index >= len(self.frames):
+            return None
+        blob = self.detector.preprocess(self.frames[self.index], self.input_size)[0]
+        self.index += 1
+        return {self.input_name: blob}
+    
+    def rewind(self):
+        self.index = 0
+
+
+def head_nodes(model_path):
+    """
+    Nama node decoding head YOLOv8 (DFL dan penggabungan box/skor)
+    
+    Node ini sensitif terhadap presisi koordinat box sehingga dibiarkan FP32.
+    
+    Args:
+        model_path: Path model ONNX FP32
+    
+    Returns:
+        List nama node
+    """
+    import onnx
+    
+    model = onnx.load(model_path)
+    decode_ops = {'Concat', 'Split', 'Sigmoid', 'Softmax', 'Mul', 'Add', 'Sub', 'Div', 'Reshape', 'Transpose'}
+    return [
+        node.name for node in model.graph.node
+        if node.name.startswith('/model.22/') and node.op_type in decode_ops
+    ]
+
+
+def quantize(fp32_path, int8_path, reader, per_channel, exclude_head):
+    """
+    Kuantisasi statis QDQ (aktivasi uint8, bobot int8)
+    
+    Args:
+        fp32_path: Path model FP32
+        int8_path: Path output INT8
+        reader: CalibrationDataReader
+        per_channel: Kuantisasi bobot per channel
+        exclude_head: Biarkan node decoding head tetap FP32
+    """
+    from onnxruntime.quantization import CalibrationMethod, QuantFormat, QuantType, quantize_static
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+    
+    # Pre-processing (shape inference + optimasi graph) dianjurkan sebelum kuantisasi
+    prepared_path = str(Path(int8_path).with_suffix('.prep.onnx'))
+    try:
+        quant_pre_process(fp32_path, prepared_path)
+        source_path = prepared_path
+    except Exception as e:
+        print(f"⚠️  Pre-processing dilewati: {str(e)}")
+        source_path = fp32_path
+    
+    nodes_to_exclude = head_nodes(source_path) if exclude_head else []
+    print(f"🔧 Kuantisasi ({len(nodes_to_exclude)} node head tetap FP32)...")
+    
+    quantize_static(
+        source_path,
+        int8_path,
+        reader,
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=per_channel,
+        calibrate_method=CalibrationMethod.MinMax,
+        nodes_to_exclude=nodes_to_exclude
+    )
+    
+    if source_path == prepared_path:
+        os.remove(prepared_path)
+
+
+def rss_mb():
+    """RSS proses saat ini (MB) dari /proc"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError):
+        return 0.0
+
+
+def load_detector(model_size, model_path, max_cpu_cores, inference_size, quantized):
+    """
+    Memuat PersonDetector ONNX dan mengukur kenaikan memori
+    
+    Returns:
+        Tuple (detector, kenaikan RSS dalam MB)
+    """
+    before = rss_mb()
+    detector = PersonDetector(
+        confidence_threshold=0.25,
+        model_size=model_size,
+        max_cpu_cores=max_cpu_cores,
+        inference_size=inference_size,
+        backend=PersonDetector.BACKEND_ONNX,
+        onnx_model_path=model_path,
+        quantized=quantized
+    )
+    return detector, rss_mb() - before
+
+
+def iou(a, b):
+    """IoU dua box (x, y, w, h, ...)"""
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[0] + a[2], b[0] + b[2]), min(a[1] + a[3], b[1] + b[3])
+    inter = max(0, x2 - x1) * max(0, y2 - y1)
+    union = a[2] * a[3] + b[2] * b[3] - inter
+    return inter / union if union > 0 else 0.0
+
+
+def average_precision(reference, predictions, iou_threshold=0.5):
+    """
+    Proxy mAP: AP@0.5 deteksi INT8 dengan deteksi FP32 sebagai ground truth
+    
+    Args:
+        reference: List deteksi FP32 per frame
+        predictions: List deteksi INT8 per frame
+        iou_threshold: IoU minimum untuk dianggap match
+    
+    Returns:
+        Dictionary ap50, precision, recall, mean_iou
+    """
+    total_reference = sum(len(r) for r in reference)
+    scored = []  # (confidence, true_positive, iou)
+    
+    for ref_boxes, pred_boxes in zip(reference, predictions):
+        matched = set()
+        for pred in sorted(pred_boxes, key=lambda p: p[4], reverse=True):
+            best_iou, best_index = 0.0, -1
+            for index, ref in enumerate(ref_boxes):
+                if index in matched:
+                    continue
+                overlap = iou(pred, ref)
+                if overlap > best_iou:
+                    best_iou, best_index = overlap, index
+            if best_iou >= iou_threshold:
+                matched.add(best_index)
+                scored.append((pred[4], True, best_iou))
+            else:
+                scored.append((pred[4], False, 0.0))
+    
+    if total_reference == 0:
+        return {'ap50': 1.0 if not scored else 0.0, 'precision': 0.0, 'recall': 0.0, 'mean_iou': 0.0}
+    
+    scored.sort(key=lambda s: s[0], reverse=True)
+    true_positives = np.cumsum([s[1] for s in scored]) if scored else np.zeros(1)
+    false_positives = np.cumsum([not s[1] for s in scored]) if scored else np.zeros(1)
+    recall = true_positives / total_reference
+    precision = true_positives / np.maximum(true_positives + false_positives, 1)
+    
+    # Interpolasi 101 titik seperti COCO
+    ap = 0.0
+    for level in np.linspace(0, 1, 101):
+        above = precision[recall >= level]
+        ap += above.max() if above.size else 0.0
+    
+    matched_ious = [s[2] for s in scored if s[1]]
+    return {
+        'ap50': round(ap / 101, 4),
+        'precision': round(float(precision[-1]), 4),
+        'recall': round(float(recall[-1]), 4),
+        'mean_iou': round(float(np.mean(matched_ious)), 4) if matched_ious else 0.0
+    }
+
+
+def benchmark(detector, frames, confidence, warmup=5):
+    """
+    Jalankan deteksi pada semua frame dan ukur latency
+    
+    Returns:
+        Tuple (deteksi per frame, statistik latency dalam ms)
+    """
+    for frame in frames[:warmup]:
+        detector.detect_persons(frame, confidence_threshold=confidence)
+    
+    detections, latencies = [], []
+    for frame in frames:
+        start = time.perf_counter()
+        detections.append(detector.detect_persons(frame, confidence_threshold=confidence))
+        latencies.append((time.perf_counter() - start) * 1000)
+    
+    latencies = np.array(latencies)
+    return detections, {
+        'mean_ms': round(float(latencies.mean()), 2),
+        'p50_ms': round(float(np.percentile(latencies, 50)), 2),
+        'p95_ms': round(float(np.percentile(latencies, 95)), 2)
+    }
+
+
+def main():
+    """Fungsi main"""
+    parser = argparse.ArgumentParser(description="Buat model detektor ONNX INT8 dan laporan perbandingan")
+    parser.add_argument("--config", default="config/config.yaml", help="Path config.yaml")
+    parser.add_argument("--samples", default="data/calibration", help="Direktori frame/rekaman sampel")
+    parser.add_argument("--model-size", help="Model YOLO (default: detection.model_size)")
+    parser.add_argument("--imgsz", type=int, help="Ukuran input (default: detection.inference_size)")
+    parser.add_argument("--max-frames", type=int, default=300, help="Frame sampel maksimal")
+    parser.add_argument("--eval-every", type=int, default=4, help="Setiap frame ke-N dipakai untuk evaluasi, sisanya kalibrasi")
+    parser.add_argument("--confidence", type=float, help="Confidence evaluasi (default: detection.min_confidence)")
+    parser.add_argument("--no-per-channel", action="store_true", help="Kuantisasi bobot per tensor")
+    parser.add_argument("--quantize-head", action="store_true", help="Kuantisasi juga node decoding head")
+    args = parser.parse_args()
+    
+    print("="*60)
+    print("🧮 KUANTISASI DETEKTOR INT8")
+    print("="*60)
+    
+    detection_config = load_config(args.config)
+    model_size = args.model_size or detection_config.get('model_size', 'yolov8n')
+    imgsz = args.imgsz or detection_config.get('inference_size', 320) or 640
+    max_cpu_cores = detection_config.get('max_cpu_cores', 3)
+    confidence = args.confidence or detection_config.get('min_confidence', 0.5)
+    fp32_path = f"{model_size}.onnx"
+    int8_path = f"{model_size}_int8.onnx"
+    
+    if not Path(args.samples).is_dir():
+        print(f"❌ Error: direktori sampel {args.samples} tidak ditemukan")
+        print("   Isi dengan snapshot (.jpg) atau rekaman (.mp4) dari kamera sendiri")
+        sys.exit(1)
+    
+    frames = load_sample_frames(args.samples, args.max_frames)
+    if len(frames) < 10:
+        print(f"❌ Error: hanya {len(frames)} frame sampel, minimal 10")
+        sys.exit(1)
+    
+    eval_frames = frames[::args.eval_every]
+    calibration_frames = [f for i, f in enumerate(frames) if i % args.eval_every != 0]
+    print(f"📁 {len(calibration_frames)} frame kalibrasi, {len(eval_frames)} frame evaluasi")
+    
+    # Model FP32 (diekspor dari .pt jika belum ada)
+    fp32_detector, fp32_memory = load_detector(model_size, fp32_path, max_cpu_cores, imgsz, False)
+    if fp32_detector.model is None:
+        print("❌ Error: gagal memuat/mengekspor model FP32")
+        sys.exit(1)
+    
+    reader = FrameCalibrationReader(
+        fp32_detector, calibration_frames,
+        fp32_detector.model.get_inputs()[0].name, fp32_detector.onnx_input_size
+    )
+    quantize(fp32_path, int8_path, reader, not args.no_per_channel, not args.quantize_head)
+    print(f"💾 Model INT8 disimpan ke: {int8_path}")
+    
+    int8_detector, int8_memory = load_detector(model_size, int8_path, max_cpu_cores, imgsz, True)
+    
+    print("⏱️  Benchmark FP32...")
+    fp32_detections, fp32_latency = benchmark(fp32_detector, eval_frames, confidence)
+    print("⏱️  Benchmark INT8...")
+    int8_detections, int8_latency = benchmark(int8_detector, eval_frames, confidence)
+    
+    accuracy = average_precision(fp32_detections, int8_detections)
+    report = {
+        'model_size': model_size,
+        'input_size': fp32_detector.onnx_input_size,
+        'max_cpu_cores': max_cpu_cores,
+        'confidence': confidence,
+        'calibration_frames': len(calibration_frames),
+        'eval_frames': len(eval_frames),
+        'fp32': {
+            'path': fp32_path,
+            'file_mb': round(os.path.getsize(fp32_path) / (1024 * 1024), 2),
+            'load_rss_mb': round(fp32_memory, 1),
+            'latency': fp32_latency,
+            'persons': sum(len(d) for d in fp32_detections)
+        },
+        'int8': {
+            'path': int8_path,
+            'file_mb': round(os.path.getsize(int8_path) / (1024 * 1024), 2),
+            'load_rss_mb': round(int8_memory, 1),
+            'latency': int8_latency,
+            'persons': sum(len(d) for d in int8_detections)
+        },
+        'accuracy_vs_fp32': accuracy,
+        'speedup': round(fp32_latency['mean_ms'] / int8_latency['mean_ms'], 2) if int8_latency['mean_ms'] else 0.0
+    }
+    
+    report_path = f"{model_size}_int8_report.json"
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    
+    # Print ringkasan
+    print("\n" + "="*60)
+    print("📋 LAPORAN FP32 vs INT8")
+    print("="*60)
+    print(f"{'':22}{'FP32':>12}{'INT8':>12}")
+    print(f"{'Ukuran file (MB)':22}{report['fp32']['file_mb']:>12}{report['int8']['file_mb']:>12}")
+    print(f"{'RSS load (MB)':22}{report['fp32']['load_rss_mb']:>12}{report['int8']['load_rss_mb']:>12}")
+    print(f"{'Latency mean (ms)':22}{fp32_latency['mean_ms']:>12}{int8_latency['mean_ms']:>12}")
+    print(f"{'Latency p95 (ms)':22}{fp32_latency['p95_ms']:>12}{int8_latency['p95_ms']:>12}")
+    print(f"{'Orang terdeteksi':22}{report['fp32']['persons']:>12}{report['int8']['persons']:>12}")
+    print("-"*60)
+    print(f"Speedup: {report['speedup']}x")
+    print(f"Proxy mAP@0.5 (FP32 sebagai acuan): {accuracy['ap50']}")
+    print(f"Precision: {accuracy['precision']}, Recall: {accuracy['recall']}, IoU rata-rata: {accuracy['mean_iou']}")
+    print("="*60)
+    print(f"💾 Laporan disimpan ke: {report_path}")
+    print("\n🔄 Aktifkan dengan detection.backend: onnx dan detection.quantized: true di config.yaml")
+
+
+if __name__ == "__main__":
+    main()
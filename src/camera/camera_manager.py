@@ -5,11 +5,33 @@ Camera Manager - Mengelola koneksi dan streaming dari kamera IP V380
 import cv2
 import requests
 import logging
-from typing import Optional, Tuple
+import threading
+from multiprocessing import shared_memory
+from typing import Callable, List, Optional, Tuple
 import time
 
+from .ffmpeg_source import FFmpegFrameSource
+from .frame_bus import FrameRef, SharedFrameBus
+from .frame_source import FrameSource
 
-class CameraManager:
+
+class CameraState:
+    """Status koneksi kamera untuk state machine reconnect"""
+    DISCONNECTED = "disconnected"   # Belum pernah terkoneksi / sudah ditutup
+    CONNECTED = "connected"         # Stream terbuka dan frame terbaca
+    BACKING_OFF = "backing_off"     # Menunggu jeda backoff sebelum mencoba lagi
+    PROBING = "probing"             # Sedang mencoba membuka stream
+
+
+class CameraHealth:
+    """Status kesehatan stream hasil watchdog pasif"""
+    OK = "ok"               # Frame mengalir normal
+    DEGRADED = "degraded"   # Frame mengalir tapi FPS jauh di bawah target
+    STALLED = "stalled"     # Tidak ada frame baru melewati stall_timeout
+    DEAD = "dead"           # Terputus atau tidak ada frame melewati dead_timeout
+
+
+class CameraManager(FrameSource):
     """Kelas untuk mengelola koneksi kamera IP V380"""
     
     def __init__(self, ip: str, port: int, username: str, password: str, 
@@ -19,7 +41,13 @@ class CameraManager:
                  use_vlc_proxy: bool = False, vlc_rtsp_port: int = 8554, 
                  vlc_rtsp_path: str = "/camera", use_http_stream: bool = False,
                  vlc_http_port: int = 8554, use_gstreamer_proxy: bool = False,
-                 gstreamer_rtsp_port: int = 8554):
+                 gstreamer_rtsp_port: int = 8554, threaded_capture: bool = False,
+                 stall_timeout: float = 5.0, dead_timeout: float = 30.0,
+                 degraded_fps_ratio: float = 0.5, camera_id: str = "1",
+                 name: Optional[str] = None, analytics_stream_url: Optional[str] = None,
+                 capture_backend: str = "opencv", ffmpeg_width: int = 0,
+                 ffmpeg_fps: float = 0, ffmpeg_keyframes_only: bool = False,
+                 frame_bus_slots: int = 0):
         """
         Inisialisasi Camera Manager
         
@@ -37,7 +65,27 @@ class CameraManager:
             use_vlc_proxy: Gunakan VLC RTSP proxy (default: False)
             vlc_rtsp_port: Local RTSP port dari VLC proxy (default: 8554)
             vlc_rtsp_path: RTSP path dari VLC proxy (default: /camera)
+            threaded_capture: Baca stream terus-menerus di thread terpisah dan
+                simpan hanya frame terbaru (default: False)
+            stall_timeout: Umur frame terakhir (detik) sebelum dianggap stalled (default: 5)
+            dead_timeout: Umur frame terakhir (detik) sebelum dianggap mati (default: 30)
+            degraded_fps_ratio: Rasio FPS terukur / target di bawah mana stream
+                dianggap degraded (default: 0.5)
+            camera_id: ID kamera di konfigurasi (default: "1")
+            name: Nama kamera untuk log dan notifikasi (default: IP kamera)
+            analytics_stream_url: Path substream resolusi rendah (misalnya "/2") untuk
+                motion/deteksi. Jika diisi, stream_url (main stream) hanya dibuka saat
+                dibutuhkan untuk foto bukti. Hanya untuk koneksi RTSP langsung (default: None)
+            capture_backend: "opencv" (cv2.VideoCapture) atau "ffmpeg" (subprocess
+                ffmpeg dengan scaling di decoder) (default: "opencv")
+            ffmpeg_width: Lebar output ffmpeg, tinggi mengikuti rasio (0 = asli)
+            ffmpeg_fps: Batas FPS output ffmpeg (0 = semua frame)
+            ffmpeg_keyframes_only: Decode hanya I-frame pada backend ffmpeg
+            frame_bus_slots: Jumlah slot frame bus shared memory untuk worker
+                analitik multi-proses, butuh threaded_capture (0 = nonaktif)
         """
+        self.camera_id = str(camera_id)
+        self.name = name or ip
         self.ip = ip
         self.port = port
         self.username = username
@@ -55,20 +103,77 @@ class CameraManager:
         self.vlc_http_port = vlc_http_port
         self.use_gstreamer_proxy = use_gstreamer_proxy
         self.gstreamer_rtsp_port = gstreamer_rtsp_port
+        self.analytics_stream_url = analytics_stream_url
+        self.capture_backend = capture_backend
+        self.ffmpeg_width = ffmpeg_width
+        self.ffmpeg_fps = ffmpeg_fps
+        self.ffmpeg_keyframes_only = ffmpeg_keyframes_only
         self.cap: Optional[cv2.VideoCapture] = None
         self.is_connected = False
         self.last_frame_time = time.time()
         self.consecutive_failures = 0
         
+        # Statistik untuk watchdog pasif (tanpa membaca frame tambahan)
+        self.stall_timeout = stall_timeout
+        self.dead_timeout = dead_timeout
+        self.degraded_fps_ratio = degraded_fps_ratio
+        self.last_read_attempt = time.time()
+        self.frame_interval: Optional[float] = None  # EMA jarak antar frame (detik)
+        
+        # Resolusi (width, height) masing-masing stream untuk mapping bounding box
+        self.analytics_resolution: Optional[Tuple[int, int]] = None
+        self.main_resolution: Optional[Tuple[int, int]] = None
+        self._main_lock = threading.Lock()
+        
+        # Slot frame terbaru untuk mode threaded capture
+        self.threaded_capture = threaded_capture
+        self._cap_lock = threading.RLock()
+        self._frame_lock = threading.Lock()
+        self._latest_frame = None
+        self._frame_seq = 0
+        self._frame_timestamp = 0.0
+        self._latest_frame_ref: Optional[FrameRef] = None  # Slot frame bus frame terbaru
+        self._capture_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        
+        # Frame bus shared memory, dibuat saat frame pertama (shape baru diketahui)
+        self.frame_bus_slots = frame_bus_slots
+        self.frame_bus: Optional[SharedFrameBus] = None
+        
+        # State machine koneksi, reconnect berjalan di thread sendiri
+        self.state = CameraState.DISCONNECTED
+        self._state_lock = threading.Lock()
+        self._state_listeners: List[Callable[[str, str], None]] = []
+        self._reconnect_thread: Optional[threading.Thread] = None
+        self._shutdown_event = threading.Event()
+        
         self.logger = logging.getLogger(__name__)
         
-    def build_rtsp_url(self) -> str:
+    @property
+    def label(self) -> str:
+        """Label kamera untuk log dan notifikasi, misalnya 'CCTV Utama (10.0.0.2)'"""
+        return self.ip if self.name == self.ip else f"{self.name} ({self.ip})"
+    
+    def has_dual_stream(self) -> bool:
+        """Cek apakah kamera memakai substream terpisah untuk analitik"""
+        return bool(self.analytics_stream_url) and not (
+            self.use_gstreamer_proxy or self.use_http_stream or self.use_vlc_proxy
+        )
+    
+    def build_rtsp_url(self, stream_url: Optional[str] = None) -> str:
         """
         Membangun URL RTSP/HTTP untuk streaming dengan parameter optimasi
         
+        Args:
+            stream_url: Path stream untuk koneksi langsung (default: stream_url
+                analitik jika dual stream aktif, selain itu self.stream_url)
+        
         Returns:
             URL RTSP/HTTP lengkap
         """
+        if stream_url is None:
+            stream_url = self.analytics_stream_url if self.has_dual_stream() else self.stream_url
+        
         if self.use_gstreamer_proxy:
             # Gunakan GStreamer RTSP Proxy (PALING STABIL dan RELIABLE)
             rtsp_url = f"rtsp://127.0.0.1:{self.gstreamer_rtsp_port}"
@@ -91,8 +196,8 @@ class CameraManager:
             # Format RTSP untuk V380 dengan parameter optimasi
             # rtsp_transport: tcp (lebih stabil dari udp)
             # latency: 0 (real-time, no buffering)
-            rtsp_url = f"rtsp://{self.username}:{self.password}@{self.ip}:{self.rtsp_port}{self.stream_url}?rtsp_transport=tcp&latency=0"
-            self.logger.info(f"RTSP URL (Direct): rtsp://{self.username}:****@{self.ip}:{self.rtsp_port}{self.stream_url}")
+            rtsp_url = f"rtsp://{self.username}:{self.password}@{self.ip}:{self.rtsp_port}{stream_url}?rtsp_transport=tcp&latency=0"
+            self.logger.info(f"RTSP URL (Direct): rtsp://{self.username}:****@{self.ip}:{self.rtsp_port}{stream_url}")
             return rtsp_url
     
     def connect(self) -> bool:
@@ -107,12 +212,7 @@ class CameraManager:
             self.logger.info(f"Menghubungkan ke kamera {self.ip} (timeout: {self.timeout}s)...")
             
             # Mencoba koneksi dengan parameter optimasi
-            self.cap = cv2.VideoCapture(rtsp_url)
-            
-            # Set buffer size dan fps untuk stabilitas
-            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
-            self.cap.set(cv2.CAP_PROP_FPS, self.fps)
-            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'H264'))
+            self.cap = self._open_capture(rtsp_url)
             
             # Test koneksi dengan membaca beberapa frame
             success_count = 0
@@ -124,8 +224,12 @@ class CameraManager:
                         self.is_connected = True
                         self.consecutive_failures = 0
                         self.last_frame_time = time.time()
+                        self.last_read_attempt = self.last_frame_time
+                        self.frame_interval = None
+                        self.analytics_resolution = (frame.shape[1], frame.shape[0])
                         self.logger.info(f"Berhasil terkoneksi ke kamera {self.ip}")
                         self.logger.info(f"Resolusi: {frame.shape[1]}x{frame.shape[0]}, FPS: {self.fps}, Buffer: {self.buffer_size}")
+                        self._set_state(CameraState.CONNECTED)
                         return True
                 time.sleep(0.1)  # Tunggu 100ms antar frame
             
@@ -139,6 +243,33 @@ class CameraManager:
             self.release()
             return False
     
+    def _open_capture(self, url: str):
+        """
+        Membuka sumber frame sesuai capture_backend
+        
+        Args:
+            url: URL stream
+            
+        Returns:
+            cv2.VideoCapture atau FFmpegFrameSource
+        """
+        if self.capture_backend == "ffmpeg":
+            # Parameter query hanya petunjuk untuk OpenCV, ffmpeg memakai opsinya sendiri
+            return FFmpegFrameSource(
+                url.split('?')[0],
+                width=self.ffmpeg_width,
+                output_fps=self.ffmpeg_fps,
+                keyframes_only=self.ffmpeg_keyframes_only
+            )
+        
+        cap = cv2.VideoCapture(url)
+        
+        # Set buffer size dan fps untuk stabilitas
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
+        cap.set(cv2.CAP_PROP_FPS, self.fps)
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'H264'))
+        return cap
+    
     def read_frame(self) -> Tuple[bool, Optional[cv2.typing.MatLike]]:
         """
         Membaca satu frame dari kamera dengan health check
@@ -146,17 +277,54 @@ class CameraManager:
         Returns:
             Tuple (success, frame) dimana success adalah bool dan frame adalah numpy array atau None
         """
+        if self.is_capture_running():
+            # Mode threaded: ambil frame terbaru dari slot tanpa blocking
+            frame, _, _ = self.get_latest_frame()
+            return frame is not None, frame
+        
+        ret, frame = self._read_from_capture()
+        return ret, self._own_frame(frame)
+    
+    def _own_frame(self, frame: Optional[cv2.typing.MatLike]) -> Optional[cv2.typing.MatLike]:
+        """
+        Salinan frame untuk pemanggil jika backend memakai ulang buffer
+        
+        FFmpegFrameSource membaca ke ring buffer tetap, jadi frame yang keluar
+        dari CameraManager (dan bisa tertahan di antrian pipeline) disalin sekali.
+        Frame cv2.VideoCapture selalu array baru dan dikembalikan apa adanya.
+        
+        Args:
+            frame: Frame dari capture
+        
+        Returns:
+            Frame milik pemanggil
+        """
+        if frame is not None and getattr(self.cap, 'reuses_buffers', False):
+            return frame.copy()
+        return frame
+    
+    def _read_from_capture(self) -> Tuple[bool, Optional[cv2.typing.MatLike]]:
+        """
+        Membaca satu frame langsung dari VideoCapture
+        
+        Returns:
+            Tuple (success, frame)
+        """
         if not self.is_connected or self.cap is None:
-            self.logger.warning("Kamera tidak terkoneksi, mencoba reconnect...")
-            self.reconnect()
+            if self.request_reconnect():
+                self.logger.warning("Kamera tidak terkoneksi, reconnect dijalankan di background...")
             return False, None
         
         try:
-            ret, frame = self.cap.read()
+            self.last_read_attempt = time.time()
+            with self._cap_lock:
+                ret, frame = self.cap.read() if self.cap is not None else (False, None)
             
             if ret and frame is not None:
-                # Update timestamp dan reset failure counter
-                self.last_frame_time = time.time()
+                # Update timestamp, interval antar frame dan reset failure counter
+                now = time.time()
+                self._update_frame_interval(now - self.last_frame_time)
+                self.last_frame_time = now
                 self.consecutive_failures = 0
                 return True, frame
             else:
@@ -167,7 +335,8 @@ class CameraManager:
                 # Cek jika perlu reconnect
                 if self.consecutive_failures >= 3:
                     self.logger.error("Terlalu banyak kegagalan, mencoba reconnect...")
-                    return self.reconnect()
+                    self._mark_disconnected()
+                    self.request_reconnect()
                 
                 return False, None
                 
@@ -178,13 +347,17 @@ class CameraManager:
             # Cek jika perlu reconnect
             if self.consecutive_failures >= 3:
                 self.logger.error("Terlalu banyak error, mencoba reconnect...")
-                return self.reconnect()
+                self._mark_disconnected()
+                self.request_reconnect()
             
             return False, None
     
     def reconnect(self, max_retries: int = None) -> bool:
         """
-        Mencoba reconnect ke kamera dengan exponential backoff
+        Mencoba reconnect ke kamera dengan exponential backoff (blocking)
+        
+        Jangan dipanggil dari event loop asyncio - gunakan request_reconnect()
+        agar bot dan kamera lain tetap berjalan.
         
         Args:
             max_retries: Maksimal percobaan reconnect (default: self.max_retries)
@@ -195,23 +368,251 @@ class CameraManager:
         if max_retries is None:
             max_retries = self.max_retries
         
+        self._mark_disconnected()
         self.release()
         self.consecutive_failures = 0
         
         for attempt in range(max_retries):
-            # Exponential backoff: 2s, 4s, 8s, 16s, 32s
+            # Exponential backoff: 1s, 2s, 4s, 8s, 16s, 30s
             backoff_time = min(2 ** attempt, 30)  # Max 30 detik
             self.logger.info(f"Percobaan reconnect {attempt + 1}/{max_retries} (menunggu {backoff_time}s)...")
             
-            time.sleep(backoff_time)
+            self._set_state(CameraState.BACKING_OFF)
+            if self._shutdown_event.wait(backoff_time):
+                return False
             
+            self._set_state(CameraState.PROBING)
             if self.connect():
                 self.logger.info("Reconnect berhasil!")
                 return True
         
+        self._set_state(CameraState.BACKING_OFF)
         self.logger.error(f"Gagal melakukan reconnect ke kamera setelah {max_retries} percobaan")
         return False
     
+    def request_reconnect(self) -> bool:
+        """
+        Jalankan reconnect di background thread tanpa blocking pemanggil
+        
+        Thread terus mencoba (dengan backoff) sampai kamera terhubung kembali
+        atau close() dipanggil.
+        
+        Returns:
+            True jika thread reconnect baru dimulai, False jika sudah berjalan
+        """
+        with self._state_lock:
+            if self._shutdown_event.is_set():
+                return False
+            if self._reconnect_thread is not None and self._reconnect_thread.is_alive():
+                return False
+            
+            self._reconnect_thread = threading.Thread(
+                target=self._reconnect_loop,
+                name=f"reconnect-{self.ip}",
+                daemon=True
+            )
+            self._reconnect_thread.start()
+        
+        self.logger.info(f"Thread reconnect dimulai untuk kamera {self.ip}")
+        return True
+    
+    def is_reconnecting(self) -> bool:
+        """Cek apakah thread reconnect sedang berjalan"""
+        return self._reconnect_thread is not None and self._reconnect_thread.is_alive()
+    
+    def _reconnect_loop(self):
+        """Loop thread reconnect: ulangi siklus backoff sampai berhasil atau shutdown"""
+        while not self._shutdown_event.is_set():
+            if self.reconnect():
+                return
+            self.logger.warning(f"Kamera {self.ip} masih terputus, siklus reconnect diulang...")
+    
+    def _mark_disconnected(self):
+        """Tandai koneksi putus agar pembaca berhenti memakai VideoCapture lama"""
+        self.is_connected = False
+    
+    def _set_state(self, new_state: str):
+        """
+        Ubah state koneksi dan beri tahu listener jika berubah
+        
+        Args:
+            new_state: State baru (lihat CameraState)
+        """
+        with self._state_lock:
+            old_state = self.state
+            if old_state == new_state:
+                return
+            self.state = new_state
+            listeners = list(self._state_listeners)
+        
+        self.logger.info(f"Kamera {self.label}: {old_state} -> {new_state}")
+        for listener in listeners:
+            try:
+                listener(old_state, new_state)
+            except Exception as e:
+                self.logger.error(f"Error state listener kamera: {str(e)}")
+    
+    def add_state_listener(self, callback: Callable[[str, str], None]):
+        """
+        Daftarkan callback yang dipanggil saat state koneksi berubah
+        
+        Callback dipanggil dari thread kamera dengan argumen (old_state, new_state),
+        jadi harus cepat dan thread-safe.
+        
+        Args:
+            callback: Fungsi callback(old_state, new_state)
+        """
+        with self._state_lock:
+            self._state_listeners.append(callback)
+    
+    def get_state(self) -> str:
+        """Mendapatkan state koneksi saat ini (lihat CameraState)"""
+        return self.state
+    
+    def start_capture(self) -> bool:
+        """
+        Mulai thread capture yang terus membaca stream dan menyimpan frame terbaru
+        
+        Returns:
+            True jika thread berjalan, False jika threaded capture nonaktif
+        """
+        if not self.threaded_capture:
+            return False
+        
+        if self.is_capture_running():
+            return True
+        
+        self._stop_event.clear()
+        self._capture_thread = threading.Thread(
+            target=self._capture_loop,
+            name=f"capture-{self.ip}",
+            daemon=True
+        )
+        self._capture_thread.start()
+        self.logger.info(f"Thread capture dimulai untuk kamera {self.ip}")
+        return True
+    
+    def stop_capture(self, timeout: float = 5.0):
+        """
+        Hentikan thread capture
+        
+        Args:
+            timeout: Waktu tunggu maksimal thread berhenti (detik)
+        """
+        self._stop_event.set()
+        thread = self._capture_thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+        self._capture_thread = None
+    
+    def is_capture_running(self) -> bool:
+        """Cek apakah thread capture sedang berjalan"""
+        return self._capture_thread is not None and self._capture_thread.is_alive()
+    
+    def _capture_loop(self):
+        """Loop thread capture: kuras buffer stream dan publikasikan frame terbaru"""
+        while not self._stop_event.is_set():
+            ret, frame = self._read_from_capture()
+            
+            if ret and frame is not None:
+                self._publish_frame(frame)
+            else:
+                # Hindari busy-loop saat kamera bermasalah
+                self._stop_event.wait(0.1)
+        
+        self.logger.info(f"Thread capture berhenti untuk kamera {self.ip}")
+    
+    def _publish_frame(self, frame: cv2.typing.MatLike):
+        """
+        Simpan frame ke slot frame terbaru
+        
+        Args:
+            frame: Frame yang baru dibaca
+        """
+        # Tulis ke frame bus dulu agar referensinya dipublikasikan bersama frame
+        frame_ref = self._publish_to_bus(frame) if self.frame_bus_slots > 0 else None
+        
+        with self._frame_lock:
+            self._latest_frame = frame
+            self._frame_seq += 1
+            self._frame_timestamp = self.last_frame_time
+            self._latest_frame_ref = frame_ref
+    
+    @property
+    def frame_bus_name(self) -> str:
+        """Nama shared memory frame bus kamera ini"""
+        return f"cctv_frames_{self.camera_id}"
+    
+    def _publish_to_bus(self, frame: cv2.typing.MatLike) -> Optional[FrameRef]:
+        """
+        Tulis frame ke frame bus shared memory untuk worker proses lain
+        
+        Args:
+            frame: Frame yang baru dibaca
+        
+        Returns:
+            Referensi slot frame atau None jika gagal
+        """
+        try:
+            if self.frame_bus is not None and self.frame_bus.shape != frame.shape:
+                # Resolusi berubah setelah reconnect: worker harus attach ulang
+                self.logger.warning(f"Resolusi kamera {self.label} berubah, frame bus dibuat ulang")
+                self.frame_bus.close()
+                self.frame_bus = None
+            
+            if self.frame_bus is None:
+                try:
+                    self.frame_bus = SharedFrameBus(self.frame_bus_name, frame.shape, self.frame_bus_slots)
+                except FileExistsError:
+                    # Sisa proses sebelumnya yang berhenti tidak bersih
+                    stale = shared_memory.SharedMemory(name=self.frame_bus_name)
+                    stale.close()
+                    stale.unlink()
+                    self.frame_bus = SharedFrameBus(self.frame_bus_name, frame.shape, self.frame_bus_slots)
+            
+            slot, sequence = self.frame_bus.publish(frame, self.last_frame_time)
+            # Tanpa salinan lokal: frame di sini bisa buffer ring ffmpeg, pemanggil
+            # melengkapinya lewat get_latest_frame_ref(sequence, frame)
+            return FrameRef(self.frame_bus.name, self.frame_bus.shape, self.frame_bus.num_slots, slot, sequence)
+        except Exception as e:
+            self.logger.error(f"Error menulis frame bus: {str(e)}")
+            return None
+    
+    def get_latest_frame(self) -> Tuple[Optional[cv2.typing.MatLike], int, float]:
+        """
+        Mengambil frame terbaru dari slot tanpa blocking
+        
+        Frame cv2.VideoCapture di slot tidak pernah diubah setelah dipublikasikan,
+        jadi pemanggil boleh memakainya langsung tanpa copy (selama tidak
+        menggambar di atasnya). Frame backend ffmpeg disalin di bawah kunci slot:
+        thread capture paling banyak membaca satu frame ke buffer lain sebelum
+        menunggu kunci ini, sehingga buffer di slot tidak tertimpa saat disalin.
+        
+        Returns:
+            Tuple (frame, sequence_number, capture_timestamp). Frame None jika belum ada
+        """
+        with self._frame_lock:
+            return self._own_frame(self._latest_frame), self._frame_seq, self._frame_timestamp
+    
+    def get_latest_frame_ref(self, sequence: int,
+                             frame: Optional[cv2.typing.MatLike] = None) -> Optional[FrameRef]:
+        """
+        Referensi frame bus untuk frame dengan sequence dari get_latest_frame()
+        
+        Args:
+            sequence: Sequence frame yang dipakai pemanggil
+            frame: Frame milik pemanggil (hasil get_latest_frame) sebagai salinan
+                lokal FrameRef, dipakai jika slot bus sudah tertimpa
+        
+        Returns:
+            FrameRef atau None jika frame bus nonaktif atau frame terbaru sudah berganti
+        """
+        with self._frame_lock:
+            ref = self._latest_frame_ref if self._frame_seq == sequence else None
+        if ref is None:
+            return None
+        return FrameRef(ref.name, ref.shape, ref.num_slots, ref.slot, ref.sequence, frame=frame)
+    
     def get_properties(self) -> dict:
         """
         Mendapatkan properti kamera
@@ -238,19 +639,28 @@ class CameraManager:
             self.logger.error(f"Error mendapatkan properti kamera: {str(e)}")
             return {}
     
-    def capture_photo(self, filename: Optional[str] = None) -> Optional[cv2.typing.MatLike]:
+    def capture_photo(self, filename: Optional[str] = None,
+                      use_main_stream: bool = True) -> Optional[cv2.typing.MatLike]:
         """
         Mengambil satu foto dari kamera
         
+        Dengan dual stream, foto diambil dari main stream resolusi penuh (blocking
+        beberapa ratus ms untuk membuka stream, jalankan di thread dari asyncio).
+        
         Args:
             filename: Nama file untuk menyimpan foto (opsional)
+            use_main_stream: Ambil dari main stream jika dual stream aktif (default: True)
             
         Returns:
             Frame yang diambil atau None jika gagal
         """
-        ret, frame = self.read_frame()
+        if use_main_stream and self.has_dual_stream():
+            frame = self.capture_main_frame()
+        else:
+            ret, frame = self.read_frame()
+            frame = frame if ret else None
         
-        if ret and frame is not None:
+        if frame is not None:
             if filename:
                 try:
                     cv2.imwrite(filename, frame)
@@ -260,34 +670,161 @@ class CameraManager:
             return frame
         return None
     
-    def check_connection(self) -> bool:
+    def capture_main_frame(self, max_reads: int = 10) -> Optional[cv2.typing.MatLike]:
         """
-        Mengecek status koneksi kamera
+        Membuka main stream sesaat dan mengambil satu frame resolusi penuh
+        
+        Main stream tidak dibiarkan terbuka agar decoder resolusi tinggi tidak
+        memakan CPU terus-menerus. Jika gagal, kembali ke frame analitik.
         
+        Args:
+            max_reads: Maksimal percobaan membaca frame setelah stream dibuka
+            
         Returns:
-            True jika kamera terkoneksi, False jika tidak
+            Frame main stream, frame analitik sebagai fallback, atau None
         """
-        if self.cap is None or not self.is_connected:
-            return False
+        if not self.has_dual_stream():
+            ret, frame = self.read_frame()
+            return frame if ret else None
         
-        try:
-            # Cek apakah masih bisa membaca frame
-            ret, frame = self.cap.read()
-            return ret and frame is not None
-        except:
-            return False
+        frame = None
+        with self._main_lock:
+            cap = None
+            try:
+                cap = cv2.VideoCapture(self.build_rtsp_url(self.stream_url))
+                cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                
+                for _ in range(max_reads):
+                    ret, main_frame = cap.read()
+                    if ret and main_frame is not None:
+                        frame = main_frame
+                        self.main_resolution = (frame.shape[1], frame.shape[0])
+                        break
+            except Exception as e:
+                self.logger.error(f"Error membaca main stream kamera {self.label}: {str(e)}")
+            finally:
+                if cap is not None:
+                    cap.release()
+        
+        if frame is None:
+            self.logger.warning(f"Gagal membaca main stream kamera {self.label}, memakai frame analitik")
+            ret, frame = self.read_frame()
+            return frame if ret else None
+        
+        return frame
+    
+    def map_bbox_to_main(self, bbox: Tuple, main_shape: Optional[Tuple[int, ...]] = None) -> Tuple:
+        """
+        Memetakan bounding box dari resolusi analitik ke resolusi main stream
+        
+        Args:
+            bbox: (x, y, w, h) atau (x, y, w, h, ...) pada frame analitik;
+                elemen setelah h (misalnya confidence) disalin apa adanya
+            main_shape: Shape frame main stream (default: main_resolution terakhir)
+            
+        Returns:
+            Bounding box dengan koordinat main stream (tidak berubah jika resolusi
+            salah satu stream belum diketahui)
+        """
+        if main_shape is not None:
+            main_resolution = (main_shape[1], main_shape[0])
+        else:
+            main_resolution = self.main_resolution
+        
+        if main_resolution is None or self.analytics_resolution is None:
+            return tuple(bbox)
+        
+        scale_x = main_resolution[0] / self.analytics_resolution[0]
+        scale_y = main_resolution[1] / self.analytics_resolution[1]
+        x, y, w, h = bbox[:4]
+        
+        return (int(x * scale_x), int(y * scale_y),
+                int(w * scale_x), int(h * scale_y)) + tuple(bbox[4:])
+    
+    def _update_frame_interval(self, interval: float):
+        """
+        Perbarui rata-rata (EMA) jarak antar frame
+        
+        Args:
+            interval: Jarak waktu sejak frame sebelumnya (detik)
+        """
+        if self.frame_interval is None:
+            self.frame_interval = interval
+        else:
+            self.frame_interval = 0.9 * self.frame_interval + 0.1 * interval
+    
+    def get_health(self) -> dict:
+        """
+        Menilai kesehatan stream secara pasif dari statistik pembacaan frame
+        
+        Tidak menyentuh decoder: hanya memakai last_frame_time, consecutive_failures
+        dan interval antar frame terukur. Tanpa threaded capture, umur frame diukur
+        terhadap percobaan baca terakhir sehingga jeda antar deteksi tidak dianggap stall.
+        
+        Returns:
+            Dictionary berisi status (lihat CameraHealth), frame_age, measured_fps
+            dan consecutive_failures
+        """
+        now = time.time()
+        if self.is_capture_running():
+            frame_age = now - self.last_frame_time
+        else:
+            frame_age = max(0.0, self.last_read_attempt - self.last_frame_time)
+        
+        measured_fps = 1.0 / self.frame_interval if self.frame_interval else 0.0
+        
+        if not self.is_connected or self.cap is None or frame_age >= self.dead_timeout:
+            status = CameraHealth.DEAD
+        elif frame_age >= self.stall_timeout or self.consecutive_failures > 0:
+            status = CameraHealth.STALLED
+        elif (self.is_capture_running() and measured_fps > 0 and
+              measured_fps < self.fps * self.degraded_fps_ratio):
+            # FPS terukur hanya mencerminkan stream jika thread capture menguras buffer
+            status = CameraHealth.DEGRADED
+        else:
+            status = CameraHealth.OK
+        
+        return {
+            'status': status,
+            'frame_age': frame_age,
+            'measured_fps': measured_fps,
+            'consecutive_failures': self.consecutive_failures
+        }
+    
+    def check_connection(self) -> bool:
+        """
+        Mengecek status koneksi kamera (pasif, tanpa membaca frame)
+        
+        Returns:
+            True jika kamera terkoneksi dan stream belum mati, False jika tidak
+        """
+        return self.get_health()['status'] != CameraHealth.DEAD
     
     def release(self):
         """Membebaskan resource kamera"""
-        if self.cap is not None:
-            self.cap.release()
-            self.cap = None
-            self.is_connected = False
-            self.logger.info("Koneksi kamera dilepaskan")
+        with self._cap_lock:
+            if self.cap is not None:
+                self.cap.release()
+                self.cap = None
+                self.is_connected = False
+                self.logger.info("Koneksi kamera dilepaskan")
+    
+    def close(self):
+        """Hentikan thread capture/reconnect dan bebaskan resource kamera"""
+        self._shutdown_event.set()
+        self.stop_capture()
+        thread = self._reconnect_thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=5.0)
+        self.release()
+        if self.frame_bus is not None:
+            self.frame_bus.close()
+            self.frame_bus = None
+        self._set_state(CameraState.DISCONNECTED)
     
     def __del__(self):
         """Destructor untuk memastikan resource dibebaskan"""
-        self.release()
+        self.close()
     
     @staticmethod
     def test_http_connection(ip: str, port: int, username: str, password: str) -> bool:
@@ -0,0 +1,218 @@
+"""
+Camera Pool - Mengelola banyak kamera dalam satu proses
+"""
+
+import copy
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+from .camera_manager import CameraManager
+from .frame_source import FrameSource
+from .replay_source import ReplaySource
+
+
+class CameraPool:
+    """Kelas untuk mengelola kumpulan sumber frame (kamera live atau replay) dari konfigurasi"""
+    
+    def __init__(self, config: dict):
+        """
+        Inisialisasi Camera Pool
+        
+        Args:
+            config: Konfigurasi sistem (mendukung format 'camera' dan 'cameras')
+        """
+        self.config = config
+        self.cameras: Dict[str, FrameSource] = {}
+        self.camera_configs: Dict[str, dict] = {}
+        self.logger = logging.getLogger(__name__)
+        
+        for camera_config in self.get_camera_configs(config):
+            camera_id = str(camera_config.get('id', len(self.cameras) + 1))
+            if camera_id in self.cameras:
+                raise Exception(f"ID kamera duplikat: {camera_id}")
+            
+            self.camera_configs[camera_id] = camera_config
+            self.cameras[camera_id] = self._create_camera(camera_id, camera_config)
+    
+    @staticmethod
+    def get_camera_configs(config: dict) -> List[dict]:
+        """
+        Mendapatkan daftar konfigurasi kamera yang aktif
+        
+        Args:
+            config: Konfigurasi sistem
+        
+        Returns:
+            List konfigurasi kamera (format lama 'camera' menjadi list satu elemen)
+        """
+        if 'cameras' in config and config['cameras']:
+            return [c for c in config['cameras'] if c.get('enabled', True)]
+        if 'camera' in config and config['camera']:
+            return [config['camera']]
+        return []
+    
+    def _create_camera(self, camera_id: str, camera_config: dict) -> FrameSource:
+        """
+        Membuat sumber frame dari konfigurasi satu kamera
+        
+        Entry dengan source: "replay" memutar file video / direktori gambar,
+        selain itu CameraManager untuk kamera IP.
+        
+        Args:
+            camera_id: ID kamera
+            camera_config: Konfigurasi kamera
+        
+        Returns:
+            Instance FrameSource (CameraManager atau ReplaySource)
+        """
+        if camera_config.get('source') == 'replay':
+            return ReplaySource(
+                path=camera_config['path'],
+                pacing=camera_config.get('pacing', 'fast'),
+                fps=camera_config.get('replay_fps', 0),
+                loop=camera_config.get('loop', False),
+                camera_id=camera_id,
+                name=camera_config.get('name')
+            )
+        
+        return CameraManager(
+            ip=camera_config['ip'],
+            port=camera_config['port'],
+            username=camera_config['username'],
+            password=camera_config['password'],
+            rtsp_port=camera_config.get('rtsp_port', 554),
+            stream_url=camera_config.get('stream_url', '/1'),
+            buffer_size=camera_config.get('buffer_size', 3),
+            fps=camera_config.get('fps', 15),
+            timeout=camera_config.get('timeout', 10),
+            max_retries=camera_config.get('max_retries', 5),
+            use_vlc_proxy=camera_config.get('use_vlc_proxy', False),
+            vlc_rtsp_port=camera_config.get('vlc_rtsp_port', 8554),
+            vlc_rtsp_path=camera_config.get('vlc_rtsp_path', '/camera'),
+            use_http_stream=camera_config.get('use_http_stream', False),
+            vlc_http_port=camera_config.get('vlc_http_port', 8554),
+            use_gstreamer_proxy=camera_config.get('use_gstreamer_proxy', False),
+            gstreamer_rtsp_port=camera_config.get('gstreamer_rtsp_port', 8554),
+            threaded_capture=camera_config.get('threaded_capture', False),
+            stall_timeout=camera_config.get('stall_timeout', 5.0),
+            dead_timeout=camera_config.get('dead_timeout', 30.0),
+            camera_id=camera_id,
+            name=camera_config.get('name'),
+            analytics_stream_url=camera_config.get('analytics_stream_url'),
+            capture_backend=camera_config.get('capture_backend', 'opencv'),
+            ffmpeg_width=camera_config.get('ffmpeg_width', 0),
+            ffmpeg_fps=camera_config.get('ffmpeg_fps', 0),
+            ffmpeg_keyframes_only=camera_config.get('ffmpeg_keyframes_only', False),
+            frame_bus_slots=camera_config.get('frame_bus_slots', 0)
+        )
+    
+    def connect_all(self) -> int:
+        """
+        Hubungkan semua kamera secara paralel dan mulai thread capture
+        
+        Kamera yang gagal terhubung tidak menghentikan kamera lain; reconnect-nya
+        dijalankan di background.
+        
+        Returns:
+            Jumlah kamera yang berhasil terhubung
+        """
+        if not self.cameras:
+            return 0
+        
+        with ThreadPoolExecutor(max_workers=len(self.cameras), thread_name_prefix="connect") as executor:
+            results = dict(zip(self.cameras.keys(), executor.map(lambda c: c.connect(), self.cameras.values())))
+        
+        connected = 0
+        for camera_id, success in results.items():
+            camera = self.cameras[camera_id]
+            if success:
+                connected += 1
+            else:
+                self.logger.error(f"Gagal menghubungkan kamera {camera.label}, reconnect di background...")
+                camera.request_reconnect()
+            
+            # Thread capture tetap dimulai, ia menunggu sampai kamera terhubung
+            if camera.start_capture():
+                self.logger.info(f"Threaded capture aktif untuk kamera {camera.label}")
+        
+        self.logger.info(f"{connected}/{len(self.cameras)} kamera terhubung")
+        return connected
+    
+    def get_detection_config(self, camera_id: str) -> dict:
+        """
+        Mendapatkan konfigurasi deteksi efektif untuk satu kamera
+        
+        Section 'detection' global ditimpa oleh key 'detection' di konfigurasi kamera
+        (misalnya detection_interval, min_confidence).
+        
+        Args:
+            camera_id: ID kamera
+        
+        Returns:
+            Dictionary konfigurasi deteksi hasil merge
+        """
+        return self._merge_section('detection', camera_id)
+    
+    def get_motion_config(self, camera_id: str) -> dict:
+        """
+        Mendapatkan konfigurasi motion detection efektif untuk satu kamera
+        
+        Section 'motion_detection' global ditimpa oleh key 'motion_detection' di
+        konfigurasi kamera (misalnya sensitivity, min_contour_area, zones).
+        
+        Args:
+            camera_id: ID kamera
+        
+        Returns:
+            Dictionary konfigurasi motion detection hasil merge
+        """
+        return self._merge_section('motion_detection', camera_id)
+    
+    def _merge_section(self, section: str, camera_id: str) -> dict:
+        """
+        Gabungkan section konfigurasi global dengan override per kamera
+        
+        Args:
+            section: Nama section konfigurasi
+            camera_id: ID kamera
+        
+        Returns:
+            Dictionary hasil merge (salinan, aman dimodifikasi)
+        """
+        merged = copy.deepcopy(self.config.get(section, {}) or {})
+        overrides = self.camera_configs.get(camera_id, {}).get(section, {}) or {}
+        merged.update(overrides)
+        return merged
+    
+    def get(self, camera_id: str) -> Optional[FrameSource]:
+        """
+        Mendapatkan kamera berdasarkan ID
+        
+        Args:
+            camera_id: ID kamera
+        
+        Returns:
+            Instance FrameSource atau None jika tidak ada
+        """
+        return self.cameras.get(str(camera_id))
+    
+    @property
+    def primary(self) -> Optional[FrameSource]:
+        """Kamera pertama di konfigurasi (dipakai perintah bot tanpa argumen kamera)"""
+        return next(iter(self.cameras.values()), None)
+    
+    def ids(self) -> List[str]:
+        """Mendapatkan semua ID kamera"""
+        return list(self.cameras.keys())
+    
+    def close_all(self):
+        """Hentikan semua thread dan bebaskan resource kamera"""
+        for camera in self.cameras.values():
+            camera.close()
+    
+    def __iter__(self) -> Iterator[FrameSource]:
+        return iter(self.cameras.values())
+    
+    def __len__(self) -> int:
+        return len(self.cameras)
@@ -0,0 +1,267 @@
+"""
+FFmpeg Frame Source - Membaca frame BGR mentah dari subprocess ffmpeg
+"""
+
+import json
+import logging
+import shutil
+import subprocess
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+class FFmpegFrameSource:
+    """
+    Sumber frame berbasis subprocess ffmpeg dengan antarmuka mirip cv2.VideoCapture
+    
+    Scaling, pembatasan FPS dan mode keyframe-only dikerjakan di sisi decoder
+    sehingga Python hanya menerima frame yang benar-benar akan dianalisis.
+    Bisa membaca URL RTSP/HTTP maupun file lokal.
+    
+    Frame dibaca ke ring buffer tetap berisi num_buffers array: frame dari read()
+    hanya valid sampai num_buffers - 1 pembacaan berikutnya. Pemanggil yang
+    menyimpan frame lebih lama (slot frame terbaru, antrian pipeline) wajib
+    copy(); CameraManager melakukannya untuk setiap frame yang keluar darinya.
+    """
+    
+    reuses_buffers = True  # Frame dari read() ditimpa pembacaan berikutnya, lihat docstring kelas
+    
+    def __init__(self, source: str, width: int = 0, height: int = 0,
+                 output_fps: float = 0, keyframes_only: bool = False,
+                 realtime: bool = False, num_buffers: int = 4,
+                 ffmpeg_path: str = "ffmpeg", ffprobe_path: str = "ffprobe"):
+        """
+        Inisialisasi FFmpeg Frame Source dan jalankan proses ffmpeg
+        
+        Args:
+            source: URL stream (rtsp://, http://) atau path file video
+            width: Lebar output hasil scaling decoder (0 = ikuti sumber)
+            height: Tinggi output (0 = dihitung dari width dengan rasio sumber)
+            output_fps: Batas FPS output (0 = semua frame yang di-decode)
+            keyframes_only: Decode hanya I-frame (skip_frame nokey)
+            realtime: Baca file dengan kecepatan asli (-re), tidak berpengaruh untuk stream
+            num_buffers: Jumlah buffer ring (minimal 2): frame tetap valid selama
+                num_buffers - 1 pembacaan berikutnya
+            ffmpeg_path: Path executable ffmpeg
+            ffprobe_path: Path executable ffprobe
+        """
+        self.source = source
+        self.output_fps = output_fps
+        self.keyframes_only = keyframes_only
+        self.realtime = realtime
+        self.num_buffers = max(2, num_buffers)
+        self.ffmpeg_path = ffmpeg_path
+        self.ffprobe_path = ffprobe_path
+        self.process: Optional[subprocess.Popen] = None
+        self.source_fps = 0.0
+        self.frame_count = 0
+        self._buffers: List[np.ndarray] = []
+        self._next_buffer = 0
+        self.logger = logging.getLogger(__name__)
+        
+        if shutil.which(ffmpeg_path) is None:
+            raise Exception(f"ffmpeg tidak ditemukan: {ffmpeg_path}")
+        
+        self.width, self.height = self._resolve_output_size(width, height)
+        self.frame_size = self.width * self.height * 3
+        self._buffers = [
+            np.empty((self.height, self.width, 3), dtype=np.uint8) for _ in range(self.num_buffers)
+        ]
+        self._start()
+    
+    def _is_network_source(self) -> bool:
+        """Cek apakah sumber berupa stream jaringan"""
+        return self.source.startswith(("rtsp://", "rtsps://", "http://", "https://"))
+    
+    def _probe_source(self) -> Tuple[int, int, float]:
+        """
+        Membaca resolusi dan FPS sumber menggunakan ffprobe
+        
+        Returns:
+            Tuple (width, height, fps)
+        """
+        command = [
+            self.ffprobe_path, "-v", "error",
+            "-select_streams", "v:0",
+            "-show_entries", "stream=width,height,avg_frame_rate",
+            "-of", "json"
+        ]
+        if self.source.startswith("rtsp"):
+            command += ["-rtsp_transport", "tcp"]
+        command.append(self.source)
+        
+        output = subprocess.run(command, capture_output=True, timeout=30, check=True).stdout
+        stream = json.loads(output)["streams"][0]
+        
+        fps = 0.0
+        num, _, den = stream.get("avg_frame_rate", "0/0").partition("/")
+        if den and float(den) > 0:
+            fps = float(num) / float(den)
+        
+        return int(stream["width"]), int(stream["height"]), fps
+    
+    def _resolve_output_size(self, width: int, height: int) -> Tuple[int, int]:
+        """
+        Menentukan ukuran frame output (harus diketahui untuk membaca rawvideo)
+        
+        Args:
+            width: Lebar yang diminta (0 = ikuti sumber)
+            height: Tinggi yang diminta (0 = ikuti rasio sumber)
+        
+        Returns:
+            Tuple (width, height) output, selalu genap
+        """
+        if width > 0 and height > 0:
+            return width, height
+        
+        source_width, source_height, self.source_fps = self._probe_source()
+        if width <= 0:
+            return source_width, source_height
+        
+        # Pertahankan aspect ratio, bulatkan ke genap untuk scaler
+        height = int(round(source_height * width / source_width / 2)) * 2
+        return width, height
+    
+    def _build_command(self) -> List[str]:
+        """
+        Membangun command line ffmpeg
+        
+        Returns:
+            List argumen ffmpeg
+        """
+        command = [self.ffmpeg_path, "-hide_banner", "-loglevel", "error", "-nostdin"]
+        
+        if self.source.startswith("rtsp"):
+            command += ["-rtsp_transport", "tcp"]
+        if self._is_network_source():
+            command += ["-fflags", "nobuffer", "-flags", "low_delay"]
+        elif self.realtime:
+            command += ["-re"]
+        
+        # Opsi decoder harus berada sebelum -i
+        if self.keyframes_only:
+            command += ["-skip_frame", "nokey"]
+        
+        command += ["-i", self.source, "-an", "-sn"]
+        
+        filters = []
+        if self.output_fps > 0:
+            filters.append(f"fps={self.output_fps}")
+        filters.append(f"scale={self.width}:{self.height}")
+        command += ["-vf", ",".join(filters)]
+        
+        command += ["-f", "rawvideo", "-pix_fmt", "bgr24", "pipe:1"]
+        return command
+    
+    def _start(self):
+        """Jalankan proses ffmpeg"""
+        command = self._build_command()
+        self.logger.debug(f"Menjalankan ffmpeg: {' '.join(command)}")
+        
+        self.process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=self.frame_size
+        )
+        self.logger.info(
+            f"FFmpeg frame source dimulai: {self.width}x{self.height}, "
+            f"fps={self.output_fps or 'sumber'}, keyframes_only={self.keyframes_only}"
+        )
+    
+    def _acquire_buffer(self) -> np.ndarray:
+        """
+        Mengambil buffer berikutnya dari ring (buffer tertua ditimpa)
+        
+        Returns:
+            Buffer numpy (height, width, 3) uint8
+        """
+        buffer = self._buffers[self._next_buffer]
+        self._next_buffer = (self._next_buffer + 1) % self.num_buffers
+        return buffer
+    
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Membaca satu frame dari pipe ffmpeg
+        
+        Frame adalah buffer ring yang akan ditimpa setelah num_buffers - 1
+        pembacaan berikutnya; copy() jika disimpan lebih lama.
+        
+        Returns:
+            Tuple (success, frame) seperti cv2.VideoCapture.read()
+        """
+        if self.process is None or self.process.stdout is None:
+            return False, None
+        
+        frame = self._acquire_buffer()
+        view = memoryview(frame).cast("B")
+        received = 0
+        
+        try:
+            while received < self.frame_size:
+                count = self.process.stdout.readinto(view[received:])
+                if not count:
+                    break
+                received += count
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Error membaca pipe ffmpeg: {str(e)}")
+            return False, None
+        
+        if received < self.frame_size:
+            returncode = self.process.poll()
+            self.logger.warning(f"Stream ffmpeg berakhir (exit code: {returncode})")
+            return False, None
+        
+        self.frame_count += 1
+        return True, frame
+    
+    def isOpened(self) -> bool:
+        """Cek apakah proses ffmpeg masih berjalan"""
+        return self.process is not None and self.process.poll() is None
+    
+    def get(self, prop_id: int) -> float:
+        """
+        Mendapatkan properti stream (subset cv2.CAP_PROP_*)
+        
+        Args:
+            prop_id: cv2.CAP_PROP_FRAME_WIDTH, CAP_PROP_FRAME_HEIGHT atau CAP_PROP_FPS
+        
+        Returns:
+            Nilai properti atau 0 jika tidak didukung
+        """
+        import cv2
+        
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        if prop_id == cv2.CAP_PROP_FPS:
+            return float(self.output_fps or self.source_fps)
+        return 0.0
+    
+    def set(self, prop_id: int, value: float) -> bool:
+        """Properti diatur lewat argumen ffmpeg, set() diabaikan seperti backend OpenCV"""
+        return False
+    
+    def release(self):
+        """Hentikan proses ffmpeg"""
+        process = self.process
+        self.process = None
+        if process is None:
+            return
+        
+        try:
+            if process.stdout is not None:
+                process.stdout.close()
+            process.terminate()
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        except Exception as e:
+            self.logger.error(f"Error menghentikan ffmpeg: {str(e)}")
+    
+    def __del__(self):
+        """Destructor untuk memastikan proses ffmpeg dihentikan"""
+        self.release()
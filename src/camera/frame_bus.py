@@ -0,0 +1,293 @@
+"""
+Frame Bus - Ring buffer frame di shared memory untuk analitik multi-proses
+"""
+
+import logging
+import time
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+class StaleFrameError(RuntimeError):
+    """Slot frame bus sudah ditimpa frame lain sebelum atau selama dibaca"""
+
+
+class FrameRef:
+    """
+    Referensi frame di SharedFrameBus yang dikirim ke worker proses lain
+    sebagai pengganti ndarray
+    
+    Hanya nama bus, shape, slot dan sequence yang di-pickle (beberapa byte per
+    frame). Atribut frame menyimpan ndarray asli di proses pembuat, misalnya
+    untuk fallback jika slot sudah ditimpa sebelum worker sempat membacanya.
+    """
+    
+    __slots__ = ('name', 'shape', 'num_slots', 'slot', 'sequence', 'frame')
+    
+    def __init__(self, name: str, shape: Tuple[int, int, int], num_slots: int,
+                 slot: int, sequence: int, frame: Optional[np.ndarray] = None):
+        self.name = name
+        self.shape = tuple(shape)
+        self.num_slots = num_slots
+        self.slot = slot
+        self.sequence = sequence
+        self.frame = frame
+    
+    def __getstate__(self):
+        return self.name, self.shape, self.num_slots, self.slot, self.sequence
+    
+    def __setstate__(self, state):
+        self.name, self.shape, self.num_slots, self.slot, self.sequence = state
+        self.frame = None
+    
+    def __repr__(self) -> str:
+        return f"FrameRef({self.name}, slot={self.slot}, seq={self.sequence})"
+
+
+class SharedFrameBus:
+    """
+    Ring buffer frame di multiprocessing.shared_memory
+    
+    Proses capture menulis setiap frame satu kali ke slot yang sudah dialokasikan,
+    proses worker membaca view numpy tanpa copy berdasarkan index slot dan nomor
+    sequence. Setiap slot punya header (sequence, timestamp) bergaya seqlock:
+    sequence diset ke 0 selama penulisan, jadi pembaca bisa memastikan frame
+    belum ditimpa dengan is_valid() setelah selesai memproses.
+    """
+    
+    HEADER_FIELDS = 2        # [sequence, timestamp_ns] per slot
+    GLOBAL_FIELDS = 2        # [sequence terakhir, slot terakhir]
+    HEADER_ALIGN = 64
+    
+    def __init__(self, name: str, shape: Tuple[int, int, int], num_slots: int = 8,
+                 create: bool = True):
+        """
+        Membuat atau membuka frame bus
+        
+        Args:
+            name: Nama shared memory (unik per kamera)
+            shape: Shape frame (height, width, channels), dtype uint8
+            num_slots: Jumlah slot ring buffer
+            create: True untuk proses capture (pemilik), False untuk worker
+        """
+        self.name = name
+        self.shape = tuple(shape)
+        self.num_slots = num_slots
+        self.owner = create
+        self.logger = logging.getLogger(__name__)
+        
+        frame_bytes = int(np.prod(self.shape))
+        header_bytes = (self.GLOBAL_FIELDS + num_slots * self.HEADER_FIELDS) * 8
+        self._frames_offset = -(-header_bytes // self.HEADER_ALIGN) * self.HEADER_ALIGN
+        total_bytes = self._frames_offset + frame_bytes * num_slots
+        
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=total_bytes if create else 0)
+        if not create:
+            # Worker tidak boleh meng-unlink memory milik proses capture saat keluar
+            self._untrack()
+        
+        header = np.ndarray(
+            (self.GLOBAL_FIELDS + num_slots * self.HEADER_FIELDS,),
+            dtype=np.int64, buffer=self.shm.buf
+        )
+        self._global = header[:self.GLOBAL_FIELDS]
+        self._slots = header[self.GLOBAL_FIELDS:].reshape(num_slots, self.HEADER_FIELDS)
+        self._frames = np.ndarray(
+            (num_slots,) + self.shape, dtype=np.uint8,
+            buffer=self.shm.buf, offset=self._frames_offset
+        )
+        
+        if create:
+            header[:] = 0
+            self.logger.info(
+                f"Frame bus '{name}' dibuat: {num_slots} slot x {self.shape}, "
+                f"{total_bytes / (1024 * 1024):.1f} MB"
+            )
+    
+    @classmethod
+    def attach(cls, name: str, shape: Tuple[int, int, int], num_slots: int = 8) -> "SharedFrameBus":
+        """
+        Membuka frame bus yang sudah dibuat proses capture (dipakai di worker)
+        
+        Args:
+            name: Nama shared memory
+            shape: Shape frame (harus sama dengan pembuat)
+            num_slots: Jumlah slot (harus sama dengan pembuat)
+        
+        Returns:
+            Instance SharedFrameBus read-only secara konvensi
+        """
+        return cls(name, shape, num_slots=num_slots, create=False)
+    
+    def _untrack(self):
+        """Lepaskan shared memory dari resource_tracker proses worker"""
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(self.shm._name, "shared_memory")
+        except Exception:
+            pass
+    
+    def publish(self, frame: np.ndarray, timestamp: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Menulis frame ke slot berikutnya (satu kali copy)
+        
+        Args:
+            frame: Frame BGR dengan shape sama seperti bus
+            timestamp: Waktu capture (default: time.time())
+        
+        Returns:
+            Tuple (slot, sequence)
+        """
+        if frame.shape != self.shape:
+            raise ValueError(f"Shape frame {frame.shape} tidak sesuai bus {self.shape}")
+        
+        sequence = int(self._global[0]) + 1
+        slot = sequence % self.num_slots
+        
+        # Tandai slot sedang ditulis agar pembaca tahu view-nya tidak valid
+        self._slots[slot, 0] = 0
+        np.copyto(self._frames[slot], frame)
+        self._slots[slot, 1] = int((timestamp if timestamp is not None else time.time()) * 1e9)
+        self._slots[slot, 0] = sequence
+        
+        self._global[1] = slot
+        self._global[0] = sequence
+        return slot, sequence
+    
+    def latest(self) -> Tuple[int, int, float]:
+        """
+        Mendapatkan slot frame terbaru
+        
+        Returns:
+            Tuple (slot, sequence, timestamp); sequence 0 jika belum ada frame
+        """
+        sequence = int(self._global[0])
+        slot = sequence % self.num_slots
+        return slot, sequence, self._slots[slot, 1] / 1e9
+    
+    def view(self, slot: int, sequence: int) -> Optional[np.ndarray]:
+        """
+        Mendapatkan view numpy tanpa copy untuk slot tertentu
+        
+        View hanya valid selama slot belum ditimpa; panggil is_valid() setelah
+        memproses (atau copy frame) untuk memastikan hasilnya konsisten.
+        
+        Args:
+            slot: Index slot
+            sequence: Sequence yang diharapkan
+        
+        Returns:
+            View frame read-only atau None jika slot sudah berisi frame lain
+        """
+        if not self.is_valid(slot, sequence):
+            return None
+        frame = self._frames[slot]
+        if not self.owner:
+            frame = frame.view()
+            frame.flags.writeable = False
+        return frame
+    
+    def is_valid(self, slot: int, sequence: int) -> bool:
+        """
+        Cek apakah slot masih berisi frame dengan sequence tersebut
+        
+        Args:
+            slot: Index slot
+            sequence: Sequence yang diharapkan
+        
+        Returns:
+            True jika frame belum ditimpa
+        """
+        return sequence > 0 and int(self._slots[slot, 0]) == sequence
+    
+    def read_latest(self, copy: bool = True) -> Tuple[Optional[np.ndarray], int, float]:
+        """
+        Membaca frame terbaru
+        
+        Args:
+            copy: Salin frame agar aman dipakai setelah slot ditimpa
+        
+        Returns:
+            Tuple (frame, sequence, timestamp); frame None jika belum ada atau tertimpa
+        """
+        slot, sequence, timestamp = self.latest()
+        frame = self.view(slot, sequence)
+        if frame is None:
+            return None, sequence, timestamp
+        
+        if copy:
+            frame = frame.copy()
+            if not self.is_valid(slot, sequence):
+                return None, sequence, timestamp
+        return frame, sequence, timestamp
+    
+    def close(self):
+        """Tutup mapping shared memory (pemilik juga menghapusnya)"""
+        # Lepaskan view numpy sebelum menutup buffer
+        self._global = self._slots = self._frames = None
+        try:
+            self.shm.close()
+            if self.owner:
+                self.shm.unlink()
+        except Exception as e:
+            self.logger.error(f"Error menutup frame bus '{self.name}': {str(e)}")
+
+
+# Bus yang sudah di-attach proses worker, {nama: SharedFrameBus}
+_attached_buses: Dict[str, SharedFrameBus] = {}
+
+
+def _attach(ref: FrameRef, reattach: bool = False) -> SharedFrameBus:
+    """Bus untuk referensi frame, attach sekali per proses (ulang jika bus dibuat ulang)"""
+    bus = _attached_buses.get(ref.name)
+    if bus is not None and (reattach or bus.shape != ref.shape or bus.num_slots != ref.num_slots):
+        bus.close()
+        bus = None
+    if bus is None:
+        _attached_buses.pop(ref.name, None)
+        try:
+            bus = SharedFrameBus.attach(ref.name, ref.shape, ref.num_slots)
+        except FileNotFoundError:
+            # Kamera sudah ditutup atau bus sedang dibuat ulang
+            raise StaleFrameError(f"Frame bus {ref.name} tidak ada")
+        _attached_buses[ref.name] = bus
+    return bus
+
+
+def resolve_frame_ref(ref: FrameRef) -> np.ndarray:
+    """
+    View frame tanpa copy untuk referensi frame (dipakai di proses worker)
+    
+    Args:
+        ref: Referensi frame dari proses capture
+    
+    Returns:
+        View frame read-only
+    
+    Raises:
+        StaleFrameError: Slot sudah berisi frame lain
+    """
+    frame = _attach(ref).view(ref.slot, ref.sequence)
+    if frame is None:
+        # Bisa juga mapping lama: bus dibuat ulang proses capture dengan nama sama
+        frame = _attach(ref, reattach=True).view(ref.slot, ref.sequence)
+    if frame is None:
+        raise StaleFrameError(f"Frame {ref} sudah ditimpa sebelum dibaca")
+    return frame
+
+
+def check_frame_ref(ref: FrameRef):
+    """
+    Pastikan slot belum ditimpa selama frame diproses (seqlock)
+    
+    Args:
+        ref: Referensi frame yang sudah di-resolve
+    
+    Raises:
+        StaleFrameError: Slot ditimpa, hasil dari view tidak bisa dipercaya
+    """
+    bus = _attached_buses.get(ref.name)
+    if bus is None or not bus.is_valid(ref.slot, ref.sequence):
+        raise StaleFrameError(f"Frame {ref} ditimpa saat diproses")
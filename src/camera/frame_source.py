@@ -0,0 +1,165 @@
+"""
+Frame Source - Antarmuka umum untuk semua sumber frame (kamera live, replay)
+"""
+
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+
+class FrameSource(ABC):
+    """
+    Kelas dasar sumber frame yang dipakai loop deteksi
+    
+    Subclass wajib mengimplementasikan connect(), read_frame(), release() dan
+    capture_photo() (abstract, dicek saat instansiasi), serta mengisi atribut
+    camera_id, name, ip dan is_connected. Method lain punya implementasi default
+    untuk sumber tanpa thread capture/reconnect.
+    """
+    
+    @property
+    def label(self) -> str:
+        """Label sumber untuk log dan notifikasi"""
+        return self.name
+    
+    @abstractmethod
+    def connect(self) -> bool:
+        """
+        Membuka sumber frame
+        
+        Returns:
+            True jika berhasil, False jika gagal
+        """
+    
+    @abstractmethod
+    def read_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Membaca satu frame
+        
+        Returns:
+            Tuple (success, frame)
+        """
+    
+    @abstractmethod
+    def release(self):
+        """Membebaskan resource sumber frame"""
+    
+    def close(self):
+        """Hentikan semua thread dan bebaskan resource"""
+        self.release()
+    
+    def is_live(self) -> bool:
+        """
+        Cek apakah sumber berjalan mengikuti jam dinding (kamera atau replay realtime)
+        
+        Sumber non-live dibaca secepat pacing-nya dan loop deteksi memakai clock()
+        sumber, bukan time.time(), untuk interval dan cooldown.
+        """
+        return True
+    
+    def is_finished(self) -> bool:
+        """Cek apakah sumber sudah habis (hanya relevan untuk replay)"""
+        return False
+    
+    def clock(self) -> float:
+        """
+        Waktu sumber saat ini (detik epoch)
+        
+        Returns:
+            time.time() untuk sumber live, waktu media untuk replay
+        """
+        return time.time()
+    
+    def start_capture(self) -> bool:
+        """Mulai thread capture (default: tidak didukung)"""
+        return False
+    
+    def is_capture_running(self) -> bool:
+        """Cek apakah thread capture berjalan"""
+        return False
+    
+    def get_latest_frame(self) -> Tuple[Optional[np.ndarray], int, float]:
+        """
+        Mengambil frame terbaru dari slot thread capture
+        
+        Returns:
+            Tuple (frame, sequence_number, capture_timestamp)
+        """
+        return None, 0, 0.0
+    
+    def get_latest_frame_ref(self, sequence: int, frame: Optional[np.ndarray] = None):
+        """
+        Referensi frame bus shared memory untuk frame terbaru
+        
+        Returns:
+            FrameRef atau None (default: tidak ada frame bus)
+        """
+        return None
+    
+    def request_reconnect(self) -> bool:
+        """Minta reconnect di background (default: tidak didukung)"""
+        return False
+    
+    def get_health(self) -> dict:
+        """
+        Status kesehatan sumber (lihat CameraHealth)
+        
+        Returns:
+            Dictionary status, frame_age, measured_fps, consecutive_failures
+        """
+        return {
+            'status': "ok" if self.is_connected else "dead",
+            'frame_age': 0.0,
+            'measured_fps': 0.0,
+            'consecutive_failures': 0
+        }
+    
+    def check_connection(self) -> bool:
+        """Cek apakah sumber masih bisa dipakai"""
+        return self.is_connected
+    
+    def add_state_listener(self, callback: Callable[[str, str], None]):
+        """Daftarkan listener perubahan state (default: tidak ada perubahan state)"""
+    
+    def has_dual_stream(self) -> bool:
+        """Cek apakah sumber punya stream resolusi penuh terpisah"""
+        return False
+    
+    def capture_main_frame(self) -> Optional[np.ndarray]:
+        """
+        Mengambil frame resolusi penuh untuk bukti notifikasi
+        
+        Returns:
+            Frame atau None jika gagal
+        """
+        ret, frame = self.read_frame()
+        return frame if ret else None
+    
+    def map_bbox_to_main(self, bbox: Tuple, main_shape: Optional[Tuple[int, ...]] = None) -> Tuple:
+        """Memetakan bounding box ke resolusi main stream (default: identitas)"""
+        return tuple(bbox)
+    
+    @abstractmethod
+    def capture_photo(self, filename: Optional[str] = None,
+                      use_main_stream: bool = True) -> Optional[np.ndarray]:
+        """
+        Mengambil satu foto dari sumber
+        
+        Args:
+            filename: Nama file untuk menyimpan foto (opsional)
+            use_main_stream: Ambil dari stream resolusi penuh jika ada
+        
+        Returns:
+            Frame atau None jika gagal
+        """
+    
+    def get_properties(self) -> dict:
+        """
+        Mendapatkan properti sumber
+        
+        Returns:
+            Dictionary width, height, fps, ip, port
+        """
+        return {}
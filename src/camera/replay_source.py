@@ -0,0 +1,261 @@
+"""
+Replay Source - Memutar ulang file video atau direktori gambar sebagai sumber frame
+"""
+
+import logging
+import os
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .frame_source import FrameSource
+
+
+class ReplaySource(FrameSource):
+    """Kelas sumber frame dari rekaman untuk reproduksi deteksi dan benchmark"""
+    
+    PACING_REALTIME = "realtime"  # Ikuti jam dinding seperti kamera live, frame di-skip jika tertinggal
+    PACING_FAST = "fast"          # Setiap frame secepat mungkin (benchmark / regression test)
+    PACING_FIXED = "fixed"        # Setiap frame pada FPS tetap
+    
+    IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+    
+    def __init__(self, path: str, pacing: str = "fast", fps: float = 0.0,
+                 loop: bool = False, camera_id: str = "replay", name: Optional[str] = None):
+        """
+        Inisialisasi Replay Source
+        
+        Args:
+            path: Path file video atau direktori berisi gambar (diurutkan berdasarkan nama)
+            pacing: Mode pacing: "realtime", "fast" atau "fixed" (default: "fast")
+            fps: FPS untuk pacing "fixed" dan timeline direktori gambar
+                (0 = FPS file video, atau 1 untuk direktori gambar)
+            loop: Ulangi dari awal setelah selesai (default: False)
+            camera_id: ID sumber di CameraPool (default: "replay")
+            name: Nama untuk log dan notifikasi (default: nama file/direktori)
+        """
+        if pacing not in (self.PACING_REALTIME, self.PACING_FAST, self.PACING_FIXED):
+            raise ValueError(f"Pacing replay tidak dikenal: {pacing}")
+        
+        self.path = path
+        self.pacing = pacing
+        self.fps = fps
+        self.loop = loop
+        self.camera_id = str(camera_id)
+        self.name = name or os.path.basename(os.path.normpath(path))
+        self.ip = "replay"
+        self.port = 0
+        self.is_connected = False
+        
+        self.cap: Optional[cv2.VideoCapture] = None
+        self.image_files: List[Path] = []
+        self.source_fps = 0.0
+        self.position = 0          # Index frame berikutnya yang akan dibaca
+        self.frames_read = 0
+        self._finished = False
+        self._start_wall = 0.0
+        self._last_frame: Optional[np.ndarray] = None
+        
+        self.logger = logging.getLogger(__name__)
+    
+    def connect(self) -> bool:
+        """
+        Membuka file video atau daftar gambar
+        
+        Returns:
+            True jika berhasil, False jika gagal
+        """
+        try:
+            if os.path.isdir(self.path):
+                self.image_files = sorted(
+                    p for p in Path(self.path).iterdir()
+                    if p.suffix.lower() in self.IMAGE_EXTENSIONS
+                )
+                if not self.image_files:
+                    raise Exception(f"Tidak ada gambar di direktori {self.path}")
+                self.source_fps = self.fps or 1.0
+            else:
+                self.cap = cv2.VideoCapture(self.path)
+                if not self.cap.isOpened():
+                    raise Exception(f"Gagal membuka file video {self.path}")
+                self.source_fps = self.cap.get(cv2.CAP_PROP_FPS) or 25.0
+            
+            self.position = 0
+            self.frames_read = 0
+            self._finished = False
+            self._start_wall = time.time()
+            self.is_connected = True
+            self.logger.info(f"Replay {self.label} dibuka (pacing: {self.pacing}, FPS sumber: {self.source_fps:.1f})")
+            return True
+        
+        except Exception as e:
+            self.logger.error(f"Error membuka replay: {str(e)}")
+            self.release()
+            return False
+    
+    def _pacing_fps(self) -> float:
+        """FPS yang dipakai untuk menjadwalkan frame"""
+        if self.pacing == self.PACING_FIXED and self.fps > 0:
+            return self.fps
+        return self.source_fps
+    
+    def _rewind(self) -> bool:
+        """
+        Kembali ke awal rekaman jika loop aktif
+        
+        Returns:
+            True jika berhasil diulang, False jika replay selesai
+        """
+        if not self.loop:
+            self._finished = True
+            self.logger.info(f"Replay {self.label} selesai ({self.frames_read} frame)")
+            return False
+        
+        if self.cap is not None:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        self.position = 0
+        self._start_wall = time.time()
+        return True
+    
+    def _skip_frames(self, count: int):
+        """
+        Lewati frame tanpa decode penuh (mode realtime yang tertinggal)
+        
+        Args:
+            count: Jumlah frame yang dilewati
+        """
+        if self.cap is not None:
+            for _ in range(count):
+                if not self.cap.grab():
+                    break
+        self.position += count
+    
+    def _read_next(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Membaca frame berikutnya dari video atau direktori gambar
+        
+        Returns:
+            Tuple (success, frame)
+        """
+        for _ in range(2):  # Satu kali ulang setelah rewind
+            if self.cap is not None:
+                ret, frame = self.cap.read()
+            elif self.position < len(self.image_files):
+                frame = cv2.imread(str(self.image_files[self.position]))
+                ret = frame is not None
+            else:
+                ret, frame = False, None
+            
+            if ret:
+                self.position += 1
+                return True, frame
+            
+            if self.cap is None and self.position < len(self.image_files):
+                # Gambar rusak: lewati saja
+                self.logger.warning(f"Gagal membaca {self.image_files[self.position]}")
+                self.position += 1
+                return False, None
+            
+            if not self._rewind():
+                return False, None
+        
+        return False, None
+    
+    def read_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Membaca frame berikutnya sesuai mode pacing
+        
+        Mode "fixed" menunggu (time.sleep) sampai jadwal frame; panggil dari thread
+        jika dipakai di dalam event loop.
+        
+        Returns:
+            Tuple (success, frame)
+        """
+        if not self.is_connected or self._finished:
+            return False, None
+        
+        fps = self._pacing_fps()
+        
+        if self.pacing == self.PACING_REALTIME:
+            # Frame yang "sedang tayang" menurut jam dinding, lewati frame yang tertinggal
+            target = int((time.time() - self._start_wall) * fps)
+            if target > self.position:
+                self._skip_frames(target - self.position)
+        elif self.pacing == self.PACING_FIXED:
+            due_time = self._start_wall + self.position / fps
+            delay = due_time - time.time()
+            if delay > 0:
+                time.sleep(delay)
+        
+        ret, frame = self._read_next()
+        if ret:
+            self.frames_read += 1
+            self._last_frame = frame
+        return ret, frame
+    
+    def is_live(self) -> bool:
+        """Replay realtime berperilaku seperti kamera live"""
+        return self.pacing == self.PACING_REALTIME
+    
+    def is_finished(self) -> bool:
+        """Cek apakah semua frame sudah dibaca"""
+        return self._finished
+    
+    def clock(self) -> float:
+        """
+        Waktu media frame terakhir, dipetakan ke epoch mulai replay
+        
+        Returns:
+            Detik epoch sesuai posisi rekaman (time.time() untuk mode realtime)
+        """
+        if self.pacing == self.PACING_REALTIME:
+            return time.time()
+        return self._start_wall + max(0, self.position - 1) / self._pacing_fps()
+    
+    def capture_photo(self, filename: Optional[str] = None,
+                      use_main_stream: bool = True) -> Optional[np.ndarray]:
+        """
+        Mengambil frame terakhir yang dibaca tanpa memajukan replay
+        
+        Args:
+            filename: Nama file untuk menyimpan foto (opsional)
+            use_main_stream: Diabaikan, replay hanya punya satu stream
+        
+        Returns:
+            Frame terakhir atau None jika belum ada
+        """
+        frame = self._last_frame
+        if frame is not None and filename:
+            cv2.imwrite(filename, frame)
+        return frame
+    
+    def capture_main_frame(self) -> Optional[np.ndarray]:
+        """Frame bukti replay adalah frame terakhir yang dianalisis"""
+        return self._last_frame
+    
+    def get_properties(self) -> dict:
+        """
+        Mendapatkan properti replay
+        
+        Returns:
+            Dictionary width, height, fps, ip, port
+        """
+        if self._last_frame is None:
+            return {}
+        return {
+            'width': self._last_frame.shape[1],
+            'height': self._last_frame.shape[0],
+            'fps': int(self._pacing_fps()),
+            'ip': self.ip,
+            'port': self.port
+        }
+    
+    def release(self):
+        """Menutup file video"""
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+        self.is_connected = False
@@ -4,30 +4,84 @@ Face Detector - Mendeteksi wajah dari frame kamera
 
 import cv2
 import logging
+import os
 import numpy as np
 from typing import List, Tuple, Optional
 
 
 class FaceDetector:
-    """Kelas untuk mendeteksi wajah menggunakan OpenCV Haar Cascade"""
+    """Kelas untuk mendeteksi wajah menggunakan OpenCV Haar Cascade atau model DNN (YuNet / SSD)"""
+    
+    BACKEND_HAAR = "haar"    # Haar Cascade bawaan OpenCV
+    BACKEND_YUNET = "yunet"  # cv2.FaceDetectorYN, dengan 5 landmark
+    BACKEND_SSD = "ssd"      # res10 SSD Caffe via cv2.dnn, tanpa landmark
+    
+    DEFAULT_MODELS = {
+        BACKEND_YUNET: "models/face_detection_yunet_2023mar.onnx",
+        BACKEND_SSD: "models/res10_300x300_ssd_iter_140000.caffemodel"
+    }
+    SSD_MEAN = (104.0, 177.0, 123.0)
     
     def __init__(self, scale_factor: float = 1.1, min_neighbors: int = 5, 
-                 min_size: Tuple[int, int] = (30, 30)):
+                 min_size: Tuple[int, int] = (30, 30), backend: str = "haar",
+                 model_path: Optional[str] = None, input_size: int = 320,
+                 score_threshold: float = 0.6, nms_threshold: float = 0.3):
         """
         Inisialisasi Face Detector
         
         Args:
-            scale_factor: Faktor skala untuk pyramid image
-            min_neighbors: Jumlah minimum neighbor untuk deteksi
+            scale_factor: Faktor skala untuk pyramid image (Haar)
+            min_neighbors: Jumlah minimum neighbor untuk deteksi (Haar)
             min_size: Ukuran minimum wajah (width, height)
+            backend: "haar", "yunet" atau "ssd" (default: "haar")
+            model_path: Path model DNN (default: DEFAULT_MODELS[backend]); SSD
+                membutuhkan deploy.prototxt di direktori yang sama
+            input_size: Sisi terpanjang gambar input model DNN (SSD: kotak input_size)
+            score_threshold: Confidence minimal wajah (DNN)
+            nms_threshold: Threshold NMS (YuNet)
         """
         self.scale_factor = scale_factor
         self.min_neighbors = min_neighbors
         self.min_size = min_size
+        self.backend = backend
+        self.model_path = model_path or self.DEFAULT_MODELS.get(backend)
+        self.input_size = input_size
+        self.score_threshold = score_threshold
+        self.nms_threshold = nms_threshold
         self.face_cascade = None
+        self.dnn_model = None
         self.logger = logging.getLogger(__name__)
         
-        self._load_cascade()
+        if backend not in (self.BACKEND_HAAR, self.BACKEND_YUNET, self.BACKEND_SSD):
+            raise ValueError(f"Backend face detector tidak dikenal: {backend}")
+        
+        if backend != self.BACKEND_HAAR:
+            self._load_dnn_model()
+        if self.backend == self.BACKEND_HAAR:
+            self._load_cascade()
+    
+    def _load_dnn_model(self):
+        """Memuat model wajah DNN, kembali ke Haar jika model tidak tersedia"""
+        try:
+            if not self.model_path or not os.path.exists(self.model_path):
+                raise Exception(f"File model {self.model_path} tidak ditemukan")
+            
+            if self.backend == self.BACKEND_YUNET:
+                # Ukuran input diset ulang setiap gambar (setInputSize)
+                self.dnn_model = cv2.FaceDetectorYN.create(
+                    self.model_path, "", (self.input_size, self.input_size),
+                    self.score_threshold, self.nms_threshold
+                )
+            else:
+                prototxt = os.path.join(os.path.dirname(self.model_path), "deploy.prototxt")
+                self.dnn_model = cv2.dnn.readNetFromCaffe(prototxt, self.model_path)
+            
+            self.logger.info(f"Model face detector {self.backend} dimuat dari {self.model_path} (input {self.input_size})")
+        
+        except Exception as e:
+            self.logger.error(f"Error memuat model face detector {self.backend}: {str(e)}, memakai Haar Cascade")
+            self.backend = self.BACKEND_HAAR
+            self.dnn_model = None
     
     def _load_cascade(self):
         """Memuat model Haar Cascade untuk deteksi wajah"""
@@ -60,6 +114,12 @@ class FaceDetector:
             if self.face_cascade.empty():
                 self.logger.error("Gagal memuat face cascade dari semua path")
     
+    def is_loaded(self) -> bool:
+        """Cek apakah model deteksi wajah siap dipakai"""
+        if self.backend == self.BACKEND_HAAR:
+            return self.face_cascade is not None and not self.face_cascade.empty()
+        return self.dnn_model is not None
+    
     def detect_faces(self, frame: np.ndarray) -> List[Tuple[int, int, int, int]]:
         """
         Mendeteksi wajah dalam frame
@@ -70,39 +130,236 @@ class FaceDetector:
         Returns:
             List koordinat wajah [(x, y, w, h), ...]
         """
-        if self.face_cascade is None or self.face_cascade.empty():
-            self.logger.warning("Face cascade tidak dimuat")
+        return [face['bbox'] for face in self.detect_faces_with_landmarks(frame)]
+    
+    def detect_faces_with_landmarks(self, frame: np.ndarray) -> List[dict]:
+        """
+        Mendeteksi wajah beserta confidence dan landmark (jika backend mendukung)
+        
+        Args:
+            frame: Frame dari kamera (numpy array)
+        
+        Returns:
+            List dict {'bbox': (x, y, w, h), 'score': float atau None,
+            'landmarks': [(x, y) x5: mata kanan, mata kiri, hidung, mulut kanan,
+            mulut kiri] atau None}
+        """
+        if not self.is_loaded():
+            self.logger.warning("Model face detector tidak dimuat")
             return []
         
         try:
-            # Convert ke grayscale
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            return self._detect_region(frame, self.min_size[0], 0)
             
-            # Equalize histogram untuk meningkatkan deteksi
+        except Exception as e:
+            self.logger.error(f"Error mendeteksi wajah: {str(e)}")
+            return []
+    
+    def _detect_region(self, image: np.ndarray, min_side: int, max_side: int) -> List[dict]:
+        """
+        Deteksi wajah di satu gambar/region dengan backend aktif
+        
+        Args:
+            image: Gambar BGR
+            min_side: Sisi wajah minimal (piksel)
+            max_side: Sisi wajah maksimal (0 = tanpa batas)
+        
+        Returns:
+            List dict wajah di koordinat gambar (lihat detect_faces_with_landmarks)
+        """
+        if self.backend == self.BACKEND_HAAR:
+            # Convert ke grayscale dan equalize histogram untuk meningkatkan deteksi
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
             gray = cv2.equalizeHist(gray)
             
-            # Deteksi wajah
+            options = {'maxSize': (max_side, max_side)} if max_side else {}
             faces = self.face_cascade.detectMultiScale(
                 gray,
                 scaleFactor=self.scale_factor,
                 minNeighbors=self.min_neighbors,
-                minSize=self.min_size
+                minSize=(min_side, min_side),
+                **options
             )
+            return [
+                {'bbox': (int(x), int(y), int(w), int(h)), 'score': None, 'landmarks': None}
+                for (x, y, w, h) in faces
+            ]
+        
+        if self.backend == self.BACKEND_YUNET:
+            faces = self._detect_yunet(image)
+        else:
+            faces = self._detect_ssd(image)
+        
+        return [
+            face for face in faces
+            if face['bbox'][3] >= min_side and (not max_side or face['bbox'][3] <= max_side)
+        ]
+    
+    def _detect_yunet(self, image: np.ndarray) -> List[dict]:
+        """
+        Deteksi wajah YuNet; gambar diperkecil agar sisi terpanjang <= input_size
+        
+        Args:
+            image: Gambar BGR
+        
+        Returns:
+            List dict wajah dengan landmark
+        """
+        height, width = image.shape[:2]
+        scale = min(1.0, self.input_size / max(height, width))
+        if scale < 1.0:
+            image = cv2.resize(image, (max(1, int(width * scale)), max(1, int(height * scale))),
+                               interpolation=cv2.INTER_AREA)
+        
+        self.dnn_model.setInputSize((image.shape[1], image.shape[0]))
+        _, detections = self.dnn_model.detect(image)
+        if detections is None:
+            return []
+        
+        # Baris: x, y, w, h, 5 landmark (x, y), score
+        detections = detections.copy()
+        detections[:, :14] /= scale
+        results = []
+        for row in detections:
+            x, y, w, h = row[:4].astype(int).tolist()
+            # Potong ke batas gambar: sisi kanan/bawah dihitung dulu agar box
+            # wajah di tepi kiri/atas tidak bergeser
+            x2, y2 = min(x + w, width), min(y + h, height)
+            x, y = max(0, x), max(0, y)
+            if x2 <= x or y2 <= y:
+                continue
+            results.append({
+                'bbox': (x, y, x2 - x, y2 - y),
+                'score': float(row[14]),
+                'landmarks': [tuple(point) for point in row[4:14].reshape(5, 2).astype(int).tolist()]
+            })
+        return results
+    
+    def _detect_ssd(self, image: np.ndarray) -> List[dict]:
+        """
+        Deteksi wajah res10 SSD (input kotak input_size x input_size)
+        
+        Args:
+            image: Gambar BGR
+        
+        Returns:
+            List dict wajah tanpa landmark
+        """
+        height, width = image.shape[:2]
+        blob = cv2.dnn.blobFromImage(image, 1.0, (self.input_size, self.input_size), self.SSD_MEAN)
+        self.dnn_model.setInput(blob)
+        
+        # Output [1, 1, N, 7]: _, class, score, x1, y1, x2, y2 (relatif 0-1)
+        detections = self.dnn_model.forward()[0, 0]
+        detections = detections[detections[:, 2] >= self.score_threshold]
+        
+        boxes = (detections[:, 3:7] * (width, height, width, height)).clip(0, (width, height, width, height))
+        results = []
+        for (x1, y1, x2, y2), score in zip(boxes.astype(int).tolist(), detections[:, 2].tolist()):
+            if x2 > x1 and y2 > y1:
+                results.append({'bbox': (x1, y1, x2 - x1, y2 - y1), 'score': score, 'landmarks': None})
+        return results
+    
+    def detect_faces_in_persons(self, frame: np.ndarray,
+                                persons: List[Tuple[int, int, int, int]],
+                                head_fraction: float = 0.4,
+                                min_face_ratio: float = 0.08,
+                                max_face_ratio: float = 0.4) -> List[Tuple[int, int, int, int]]:
+        """
+        Mendeteksi wajah hanya di bagian atas bounding box orang
+        
+        Detektor dijalankan per region kepala (bukan seluruh frame) dengan minSize dan
+        maxSize dari tinggi bbox orang, sehingga area scan jauh lebih kecil dan
+        wajah palsu di poster/tekstur di luar orang tidak terdeteksi. Detektor
+        dipanggil sekali per orang; wajah ganda dari region yang tumpang tindih
+        dibuang setelahnya.
+        
+        Args:
+            frame: Frame dari kamera (numpy array)
+            persons: List bbox orang [(x, y, w, h), ...] di koordinat frame
+            head_fraction: Bagian atas bbox orang yang dicari (0.4 = 40% teratas)
+            min_face_ratio: Tinggi wajah minimal relatif terhadap tinggi orang
+            max_face_ratio: Tinggi wajah maksimal relatif terhadap tinggi orang
+        
+        Returns:
+            List koordinat wajah [(x, y, w, h), ...] di koordinat frame
+        """
+        if not self.is_loaded():
+            self.logger.warning("Model face detector tidak dimuat")
+            return []
+        
+        try:
+            frame_height, frame_width = frame.shape[:2]
+            faces = []
+            scanned_area = 0
             
-            return faces.tolist()
+            for (x, y, w, h) in persons:
+                # Region kepala: bagian atas bbox, sedikit diperlebar untuk kepala miring
+                margin = int(w * 0.1)
+                x1 = max(0, x - margin)
+                y1 = max(0, y)
+                x2 = min(frame_width, x + w + margin)
+                y2 = min(frame_height, y + max(1, int(h * head_fraction)))
+                
+                min_side = max(self.min_size[0], int(h * min_face_ratio))
+                max_side = max(min_side, int(h * max_face_ratio))
+                if x2 - x1 < min_side or y2 - y1 < min_side:
+                    continue
+                
+                scanned_area += (x2 - x1) * (y2 - y1)
+                for face in self._detect_region(frame[y1:y2, x1:x2], min_side, max_side):
+                    fx, fy, fw, fh = face['bbox']
+                    faces.append((fx + x1, fy + y1, fw, fh))
             
+            faces = self._deduplicate(faces)
+            self.logger.debug(
+                f"Face detection di {len(persons)} region orang: {len(faces)} wajah, "
+                f"area scan {scanned_area / (frame_width * frame_height) * 100:.1f}% frame"
+            )
+            return faces
+        
         except Exception as e:
-            self.logger.error(f"Error mendeteksi wajah: {str(e)}")
+            self.logger.error(f"Error mendeteksi wajah di region orang: {str(e)}")
             return []
     
+    @staticmethod
+    def _deduplicate(faces: List[Tuple[int, int, int, int]],
+                     overlap: float = 0.5) -> List[Tuple[int, int, int, int]]:
+        """
+        Buang wajah ganda dari region orang yang saling tumpang tindih
+        
+        Args:
+            faces: List koordinat wajah
+            overlap: Rasio irisan terhadap wajah yang lebih kecil agar dianggap sama
+        
+        Returns:
+            List koordinat wajah unik
+        """
+        unique = []
+        for face in sorted(faces, key=lambda f: f[2] * f[3], reverse=True):
+            x, y, w, h = face
+            duplicate = False
+            for (ux, uy, uw, uh) in unique:
+                inter_w = min(x + w, ux + uw) - max(x, ux)
+                inter_h = min(y + h, uy + uh) - max(y, uy)
+                if inter_w > 0 and inter_h > 0 and inter_w * inter_h >= overlap * min(w * h, uw * uh):
+                    duplicate = True
+                    break
+            if not duplicate:
+                unique.append(face)
+        return unique
+    
     def detect_and_crop_faces(self, frame: np.ndarray, 
-                              padding: int = 10) -> List[Tuple[np.ndarray, Tuple[int, int, int, int]]]:
+                              padding: int = 10,
+                              relative: bool = False) -> List[Tuple[np.ndarray, Tuple[int, int, int, int]]]:
         """
         Mendeteksi wajah dan crop dari frame
         
         Args:
             frame: Frame dari kamera
             padding: Padding tambahan di sekitar wajah
+            relative: Koordinat wajah relatif terhadap crop (untuk encode dengan
+                box detektor), bukan koordinat frame
             
         Returns:
             List (cropped_face, coordinates)
@@ -122,7 +379,7 @@ class FaceDetector:
                 face = frame[y1:y2, x1:x2]
                 
                 if face.size > 0:
-                    result.append((face, (x, y, w, h)))
+                    result.append((face, (x - x1, y - y1, w, h) if relative else (x, y, w, h)))
                     
             except Exception as e:
                 self.logger.error(f"Error cropping wajah: {str(e)}")
@@ -0,0 +1,248 @@
+"""
+Face Gallery - Penyimpanan embedding wajah dalam matriks float32 kontigu
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class FaceGallery:
+    """
+    Galeri embedding wajah dengan beberapa sampel per identitas
+    
+    Semua embedding disimpan di satu matriks float32 yang dialokasikan di depan
+    dan diperbesar dua kali lipat saat penuh, dengan kolom identitas integer
+    per baris. Penghapusan identitas O(1) dengan menandainya tidak aktif
+    (tombstone); baris-barisnya diabaikan saat pencarian dan dibuang saat
+    compact() (otomatis jika lebih dari separuh baris sudah mati).
+    """
+    
+    AGGREGATION_MIN = "min"    # Jarak identitas = jarak sampel terdekat
+    AGGREGATION_MEAN = "mean"  # Jarak identitas = rata-rata jarak semua sampelnya
+    
+    def __init__(self, dimension: int = 128, capacity: int = 64, aggregation: str = "min"):
+        """
+        Inisialisasi Face Gallery
+        
+        Args:
+            dimension: Dimensi embedding (128 untuk dlib)
+            capacity: Jumlah baris awal yang dialokasikan
+            aggregation: Agregasi jarak per identitas: "min" atau "mean"
+        """
+        if aggregation not in (self.AGGREGATION_MIN, self.AGGREGATION_MEAN):
+            raise ValueError(f"Agregasi galeri tidak dikenal: {aggregation}")
+        
+        self.dimension = dimension
+        self.aggregation = aggregation
+        self.logger = logging.getLogger(__name__)
+        
+        self._embeddings = np.empty((max(1, capacity), dimension), dtype=np.float32)
+        self._squared_norms = np.empty(max(1, capacity), dtype=np.float32)
+        self._identities = np.empty(max(1, capacity), dtype=np.int32)
+        self._size = 0  # Baris terpakai, termasuk baris identitas yang sudah dihapus
+        self._dead_rows = 0
+        
+        self._names: List[str] = []          # id identitas -> nama
+        self._alive: List[bool] = []         # id identitas -> masih aktif
+        self._sample_counts: List[int] = []  # id identitas -> jumlah sampel
+        self._ids: Dict[str, int] = {}       # nama -> id identitas aktif
+    
+    def __len__(self) -> int:
+        """Jumlah identitas aktif"""
+        return len(self._ids)
+    
+    @property
+    def sample_count(self) -> int:
+        """Jumlah embedding aktif"""
+        return self._size - self._dead_rows
+    
+    def names(self) -> List[str]:
+        """Nama semua identitas aktif"""
+        return list(self._ids.keys())
+    
+    def samples_of(self, name: str) -> int:
+        """Jumlah sampel identitas (0 jika tidak ada)"""
+        identity = self._ids.get(name)
+        return self._sample_counts[identity] if identity is not None else 0
+    
+    def _grow(self, required: int):
+        """Perbesar matriks (dua kali lipat) agar muat required baris"""
+        capacity = len(self._embeddings)
+        if required <= capacity:
+            return
+        while capacity < required:
+            capacity *= 2
+        
+        embeddings = np.empty((capacity, self.dimension), dtype=np.float32)
+        embeddings[:self._size] = self._embeddings[:self._size]
+        squared_norms = np.empty(capacity, dtype=np.float32)
+        squared_norms[:self._size] = self._squared_norms[:self._size]
+        identities = np.empty(capacity, dtype=np.int32)
+        identities[:self._size] = self._identities[:self._size]
+        self._embeddings, self._squared_norms, self._identities = embeddings, squared_norms, identities
+    
+    def add(self, name: str, embedding: np.ndarray) -> int:
+        """
+        Tambah satu sampel embedding untuk identitas (dibuat jika belum ada)
+        
+        Args:
+            name: Nama orang
+            embedding: Embedding wajah (dimension,)
+        
+        Returns:
+            Jumlah sampel identitas setelah ditambah
+        """
+        identity = self._ids.get(name)
+        if identity is None:
+            identity = len(self._names)
+            self._names.append(name)
+            self._alive.append(True)
+            self._sample_counts.append(0)
+            self._ids[name] = identity
+        
+        self._grow(self._size + 1)
+        row = self._size
+        self._embeddings[row] = np.asarray(embedding, dtype=np.float32).reshape(self.dimension)
+        self._squared_norms[row] = float(self._embeddings[row] @ self._embeddings[row])
+        self._identities[row] = identity
+        self._size += 1
+        self._sample_counts[identity] += 1
+        return self._sample_counts[identity]
+    
+    def remove(self, name: str) -> bool:
+        """
+        Hapus identitas beserta semua sampelnya (tombstone, O(1))
+        
+        Args:
+            name: Nama orang
+        
+        Returns:
+            True jika identitas ada
+        """
+        identity = self._ids.pop(name, None)
+        if identity is None:
+            return False
+        
+        self._alive[identity] = False
+        self._dead_rows += self._sample_counts[identity]
+        self._sample_counts[identity] = 0
+        
+        if self._dead_rows * 2 > self._size:
+            self.compact()
+        return True
+    
+    def clear(self):
+        """Hapus semua identitas (kapasitas tetap)"""
+        self._size = 0
+        self._dead_rows = 0
+        self._names, self._alive, self._sample_counts, self._ids = [], [], [], {}
+    
+    def compact(self):
+        """Buang baris identitas yang sudah dihapus dan nomori ulang id identitas"""
+        rows = self._identities[:self._size]
+        keep = np.asarray(self._alive, dtype=bool)[rows] if self._size else np.zeros(0, dtype=bool)
+        
+        # Id lama -> id baru berurutan untuk identitas yang masih aktif
+        remap = np.full(len(self._names), -1, dtype=np.int32)
+        names, counts = [], []
+        for identity, name in enumerate(self._names):
+            if self._alive[identity]:
+                remap[identity] = len(names)
+                names.append(name)
+                counts.append(self._sample_counts[identity])
+        
+        kept = int(keep.sum())
+        self._embeddings[:kept] = self._embeddings[:self._size][keep]
+        self._squared_norms[:kept] = self._squared_norms[:self._size][keep]
+        self._identities[:kept] = remap[rows[keep]]
+        self._size = kept
+        self._dead_rows = 0
+        
+        self._names = names
+        self._alive = [True] * len(names)
+        self._sample_counts = counts
+        self._ids = {name: identity for identity, name in enumerate(names)}
+        self.logger.debug(f"Galeri wajah di-compact: {kept} sampel, {len(names)} identitas")
+    
+    def search(self, embeddings: np.ndarray) -> Tuple[List[Optional[str]], np.ndarray]:
+        """
+        Cari identitas terdekat untuk setiap embedding query (vektorisasi penuh)
+        
+        Args:
+            embeddings: Array (N, dimension) embedding query
+        
+        Returns:
+            Tuple (nama identitas terdekat per query atau None jika galeri kosong,
+            jarak euclid per query)
+        """
+        queries = np.asarray(embeddings, dtype=np.float32).reshape(-1, self.dimension)
+        if len(self._ids) == 0 or len(queries) == 0:
+            return [None] * len(queries), np.ones(len(queries), dtype=np.float32)
+        
+        rows = self._identities[:self._size]
+        alive_rows = np.asarray(self._alive, dtype=bool)[rows]
+        
+        # |q - g|^2 = |q|^2 + |g|^2 - 2 q.g, satu perkalian matriks untuk semua pasangan
+        squared = (
+            (queries * queries).sum(axis=1)[:, None]
+            + self._squared_norms[:self._size][None, :]
+            - 2.0 * queries @ self._embeddings[:self._size].T
+        )
+        distances = np.sqrt(np.maximum(squared, 0.0))
+        
+        if self.aggregation == self.AGGREGATION_MIN:
+            distances[:, ~alive_rows] = np.inf
+            best_rows = distances.argmin(axis=1)
+            best_identities = rows[best_rows]
+            best_distances = distances[np.arange(len(queries)), best_rows]
+        else:
+            # Rata-rata per identitas: jumlah jarak lewat matriks one-hot baris -> identitas
+            membership = np.zeros((self._size, len(self._names)), dtype=np.float32)
+            membership[np.flatnonzero(alive_rows), rows[alive_rows]] = 1.0
+            counts = membership.sum(axis=0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                identity_distances = (distances @ membership) / counts
+            identity_distances[:, counts == 0] = np.inf
+            best_identities = identity_distances.argmin(axis=1)
+            best_distances = identity_distances[np.arange(len(queries)), best_identities]
+        
+        return [self._names[i] for i in best_identities.tolist()], best_distances
+    
+    def to_lists(self) -> Tuple[List[np.ndarray], List[str]]:
+        """
+        Sampel aktif sebagai list paralel (format file face_encodings.pkl)
+        
+        Returns:
+            Tuple (list embedding, list nama per embedding)
+        """
+        encodings, names = [], []
+        for row in range(self._size):
+            identity = int(self._identities[row])
+            if self._alive[identity]:
+                encodings.append(self._embeddings[row].astype(np.float64))
+                names.append(self._names[identity])
+        return encodings, names
+    
+    @classmethod
+    def from_lists(cls, encodings: List[np.ndarray], names: List[str],
+                   aggregation: str = "min") -> "FaceGallery":
+        """
+        Membuat galeri dari list paralel embedding dan nama
+        
+        Nama yang muncul beberapa kali menjadi beberapa sampel satu identitas,
+        sehingga file lama (satu encoding per nama) tetap bisa dibaca.
+        
+        Args:
+            encodings: List embedding
+            names: List nama per embedding
+            aggregation: Agregasi jarak per identitas
+        
+        Returns:
+            Instance FaceGallery
+        """
+        gallery = cls(capacity=max(64, len(encodings)), aggregation=aggregation)
+        for name, encoding in zip(names, encodings):
+            gallery.add(name, encoding)
+        return gallery
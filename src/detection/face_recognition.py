@@ -11,22 +11,27 @@ import os
 from typing import List, Dict, Tuple, Optional
 from datetime import datetime
 
+from .face_gallery import FaceGallery
+
 
 class FaceRecognition:
     """Kelas untuk pengenalan wajah menggunakan face_recognition library"""
     
-    def __init__(self, faces_dir: str = "data/faces", tolerance: float = 0.6):
+    def __init__(self, faces_dir: str = "data/faces", tolerance: float = 0.6,
+                 aggregation: str = "min"):
         """
         Inisialisasi Face Recognition
         
         Args:
             faces_dir: Direktori untuk menyimpan encoding wajah
             tolerance: Toleransi untuk pengenalan wajah (0.0-1.0)
+            aggregation: Jarak ke orang dengan beberapa sampel wajah: "min"
+                (sampel terdekat) atau "mean" (rata-rata semua sampel)
         """
         self.faces_dir = faces_dir
         self.tolerance = tolerance
-        self.known_face_encodings: List[np.ndarray] = []
-        self.known_face_names: List[str] = []
+        self.aggregation = aggregation
+        self.gallery = FaceGallery(aggregation=aggregation)
         self.encoding_file = os.path.join(faces_dir, "face_encodings.pkl")
         
         self.logger = logging.getLogger(__name__)
@@ -43,9 +48,10 @@ class FaceRecognition:
             if os.path.exists(self.encoding_file):
                 with open(self.encoding_file, 'rb') as f:
                     data = pickle.load(f)
-                    self.known_face_encodings = data['encodings']
-                    self.known_face_names = data['names']
-                self.logger.info(f"Berhasil load {len(self.known_face_names)} encoding wajah")
+                self.gallery = FaceGallery.from_lists(data['encodings'], data['names'], aggregation=self.aggregation)
+                self.logger.info(
+                    f"Berhasil load {self.gallery.sample_count} encoding wajah ({len(self.gallery)} orang)"
+                )
             else:
                 self.logger.info("Belum ada encoding wajah yang tersimpan")
         except Exception as e:
@@ -54,22 +60,31 @@ class FaceRecognition:
     def save_encodings(self):
         """Save encoding wajah ke file"""
         try:
+            # Format tetap list paralel; nama berulang = beberapa sampel satu orang
+            encodings, names = self.gallery.to_lists()
             data = {
-                'encodings': self.known_face_encodings,
-                'names': self.known_face_names
+                'encodings': encodings,
+                'names': names
             }
             with open(self.encoding_file, 'wb') as f:
                 pickle.dump(data, f)
-            self.logger.info(f"Berhasil save {len(self.known_face_names)} encoding wajah")
+            self.logger.info(f"Berhasil save {len(encodings)} encoding wajah ({len(self.gallery)} orang)")
         except Exception as e:
             self.logger.error(f"Error save encoding wajah: {str(e)}")
     
-    def encode_face(self, face_image: np.ndarray) -> Optional[np.ndarray]:
+    def encode_face(self, face_image: np.ndarray,
+                    face_location: Optional[Tuple[int, int, int, int]] = None) -> Optional[np.ndarray]:
         """
         Encode wajah dari gambar
         
+        Lokasi wajah diberikan langsung ke model landmark dan embedding dlib
+        (known_face_locations), sehingga detektor HOG tidak dijalankan ulang pada
+        crop yang sudah dilokalisasi detektor wajah sebelumnya.
+        
         Args:
             face_image: Gambar wajah (BGR format)
+            face_location: Box wajah (x, y, w, h) di dalam face_image
+                (default: seluruh gambar adalah wajah)
             
         Returns:
             Array encoding wajah atau None jika gagal
@@ -78,49 +93,65 @@ class FaceRecognition:
             # Convert BGR ke RGB (face_recognition butuh RGB)
             rgb_face = cv2.cvtColor(face_image, cv2.COLOR_BGR2RGB)
             
+            # Box dlib (top, right, bottom, left), di-clamp ke batas gambar
+            height, width = rgb_face.shape[:2]
+            x, y, w, h = face_location if face_location is not None else (0, 0, width, height)
+            top, left = max(0, y), max(0, x)
+            bottom, right = min(height, y + h), min(width, x + w)
+            if bottom - top < 2 or right - left < 2:
+                self.logger.warning(f"Lokasi wajah tidak valid: {face_location}")
+                return None
+            
             # Encode wajah
-            face_encodings = face_recognition.face_encodings(rgb_face)
+            face_encodings = face_recognition.face_encodings(
+                rgb_face, known_face_locations=[(top, right, bottom, left)]
+            )
             
             if len(face_encodings) > 0:
                 return face_encodings[0]
             else:
-                self.logger.warning("Tidak ada wajah terdeteksi dalam gambar")
+                self.logger.warning("Gagal encode wajah dari gambar")
                 return None
                 
         except Exception as e:
             self.logger.error(f"Error encode wajah: {str(e)}")
             return None
     
-    def add_face(self, name: str, face_image: np.ndarray, save_image: bool = True) -> bool:
+    def add_face(self, name: str, face_image: np.ndarray, save_image: bool = True,
+                 replace: bool = False,
+                 face_location: Optional[Tuple[int, int, int, int]] = None) -> bool:
         """
-        Menambahkan wajah baru ke database
+        Menambahkan wajah ke database
+        
+        Nama yang sudah ada mendapat sampel tambahan (misalnya sudut wajah lain),
+        kecuali replace=True.
         
         Args:
             name: Nama orang
             face_image: Gambar wajah (BGR format)
             save_image: Simpan gambar wajah ke disk
+            replace: Hapus sampel lama nama ini sebelum menambah
+            face_location: Box wajah dari detektor (x, y, w, h) di dalam face_image,
+                agar encoding sama dengan saat recognition (default: seluruh gambar)
             
         Returns:
             True jika berhasil, False jika gagal
         """
         try:
             # Encode wajah
-            encoding = self.encode_face(face_image)
+            encoding = self.encode_face(face_image, face_location)
             
             if encoding is None:
                 self.logger.error(f"Gagal encode wajah untuk {name}")
                 return False
             
-            # Cek apakah nama sudah ada
-            if name in self.known_face_names:
-                # Update encoding untuk nama yang sudah ada
-                idx = self.known_face_names.index(name)
-                self.known_face_encodings[idx] = encoding
-                self.logger.info(f"Update encoding wajah untuk {name}")
+            if replace:
+                self.gallery.remove(name)
+            
+            samples = self.gallery.add(name, encoding)
+            if samples > 1:
+                self.logger.info(f"Tambah sampel wajah ke-{samples} untuk {name}")
             else:
-                # Tambah encoding baru
-                self.known_face_encodings.append(encoding)
-                self.known_face_names.append(name)
                 self.logger.info(f"Tambah wajah baru: {name}")
             
             # Save gambar wajah jika diinginkan
@@ -188,10 +219,7 @@ class FaceRecognition:
             True jika berhasil, False jika gagal
         """
         try:
-            if name in self.known_face_names:
-                idx = self.known_face_names.index(name)
-                self.known_face_names.pop(idx)
-                self.known_face_encodings.pop(idx)
+            if self.gallery.remove(name):
                 self.save_encodings()
                 self.logger.info(f"Wajah {name} berhasil dihapus")
                 return True
@@ -202,42 +230,34 @@ class FaceRecognition:
             self.logger.error(f"Error menghapus wajah: {str(e)}")
             return False
     
-    def recognize_face(self, face_image: np.ndarray) -> Tuple[Optional[str], float]:
+    def recognize_face(self, face_image: np.ndarray,
+                       face_location: Optional[Tuple[int, int, int, int]] = None) -> Tuple[Optional[str], float]:
         """
         Mengenali wajah dari gambar
         
         Args:
             face_image: Gambar wajah (BGR format)
+            face_location: Box wajah (x, y, w, h) di dalam face_image (default: seluruh gambar)
             
         Returns:
             Tuple (nama, distance) atau (None, 1.0) jika tidak dikenali
         """
         try:
-            if len(self.known_face_encodings) == 0:
+            if len(self.gallery) == 0:
                 return None, 1.0
             
             # Encode wajah input
-            encoding = self.encode_face(face_image)
+            encoding = self.encode_face(face_image, face_location)
             
             if encoding is None:
                 return None, 1.0
             
-            # Compare dengan database
-            face_distances = face_recognition.face_distance(
-                self.known_face_encodings, 
-                encoding
-            )
-            
-            if len(face_distances) == 0:
-                return None, 1.0
-            
-            # Cari match terbaik
-            best_match_index = np.argmin(face_distances)
-            distance = face_distances[best_match_index]
+            # Cari orang terdekat di galeri
+            names, distances = self.gallery.search(encoding[None, :])
+            name, distance = names[0], float(distances[0])
             
             # Cek apakah match valid berdasarkan tolerance
             if distance <= self.tolerance:
-                name = self.known_face_names[best_match_index]
                 return name, distance
             else:
                 return None, distance
@@ -246,20 +266,23 @@ class FaceRecognition:
             self.logger.error(f"Error mengenali wajah: {str(e)}")
             return None, 1.0
     
-    def recognize_faces(self, faces: List[np.ndarray]) -> List[Dict[str, any]]:
+    def recognize_faces(self, faces: List[np.ndarray],
+                        face_locations: Optional[List[Optional[Tuple[int, int, int, int]]]] = None) -> List[Dict[str, any]]:
         """
         Mengenali multiple wajah
         
         Args:
             faces: List gambar wajah
+            face_locations: Box wajah (x, y, w, h) per gambar (default: seluruh gambar)
             
         Returns:
             List dict dengan nama, distance, dan status
         """
         results = []
+        face_locations = face_locations or [None] * len(faces)
         
-        for i, face in enumerate(faces):
-            name, distance = self.recognize_face(face)
+        for i, (face, face_location) in enumerate(zip(faces, face_locations)):
+            name, distance = self.recognize_face(face, face_location)
             
             if name:
                 status = "known"
@@ -278,6 +301,67 @@ class FaceRecognition:
         
         return results
     
+    def recognize_faces_in_frame(self, frame: np.ndarray,
+                                 face_boxes: List[Tuple[int, int, int, int]]) -> List[Dict[str, any]]:
+        """
+        Mengenali semua wajah dalam satu frame sekaligus
+        
+        Hanya area yang memuat semua box dikonversi ke RGB (sekali), semua
+        embedding dihitung dalam satu panggilan face_encodings dengan
+        known_face_locations, lalu dibandingkan dengan database sebagai satu
+        operasi matriks.
+        
+        Args:
+            frame: Frame BGR
+            face_boxes: List box wajah (x, y, w, h) di koordinat frame
+            
+        Returns:
+            List dict dengan nama, distance, dan status (urutan sama dengan face_boxes)
+        """
+        results = [
+            {'index': i, 'name': None, 'display_name': "Unknown", 'distance': 1.0, 'status': "unknown"}
+            for i in range(len(face_boxes))
+        ]
+        if not face_boxes or len(self.gallery) == 0:
+            return results
+        
+        try:
+            height, width = frame.shape[:2]
+            boxes = np.array(face_boxes, dtype=int).reshape(-1, 4)
+            x1 = boxes[:, 0].clip(0, width)
+            y1 = boxes[:, 1].clip(0, height)
+            x2 = (boxes[:, 0] + boxes[:, 2]).clip(0, width)
+            y2 = (boxes[:, 1] + boxes[:, 3]).clip(0, height)
+            valid = np.flatnonzero((x2 - x1 >= 2) & (y2 - y1 >= 2))
+            if valid.size == 0:
+                return results
+            
+            # Konversi warna hanya untuk area gabungan semua wajah
+            left, top = int(x1[valid].min()), int(y1[valid].min())
+            right, bottom = int(x2[valid].max()), int(y2[valid].max())
+            rgb_region = cv2.cvtColor(frame[top:bottom, left:right], cv2.COLOR_BGR2RGB)
+            
+            locations = [
+                (int(y1[i] - top), int(x2[i] - left), int(y2[i] - top), int(x1[i] - left))
+                for i in valid
+            ]
+            encodings = np.array(face_recognition.face_encodings(rgb_region, known_face_locations=locations))
+            
+            # Semua wajah dibandingkan dengan galeri dalam satu operasi matriks
+            names, distances = self.gallery.search(encodings)
+            
+            for i, name, distance in zip(valid.tolist(), names, distances.tolist()):
+                results[i]['distance'] = distance
+                if distance <= self.tolerance:
+                    results[i].update({'name': name, 'display_name': name, 'status': "known"})
+            
+            self.logger.debug(f"Recognition batch: {valid.size} wajah dalam satu pass")
+            return results
+            
+        except Exception as e:
+            self.logger.error(f"Error mengenali wajah (batch): {str(e)}")
+            return results
+    
     def get_all_names(self) -> List[str]:
         """
         Mendapatkan semua nama yang tersimpan
@@ -285,16 +369,16 @@ class FaceRecognition:
         Returns:
             List nama-nama orang
         """
-        return self.known_face_names.copy()
+        return self.gallery.names()
     
     def get_face_count(self) -> int:
         """
-        Mendapatkan jumlah wajah yang tersimpan
+        Mendapatkan jumlah orang yang tersimpan
         
         Returns:
-            Jumlah wajah
+            Jumlah orang (bukan jumlah sampel wajah)
         """
-        return len(self.known_face_names)
+        return len(self.gallery)
     
     def get_face_images(self, name: str) -> List[str]:
         """
@@ -324,8 +408,7 @@ class FaceRecognition:
             True jika berhasil
         """
         try:
-            self.known_face_encodings.clear()
-            self.known_face_names.clear()
+            self.gallery.clear()
             self.save_encodings()
             self.logger.info("Database wajah dibersihkan")
             return True
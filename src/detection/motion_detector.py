@@ -5,88 +5,216 @@ Motion Detector - Mendeteksi gerakan dalam frame menggunakan OpenCV
 import cv2
 import numpy as np
 import logging
-from typing import Tuple, Optional
+from typing import Dict, List, Optional, Tuple
 
 
 class MotionDetector:
     """Kelas untuk mendeteksi gerakan menggunakan OpenCV"""
     
-    def __init__(self, min_contour_area: int = 500, sensitivity: int = 25):
+    BASE_BLUR_SIZE = 21  # Kernel blur pada resolusi asli, diskalakan di mode cepat
+    
+    MODEL_FRAME_DIFF = "frame_diff"            # Selisih dengan frame sebelumnya
+    MODEL_RUNNING_AVERAGE = "running_average"  # Selisih dengan rata-rata berjalan (cv2.accumulateWeighted)
+    MODEL_MOG2 = "mog2"                        # cv2.createBackgroundSubtractorMOG2
+    MODEL_KNN = "knn"                          # cv2.createBackgroundSubtractorKNN
+    BACKGROUND_MODELS = (MODEL_FRAME_DIFF, MODEL_RUNNING_AVERAGE, MODEL_MOG2, MODEL_KNN)
+    
+    DEFAULT_RUNNING_AVERAGE_RATE = 0.05
+    
+    def __init__(self, min_contour_area: int = 500, sensitivity: int = 25,
+                 analysis_width: int = 0, background_model: str = "frame_diff",
+                 learning_rate: float = -1, warmup_frames: int = 0,
+                 zones: Optional[List[dict]] = None, exclude_zones: Optional[List[dict]] = None,
+                 zone_min_percentage: float = 1.0):
         """
         Inisialisasi Motion Detector
         
         Args:
-            min_contour_area: Minimum area kontur untuk dianggap gerakan
+            min_contour_area: Minimum area kontur untuk dianggap gerakan (piksel resolusi asli)
             sensitivity: Sensitivitas deteksi (semakin rendah = semakin sensitif)
+            analysis_width: Lebar frame untuk analisis, misalnya 320 (0 = resolusi asli).
+                Area kontur minimum dan kernel blur diskalakan mengikuti lebar ini
+            background_model: Model background: "frame_diff" (frame sebelumnya),
+                "running_average", "mog2" atau "knn"
+            learning_rate: Kecepatan adaptasi background (0.0-1.0); -1 = default
+                model (0.05 untuk running_average, otomatis untuk MOG2/KNN)
+            warmup_frames: Jumlah frame awal untuk membangun background tanpa
+                melaporkan gerakan (tidak berlaku untuk frame_diff, minimal 1
+                untuk mog2/knn)
+            zones: Zona poligon [{'name', 'points', 'armed', 'min_percentage'}, ...].
+                Titik dalam koordinat relatif 0-1 atau piksel frame asli
+            exclude_zones: Poligon yang diabaikan sepenuhnya, misalnya jalan ramai atau TV
+                [{'points'}, ...]
+            zone_min_percentage: Persentase piksel berubah minimum default agar zona
+                dianggap ada gerakan
         """
+        if background_model not in self.BACKGROUND_MODELS:
+            raise ValueError(f"Background model tidak dikenal: {background_model}")
+        
         self.min_contour_area = min_contour_area
         self.sensitivity = sensitivity
+        self.analysis_width = analysis_width
+        self.background_model = background_model
+        self.learning_rate = learning_rate
+        if background_model == self.MODEL_FRAME_DIFF:
+            self.warmup_frames = 0
+        elif background_model in (self.MODEL_MOG2, self.MODEL_KNN):
+            # apply() pertama pada model kosong menandai seluruh frame sebagai
+            # foreground (alert palsu saat start dan setiap reconnect)
+            self.warmup_frames = max(1, warmup_frames)
+        else:
+            self.warmup_frames = warmup_frames
         self.previous_frame = None
+        self.motion_boxes = []  # Kotak gerakan terakhir (x, y, w, h) di koordinat frame asli
+        self.zones = zones or []
+        self.exclude_zones = exclude_zones or []
+        self.zone_min_percentage = zone_min_percentage
+        self.zone_stats: Dict[str, dict] = {}  # Statistik per zona dari frame terakhir
         self.logger = logging.getLogger(__name__)
         
-    def detect_motion(self, frame: np.ndarray) -> Tuple[bool, float, np.ndarray]:
+        # Buffer yang dipakai ulang antar panggilan, dialokasikan saat ukuran frame berubah
+        self._frame_shape = None
+        self._scale = 1.0
+        self._blur_size = self.BASE_BLUR_SIZE
+        self._scaled_min_area = float(min_contour_area)
+        self._small = None
+        self._gray = None
+        self._blurred = [None, None]  # Double buffer: frame sekarang dan sebelumnya
+        self._current = 0
+        self._delta = None
+        self._thresh = None
+        self._dilated = None
+        
+        # State background model adaptif
+        self._background = None      # Akumulator float32 (running_average)
+        self._background_u8 = None
+        self._subtractor = None      # MOG2 / KNN
+        self._frames_seen = 0
+        
+        # Mask zona hasil rasterisasi di resolusi analisis (cache per ukuran frame)
+        self._include_mask = None    # 255 = dianalisis, 0 = zona pengecualian
+        self._included_pixels = 0
+        self._zone_masks: List[dict] = []
+    
+    def _allocate_buffers(self, frame_shape: Tuple[int, ...]):
+        """
+        Alokasikan buffer analisis untuk ukuran frame tertentu
+        
+        Args:
+            frame_shape: Shape frame input (height, width, channels)
+        """
+        height, width = frame_shape[:2]
+        
+        if 0 < self.analysis_width < width:
+            self._scale = self.analysis_width / width
+            analysis_size = (self.analysis_width, max(1, int(round(height * self._scale))))
+            self._small = np.empty((analysis_size[1], analysis_size[0], 3), dtype=np.uint8)
+        else:
+            self._scale = 1.0
+            analysis_size = (width, height)
+            self._small = None
+        
+        # Kernel blur (ganjil) dan area kontur mengikuti skala analisis
+        self._blur_size = max(3, int(self.BASE_BLUR_SIZE * self._scale) | 1)
+        self._scaled_min_area = self.min_contour_area * self._scale * self._scale
+        
+        gray_shape = (analysis_size[1], analysis_size[0])
+        self._gray = np.empty(gray_shape, dtype=np.uint8)
+        self._blurred = [np.empty(gray_shape, dtype=np.uint8), np.empty(gray_shape, dtype=np.uint8)]
+        self._delta = np.empty(gray_shape, dtype=np.uint8)
+        self._thresh = np.empty(gray_shape, dtype=np.uint8)
+        self._dilated = np.empty(gray_shape, dtype=np.uint8)
+        
+        self._background = np.empty(gray_shape, dtype=np.float32)
+        self._background_u8 = np.empty(gray_shape, dtype=np.uint8)
+        
+        self._frame_shape = frame_shape
+        self._rasterize_zones(frame_shape, gray_shape)
+        self._reset_background()
+        self.logger.info(
+            f"Motion detector: analisis {analysis_size[0]}x{analysis_size[1]} "
+            f"(skala {self._scale:.2f}, blur {self._blur_size}, min area {self._scaled_min_area:.0f})"
+        )
+    
+    def detect_motion(self, frame: np.ndarray,
+                      return_mask: bool = False) -> Tuple[bool, float, Optional[np.ndarray]]:
         """
         Mendeteksi gerakan dalam frame
         
         Args:
             frame: Input frame (numpy array)
-            
+            return_mask: Buat mask visualisasi BGR seukuran frame (default: False)
+        
         Returns:
             Tuple (has_motion, motion_percentage, motion_mask)
             - has_motion: True jika ada gerakan
             - motion_percentage: Persentase frame yang berubah (0-100)
-            - motion_mask: Frame mask yang menunjukkan area gerakan
+            - motion_mask: Frame mask yang menunjukkan area gerakan, None jika
+              return_mask=False
         """
         try:
+            if frame.shape != self._frame_shape:
+                self._allocate_buffers(frame.shape)
+            
+            # Perkecil frame ke lebar analisis
+            source = frame
+            if self._small is not None:
+                cv2.resize(frame, (self._small.shape[1], self._small.shape[0]),
+                           dst=self._small, interpolation=cv2.INTER_AREA)
+                source = self._small
+            
             # Convert ke grayscale
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            cv2.cvtColor(source, cv2.COLOR_BGR2GRAY, dst=self._gray)
             
             # Blur untuk reduksi noise
-            gray = cv2.GaussianBlur(gray, (21, 21), 0)
+            gray = self._blurred[self._current]
+            cv2.GaussianBlur(self._gray, (self._blur_size, self._blur_size), 0, dst=gray)
             
-            # Jika belum ada frame sebelumnya, simpan sekarang
-            if self.previous_frame is None:
-                self.previous_frame = gray
-                return False, 0.0, np.zeros_like(frame)
+            # Mask foreground dari background model, None selama belum ada referensi / warm-up
+            foreground = self._foreground_mask(gray)
+            if foreground is None:
+                self.motion_boxes = []
+                self._clear_zone_stats()
+                return False, 0.0, np.zeros_like(frame) if return_mask else None
             
-            # Hitung perbedaan absolute antar frame
-            frame_delta = cv2.absdiff(self.previous_frame, gray)
+            # Dilasi untuk menghubungkan area yang berubah
+            thresh = cv2.dilate(foreground, None, dst=self._dilated, iterations=2)
             
-            # Threshold untuk binarization
-            thresh = cv2.threshold(frame_delta, self.sensitivity, 255, cv2.THRESH_BINARY)[1]
+            # Buang area pengecualian
+            if self._include_mask is not None:
+                cv2.bitwise_and(thresh, self._include_mask, dst=thresh)
             
-            # Dilasi untuk menghubungkan area yang berubah
-            thresh = cv2.dilate(thresh, None, iterations=2)
+            # Hitung persentase gerakan (terhadap area yang dianalisis)
+            motion_pixels = cv2.countNonZero(thresh)
+            total_pixels = self._included_pixels
+            motion_percentage = (motion_pixels / total_pixels) * 100 if total_pixels > 0 else 0.0
+            
+            self._update_zone_stats(thresh)
             
-            # Hitung kontur
+            # Hitung kontur (OpenCV >= 3.2 tidak mengubah input)
             contours, _ = cv2.findContours(
-                thresh.copy(), 
-                cv2.RETR_EXTERNAL, 
+                thresh,
+                cv2.RETR_EXTERNAL,
                 cv2.CHAIN_APPROX_SIMPLE
             )
             
-            # Filter kontur berdasarkan area
-            motion_contours = [c for c in contours if cv2.contourArea(c) > self.min_contour_area]
-            
-            # Update frame sebelumnya
-            self.previous_frame = gray
+            # Filter kontur berdasarkan area (diskalakan ke ukuran analisis)
+            motion_contours = [c for c in contours if cv2.contourArea(c) > self._scaled_min_area]
             
             # Cek apakah ada gerakan
             has_motion = len(motion_contours) > 0
             
-            # Hitung persentase gerakan
-            motion_pixels = cv2.countNonZero(thresh)
-            total_pixels = thresh.shape[0] * thresh.shape[1]
-            motion_percentage = (motion_pixels / total_pixels) * 100 if total_pixels > 0 else 0.0
-            
-            # Buat motion mask untuk visualisasi (convert ke BGR)
-            motion_mask = cv2.cvtColor(thresh, cv2.COLOR_GRAY2BGR)
+            # Kotak gerakan di koordinat frame asli
+            inverse = 1.0 / self._scale
+            self.motion_boxes = []
+            for contour in motion_contours:
+                (x, y, w, h) = cv2.boundingRect(contour)
+                self.motion_boxes.append((
+                    int(x * inverse), int(y * inverse),
+                    int(round(w * inverse)), int(round(h * inverse))
+                ))
             
-            # Gambar kotak di sekitar kontur gerakan
-            if has_motion:
-                for contour in motion_contours:
-                    (x, y, w, h) = cv2.boundingRect(contour)
-                    cv2.rectangle(motion_mask, (x, y), (x + w, y + h), (0, 0, 255), 2)
+            motion_mask = self._build_mask(frame.shape, thresh) if return_mask else None
             
             self.logger.debug(
                 f"Motion detection: has_motion={has_motion}, "
@@ -94,10 +222,280 @@ class MotionDetector:
             )
             
             return has_motion, motion_percentage, motion_mask
-            
+        
         except Exception as e:
             self.logger.error(f"Error deteksi gerakan: {str(e)}")
-            return False, 0.0, np.zeros_like(frame)
+            return False, 0.0, np.zeros_like(frame) if return_mask else None
+    
+    def _scale_points(self, points: List, frame_shape: Tuple[int, ...],
+                      gray_shape: Tuple[int, int]) -> np.ndarray:
+        """
+        Konversi titik poligon konfigurasi ke koordinat analisis
+        
+        Args:
+            points: [[x, y], ...] relatif (0-1) atau piksel frame asli
+            frame_shape: Shape frame asli
+            gray_shape: Shape buffer analisis (height, width)
+        
+        Returns:
+            Array int32 (N, 1, 2) untuk cv2.fillPoly
+        """
+        polygon = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if polygon.max() <= 1.0:
+            polygon = polygon * (gray_shape[1], gray_shape[0])
+        else:
+            polygon = polygon * (gray_shape[1] / frame_shape[1], gray_shape[0] / frame_shape[0])
+        return np.round(polygon).astype(np.int32).reshape(-1, 1, 2)
+    
+    def _rasterize_zones(self, frame_shape: Tuple[int, ...], gray_shape: Tuple[int, int]):
+        """
+        Rasterisasi zona dan pengecualian sekali per ukuran frame
+        
+        Setiap zona disimpan sebagai mask seukuran bounding rect-nya saja, sehingga
+        statistik per zona hanya memproses piksel di sekitar zona tersebut.
+        
+        Args:
+            frame_shape: Shape frame asli
+            gray_shape: Shape buffer analisis (height, width)
+        """
+        self._include_mask = None
+        self._included_pixels = gray_shape[0] * gray_shape[1]
+        self._zone_masks = []
+        
+        if self.exclude_zones:
+            self._include_mask = np.full(gray_shape, 255, dtype=np.uint8)
+            for zone in self.exclude_zones:
+                cv2.fillPoly(self._include_mask, [self._scale_points(zone['points'], frame_shape, gray_shape)], 0)
+            self._included_pixels = cv2.countNonZero(self._include_mask)
+        
+        for index, zone in enumerate(self.zones):
+            full_mask = np.zeros(gray_shape, dtype=np.uint8)
+            cv2.fillPoly(full_mask, [self._scale_points(zone['points'], frame_shape, gray_shape)], 255)
+            if self._include_mask is not None:
+                cv2.bitwise_and(full_mask, self._include_mask, dst=full_mask)
+            
+            area = cv2.countNonZero(full_mask)
+            name = zone.get('name', f"zone{index + 1}")
+            if area == 0:
+                self.logger.warning(f"Zona {name} kosong setelah rasterisasi, diabaikan")
+                continue
+            
+            x, y, w, h = cv2.boundingRect(full_mask)
+            self._zone_masks.append({
+                'name': name,
+                'armed': zone.get('armed', True),
+                'min_percentage': zone.get('min_percentage', self.zone_min_percentage),
+                'rect': (slice(y, y + h), slice(x, x + w)),
+                'mask': full_mask[y:y + h, x:x + w].copy(),
+                'buffer': np.empty((h, w), dtype=np.uint8),
+                'area': area
+            })
+        
+        if self.zones or self.exclude_zones:
+            self.logger.info(
+                f"Motion zones: {len(self._zone_masks)} zona, {len(self.exclude_zones)} pengecualian "
+                f"({self._included_pixels} piksel dianalisis)"
+            )
+        self._clear_zone_stats()
+    
+    def _update_zone_stats(self, thresh: np.ndarray):
+        """
+        Hitung persentase piksel berubah per zona dari mask threshold
+        
+        Args:
+            thresh: Mask threshold (ukuran analisis) setelah pengecualian
+        """
+        for zone in self._zone_masks:
+            cv2.bitwise_and(thresh[zone['rect']], zone['mask'], dst=zone['buffer'])
+            percentage = cv2.countNonZero(zone['buffer']) * 100.0 / zone['area']
+            stats = self.zone_stats[zone['name']]
+            stats['percentage'] = percentage
+            stats['motion'] = percentage >= zone['min_percentage']
+    
+    def _clear_zone_stats(self):
+        """Set statistik semua zona ke tanpa gerakan"""
+        self.zone_stats = {
+            zone['name']: {'percentage': 0.0, 'motion': False, 'armed': zone['armed']}
+            for zone in self._zone_masks
+        }
+    
+    def has_zones(self) -> bool:
+        """Cek apakah ada zona poligon yang dikonfigurasi"""
+        return len(self.zones) > 0
+    
+    def armed_motion(self, has_motion: bool) -> bool:
+        """
+        Cek apakah ada gerakan di zona aktif (armed) pada frame terakhir
+        
+        Args:
+            has_motion: Hasil has_motion dari detect_motion()
+        
+        Returns:
+            True jika ada zona armed dengan gerakan; tanpa zona sama dengan has_motion
+        """
+        if not self.has_zones():
+            return has_motion
+        return any(stats['armed'] and stats['motion'] for stats in self.zone_stats.values())
+    
+    def get_active_zones(self) -> List[str]:
+        """
+        Mendapatkan nama zona armed yang ada gerakan pada frame terakhir
+        
+        Returns:
+            List nama zona
+        """
+        return [name for name, stats in self.zone_stats.items() if stats['armed'] and stats['motion']]
+    
+    def get_motion_regions(self, padding: float = 0.2, min_size: int = 0,
+                           max_regions: int = 3, max_coverage: float = 0.6) -> List[Tuple[int, int, int, int]]:
+        """
+        Menggabungkan kotak gerakan frame terakhir menjadi region untuk inference ROI
+        
+        Kotak diberi padding, diperbesar minimal min_size, lalu kotak yang
+        bertumpukan digabung. Jika region terlalu banyak digabung menjadi satu.
+        
+        Args:
+            padding: Padding relatif terhadap sisi terpanjang kotak
+            min_size: Ukuran sisi minimum region (piksel frame asli), misalnya
+                ukuran input model agar crop tidak diperbesar
+            max_regions: Jumlah region maksimal sebelum digabung menjadi satu
+            max_coverage: Jika total area region melebihi fraksi frame ini,
+                kembalikan list kosong (lebih murah inference frame penuh)
+        
+        Returns:
+            List region (x, y, w, h) di koordinat frame asli; kosong berarti
+            gunakan frame penuh
+        """
+        if not self.motion_boxes or self._frame_shape is None:
+            return []
+        
+        height, width = self._frame_shape[:2]
+        boxes = []
+        for (x, y, w, h) in self.motion_boxes:
+            pad = int(max(w, h) * padding)
+            x1, y1, x2, y2 = x - pad, y - pad, x + w + pad, y + h + pad
+            
+            # Perbesar ke ukuran minimum di sekitar titik tengah
+            if x2 - x1 < min_size:
+                grow = (min_size - (x2 - x1)) // 2
+                x1, x2 = x1 - grow, x2 + grow
+            if y2 - y1 < min_size:
+                grow = (min_size - (y2 - y1)) // 2
+                y1, y2 = y1 - grow, y2 + grow
+            boxes.append([max(0, x1), max(0, y1), min(width, x2), min(height, y2)])
+        
+        # Gabungkan kotak yang bertumpukan sampai tidak ada lagi yang beririsan
+        merged = True
+        while merged:
+            merged = False
+            for i in range(len(boxes)):
+                for j in range(i + 1, len(boxes)):
+                    a, b = boxes[i], boxes[j]
+                    if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                        boxes[i] = [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+                        del boxes[j]
+                        merged = True
+                        break
+                if merged:
+                    break
+        
+        if len(boxes) > max_regions:
+            boxes = [[min(b[0] for b in boxes), min(b[1] for b in boxes),
+                      max(b[2] for b in boxes), max(b[3] for b in boxes)]]
+        
+        covered = sum((b[2] - b[0]) * (b[3] - b[1]) for b in boxes)
+        if covered >= max_coverage * width * height:
+            return []
+        
+        return [(b[0], b[1], b[2] - b[0], b[3] - b[1]) for b in boxes]
+    
+    def _foreground_mask(self, gray: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Menghitung mask biner area yang berbeda dari background dan memperbarui model
+        
+        Args:
+            gray: Frame grayscale yang sudah di-blur (ukuran analisis)
+        
+        Returns:
+            Mask threshold (buffer internal) atau None jika background belum siap
+        """
+        self._frames_seen += 1
+        
+        if self.background_model == self.MODEL_FRAME_DIFF:
+            previous = self.previous_frame
+            # Tukar double buffer: frame sekarang menjadi frame sebelumnya
+            self.previous_frame = gray
+            self._current ^= 1
+            if previous is None:
+                return None
+            
+            # Hitung perbedaan absolute antar frame
+            cv2.absdiff(previous, gray, dst=self._delta)
+            
+            # Threshold untuk binarization
+            cv2.threshold(self._delta, self.sensitivity, 255, cv2.THRESH_BINARY, dst=self._thresh)
+            return self._thresh
+        
+        if self.background_model == self.MODEL_RUNNING_AVERAGE:
+            rate = self.learning_rate if self.learning_rate >= 0 else self.DEFAULT_RUNNING_AVERAGE_RATE
+            if self._frames_seen == 1:
+                self._background[:] = gray
+                return None
+            
+            cv2.convertScaleAbs(self._background, dst=self._background_u8)
+            cv2.absdiff(self._background_u8, gray, dst=self._delta)
+            cv2.accumulateWeighted(gray, self._background, rate)
+            
+            if self._frames_seen <= self.warmup_frames:
+                return None
+            cv2.threshold(self._delta, self.sensitivity, 255, cv2.THRESH_BINARY, dst=self._thresh)
+            return self._thresh
+        
+        # MOG2 / KNN: 255 = foreground, 127 = bayangan (dibuang dengan threshold)
+        self._subtractor.apply(gray, fgmask=self._delta, learningRate=self.learning_rate)
+        if self._frames_seen <= self.warmup_frames:
+            return None
+        cv2.threshold(self._delta, 200, 255, cv2.THRESH_BINARY, dst=self._thresh)
+        return self._thresh
+    
+    def _reset_background(self):
+        """Buang background yang sudah dipelajari, warm-up dimulai lagi"""
+        self.previous_frame = None
+        self._frames_seen = 0
+        
+        # Sensitivitas dipakai sebagai threshold jarak model: varThreshold MOG2
+        # (jarak Mahalanobis kuadrat) dan dist2Threshold KNN (jarak kuadrat)
+        if self.background_model == self.MODEL_MOG2:
+            self._subtractor = cv2.createBackgroundSubtractorMOG2(
+                history=max(self.warmup_frames, 100), varThreshold=self.sensitivity, detectShadows=True
+            )
+        elif self.background_model == self.MODEL_KNN:
+            self._subtractor = cv2.createBackgroundSubtractorKNN(
+                history=max(self.warmup_frames, 100), dist2Threshold=float(self.sensitivity ** 2), detectShadows=True
+            )
+    
+    def _build_mask(self, frame_shape: Tuple[int, ...], thresh: np.ndarray) -> np.ndarray:
+        """
+        Membuat mask visualisasi BGR seukuran frame asli
+        
+        Args:
+            frame_shape: Shape frame asli
+            thresh: Mask threshold hasil analisis
+        
+        Returns:
+            Mask BGR dengan kotak merah di sekitar area gerakan
+        """
+        if thresh.shape[:2] != frame_shape[:2]:
+            thresh = cv2.resize(thresh, (frame_shape[1], frame_shape[0]), interpolation=cv2.INTER_NEAREST)
+        
+        # Convert ke BGR
+        motion_mask = cv2.cvtColor(thresh, cv2.COLOR_GRAY2BGR)
+        
+        # Gambar kotak di sekitar kontur gerakan
+        for (x, y, w, h) in self.motion_boxes:
+            cv2.rectangle(motion_mask, (x, y), (x + w, y + h), (0, 0, 255), 2)
+        
+        return motion_mask
     
     def draw_motion(self, frame: np.ndarray, 
                     motion_mask: np.ndarray,
@@ -109,7 +507,7 @@ class MotionDetector:
             frame: Frame asli
             motion_mask: Mask gerakan
             color: Warna area gerakan (B, G, R)
-            
+        
         Returns:
             Frame dengan overlay gerakan
         """
@@ -120,6 +518,7 @@ class MotionDetector:
         return result
     
     def reset(self):
-        """Reset frame sebelumnya (untuk handle perubahan scene)"""
-        self.previous_frame = None
+        """Reset frame sebelumnya dan background model (untuk handle perubahan scene)"""
+        self._reset_background()
+        self.motion_boxes = []
         self.logger.debug("Motion detector reset")
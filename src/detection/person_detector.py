@@ -4,18 +4,32 @@ Person Detector - Mendeteksi keberadaan orang dalam frame menggunakan YOLOv8n
 
 import cv2
 import logging
+import os
 import numpy as np
-import torch
 from typing import List, Tuple, Optional
-from ultralytics import YOLO
 
 
 class PersonDetector:
     """Kelas untuk mendeteksi orang menggunakan YOLOv8n"""
     
+    BACKEND_ULTRALYTICS = "ultralytics"  # ultralytics.YOLO + PyTorch
+    BACKEND_ONNX = "onnx"                # ONNX Runtime CPU, tanpa import torch
+    
+    NMS_IOU_THRESHOLD = 0.7  # Sama dengan default ultralytics
+    MODEL_STRIDE = 32        # Stride maksimum YOLOv8, ukuran input harus kelipatannya
+    MAX_DETECTIONS = 300
+    
+    # Hasil deteksi ringkas: satu record per orang dalam koordinat frame asli
+    DETECTION_DTYPE = np.dtype([
+        ('x', np.int32), ('y', np.int32), ('w', np.int32), ('h', np.int32),
+        ('confidence', np.float32)
+    ])
+    
     def __init__(self, confidence_threshold: float = 0.5, model_size: str = "yolov8n", 
                  max_cpu_cores: int = 3, inference_size: int = 320, 
-                 detect_all_objects: bool = True, specific_classes: list = None):
+                 detect_all_objects: bool = True, specific_classes: list = None,
+                 backend: str = "ultralytics", onnx_model_path: Optional[str] = None,
+                 quantized: bool = False, rectangular: bool = True):
         """
         Inisialisasi Person Detector dengan YOLOv8n
         
@@ -28,7 +42,27 @@ class PersonDetector:
             specific_classes: List class IDs untuk detect (jika detect_all_objects=False)
                 COCO classes:
                 0: person, 1: bicycle, 2: car, 3: motorcycle, 5: bus, 7: truck
+            backend: "ultralytics" (PyTorch) atau "onnx" (ONNX Runtime CPU)
+            onnx_model_path: Path model ONNX (default: <model_size>.onnx, diekspor
+                dari <model_size>.pt jika belum ada)
+            quantized: Pakai model INT8 <model_size>_int8.onnx hasil
+                scripts/quantize_detector.py (otomatis memakai backend "onnx")
+            rectangular: Inference persegi panjang sesuai aspect ratio frame
+                (misalnya 320x192 untuk 16:9) alih-alih kotak 320x320
         """
+        if backend not in (self.BACKEND_ULTRALYTICS, self.BACKEND_ONNX):
+            raise ValueError(f"Backend person detector tidak dikenal: {backend}")
+        
+        if quantized:
+            backend = self.BACKEND_ONNX
+        
+        self.backend = backend
+        self.quantized = quantized
+        self.onnx_model_path = onnx_model_path or f"{model_size}{'_int8' if quantized else ''}.onnx"
+        self.onnx_input_size = 0
+        self.onnx_dynamic = False
+        self.onnx_batch = False
+        self.rectangular = rectangular
         self.confidence_threshold = confidence_threshold
         self.model_size = model_size
         self.max_cpu_cores = max_cpu_cores
@@ -60,15 +94,93 @@ class PersonDetector:
         self.model = None
         self.logger = logging.getLogger(__name__)
         
-        # Optimasi CPU: Batasi jumlah threads
-        import torch
-        torch.set_num_threads(max_cpu_cores)
-        self.logger.info(f"Torch threads set to: {max_cpu_cores}")
+        if backend == self.BACKEND_ONNX:
+            self._load_onnx_model()
+        else:
+            # Optimasi CPU: Batasi jumlah threads
+            import torch
+            torch.set_num_threads(max_cpu_cores)
+            self.logger.info(f"Torch threads set to: {max_cpu_cores}")
+        
+            self._load_model()
+    
+    def _load_onnx_model(self):
+        """
+        Memuat model ONNX dengan ONNX Runtime (CPU)
+        
+        Jika file ONNX belum ada, model diekspor sekali dari <model_size>.pt
+        menggunakan ultralytics (hanya saat ekspor torch di-import).
+        """
+        try:
+            import onnxruntime as ort
+            
+            if self.quantized and not os.path.exists(self.onnx_model_path):
+                self.logger.warning(
+                    f"Model INT8 {self.onnx_model_path} tidak ditemukan (buat dengan "
+                    f"scripts/quantize_detector.py), memakai model FP32"
+                )
+                self.quantized = False
+                self.onnx_model_path = f"{self.model_size}.onnx"
+            
+            if not os.path.exists(self.onnx_model_path):
+                self._export_onnx()
+            
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            # Graph YOLO berupa rantai layer: paralelisme ada di dalam operator
+            # (intra-op = max_cpu_cores), eksekusi antar operator sekuensial
+            options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+            options.intra_op_num_threads = self.max_cpu_cores
+            options.inter_op_num_threads = 1
+            
+            self.model = ort.InferenceSession(
+                self.onnx_model_path, sess_options=options, providers=["CPUExecutionProvider"]
+            )
+            self._onnx_input_name = self.model.get_inputs()[0].name
+            
+            # Input statis [1, 3, S, S] hanya menerima kotak; input dinamis
+            # (diekspor dengan dynamic=True) bisa inference persegi panjang
+            input_shape = self.model.get_inputs()[0].shape
+            self.onnx_dynamic = not isinstance(input_shape[2], int)
+            self.onnx_batch = not isinstance(input_shape[0], int) or input_shape[0] != 1
+            self.onnx_input_size = (self.inference_size or 640) if self.onnx_dynamic else input_shape[2]
+            if self.rectangular and not self.onnx_dynamic:
+                self.logger.warning(
+                    f"Model ONNX {self.onnx_model_path} berukuran input statis, inference kotak "
+                    f"(hapus file agar diekspor ulang dengan input dinamis)"
+                )
+            
+            self.logger.info(
+                f"Model ONNX {self.onnx_model_path} dimuat ({'INT8' if self.quantized else 'FP32'}, "
+                f"input {self.onnx_input_size}{' dinamis' if self.onnx_dynamic else ''}, "
+                f"{self.max_cpu_cores} intra-op threads)"
+            )
+        
+        except Exception as e:
+            self.logger.error(f"Error memuat model ONNX: {str(e)}")
+            self.model = None
+    
+    def _export_onnx(self):
+        """
+        Ekspor model YOLO .pt ke ONNX dengan ukuran input inference_size
+        
+        Mode rectangular mengekspor input dinamis agar satu model bisa menerima
+        ukuran persegi panjang untuk aspect ratio kamera apa pun.
+        """
+        from ultralytics import YOLO
         
-        self._load_model()
+        imgsz = self.inference_size if self.inference_size > 0 else 640
+        self.logger.info(f"Model ONNX tidak ditemukan, mengekspor {self.model_size}.pt (imgsz={imgsz})...")
+        exported = YOLO(f"{self.model_size}.pt").export(format="onnx", imgsz=imgsz, dynamic=self.rectangular)
+        if os.path.abspath(exported) != os.path.abspath(self.onnx_model_path):
+            os.replace(exported, self.onnx_model_path)
+        self.logger.info(f"Model diekspor ke {self.onnx_model_path}")
     
     def _load_model(self):
         """Memuat model YOLOv8n untuk deteksi orang"""
+        import torch
+        from ultralytics import YOLO
+        
         try:
             # Set torch.load dengan weights_only=False untuk kompatibilitas
             import torch.serialization
@@ -110,94 +222,567 @@ class PersonDetector:
                 self.logger.error(f"Gagal memuat model YOLO: {str(e2)}")
     
     def detect_persons(self, frame: np.ndarray, 
-                       verbose: bool = False) -> List[Tuple[int, int, int, int, float]]:
+                       verbose: bool = False,
+                       confidence_threshold: Optional[float] = None,
+                       as_array: bool = False):
         """
         Mendeteksi orang dalam frame menggunakan YOLOv8n
         
         Args:
             frame: Frame dari kamera
             verbose: Tampilkan informasi deteksi
+            confidence_threshold: Override threshold untuk panggilan ini, misalnya
+                konfigurasi per kamera (default: self.confidence_threshold)
+            as_array: Kembalikan structured array DETECTION_DTYPE alih-alih list tuple
             
         Returns:
             List koordinat dan confidence orang [(x, y, w, h, confidence), ...]
+            atau structured array jika as_array
         """
         if self.model is None:
             self.logger.warning("Model YOLO tidak dimuat")
-            return []
+            return self._empty_result(as_array)
+        
+        if confidence_threshold is None:
+            confidence_threshold = self.confidence_threshold
         
         try:
-            self.logger.debug(f"Starting person detection with confidence threshold: {self.confidence_threshold}")
+            self.logger.debug(f"Starting person detection with confidence threshold: {confidence_threshold}")
             self.logger.debug(f"Frame shape: {frame.shape}")
             
-            # Optimasi CPU: Resize frame untuk inference lebih cepat
-            original_shape = frame.shape
-            if self.inference_size > 0:
-                # Resize frame untuk inference (lebih kecil = lebih cepat)
-                inference_frame = cv2.resize(frame, (self.inference_size, self.inference_size))
-                self.logger.debug(f"Resized frame from {original_shape} to {(self.inference_size, self.inference_size)} for inference")
+            if self.backend == self.BACKEND_ONNX:
+                detections, total_boxes = self._detect_onnx(frame, confidence_threshold, 0, 0, frame.shape)
+                self.logger.info(f"Detection summary (ONNX): {total_boxes} candidate boxes, {len(detections)} persons, confidence threshold: {confidence_threshold}")
             else:
-                inference_frame = frame
+                # Optimasi CPU: Letterbox ke inference_size (persegi panjang sesuai
+                # aspect ratio jika rectangular) agar orang tidak terdistorsi
+                original_shape = frame.shape
+                if self.inference_size > 0:
+                    detections, total_boxes = self._detect_ultralytics(
+                        frame, self.inference_size, confidence_threshold, verbose, 0, 0, original_shape
+                    )
+                else:
+                    # Ukuran asli: ultralytics mengembalikan box di koordinat frame
+                    results = self.model(frame, verbose=verbose, conf=confidence_threshold)
+                    self.logger.debug(f"YOLO inference completed, {len(results)} result(s)")
+                    detections, total_boxes = self._extract_persons(
+                        results, confidence_threshold, 1.0, 1.0, 0, 0, 0, 0, original_shape
+                    )
             
-            # Jalankan inference dengan YOLO pada frame yang diresize
-            results = self.model(inference_frame, verbose=verbose, conf=self.confidence_threshold)
+                # YOLO sudah memiliki NMS built-in, jadi tidak perlu tambahan
+                self.logger.info(f"Detection summary: {total_boxes} total boxes, {len(detections)} persons, confidence threshold: {confidence_threshold}")
             
-            self.logger.debug(f"YOLO inference completed, {len(results)} result(s)")
+            return detections if as_array else self.to_list(detections)
             
-            # Ekstrak deteksi orang
-            detections = []
+        except Exception as e:
+            self.logger.error(f"Error mendeteksi orang: {str(e)}", exc_info=True)
+            return self._empty_result(as_array)
+    
+    def _empty_result(self, as_array: bool):
+        """Hasil kosong sesuai format yang diminta"""
+        return np.empty(0, dtype=self.DETECTION_DTYPE) if as_array else []
+    
+    @staticmethod
+    def to_list(detections: np.ndarray) -> List[Tuple[int, int, int, int, float]]:
+        """
+        Adapter structured array deteksi -> list tuple
+        
+        Args:
+            detections: Structured array DETECTION_DTYPE
+        
+        Returns:
+            List [(x, y, w, h, confidence), ...] dengan tipe Python
+        """
+        return list(zip(
+            detections['x'].tolist(), detections['y'].tolist(),
+            detections['w'].tolist(), detections['h'].tolist(),
+            detections['confidence'].tolist()
+        ))
+    
+    def _to_detections(self, boxes: np.ndarray, scores: np.ndarray,
+                       scale_x: float, scale_y: float, pad_x: float, pad_y: float,
+                       offset_x: int, offset_y: int, frame_shape: Tuple[int, ...]) -> np.ndarray:
+        """
+        Memetakan box inference ke frame asli sekaligus untuk semua box
+        
+        Koordinat frame = (koordinat inference - pad) * scale + offset, lalu
+        di-clamp ke batas frame.
+        
+        Args:
+            boxes: Array (N, 4) x1, y1, x2, y2 di koordinat inference
+            scores: Array (N,) confidence
+            scale_x: Faktor skala horizontal inference -> gambar
+            scale_y: Faktor skala vertikal inference -> gambar
+            pad_x: Padding letterbox horizontal (piksel inference)
+            pad_y: Padding letterbox vertikal (piksel inference)
+            offset_x: Posisi x gambar di frame asli
+            offset_y: Posisi y gambar di frame asli
+            frame_shape: Shape frame asli untuk clamp
+        
+        Returns:
+            Structured array DETECTION_DTYPE
+        """
+        boxes = (boxes - (pad_x, pad_y, pad_x, pad_y)) * (scale_x, scale_y, scale_x, scale_y) \
+            + (offset_x, offset_y, offset_x, offset_y)
+        np.clip(boxes[:, 0::2], 0, frame_shape[1], out=boxes[:, 0::2])
+        np.clip(boxes[:, 1::2], 0, frame_shape[0], out=boxes[:, 1::2])
+        boxes = boxes.astype(np.int32)
+        
+        detections = np.empty(len(boxes), dtype=self.DETECTION_DTYPE)
+        detections['x'] = boxes[:, 0]
+        detections['y'] = boxes[:, 1]
+        detections['w'] = boxes[:, 2] - boxes[:, 0]
+        detections['h'] = boxes[:, 3] - boxes[:, 1]
+        detections['confidence'] = scores
+        return detections
+    
+    def _extract_persons(self, results, confidence_threshold: float,
+                         scale_x: float, scale_y: float,
+                         pad_x: float, pad_y: float, offset_x: int, offset_y: int,
+                         frame_shape: Tuple[int, ...]) -> Tuple[np.ndarray, int]:
+        """
+        Mengambil box class 'person' dari hasil YOLO dan memetakannya ke frame asli
+        
+        Semua box diproses sebagai array: satu transfer tensor -> numpy per
+        hasil, lalu filter class/confidence dan rescale tanpa loop per box.
+        
+        Args:
+            results: Hasil inference YOLO
+            confidence_threshold: Threshold confidence
+            scale_x: Faktor skala horizontal inference -> region
+            scale_y: Faktor skala vertikal inference -> region
+            pad_x: Padding letterbox horizontal (piksel inference)
+            pad_y: Padding letterbox vertikal (piksel inference)
+            offset_x: Posisi x region di frame asli
+            offset_y: Posisi y region di frame asli
+            frame_shape: Shape frame asli untuk clamp
+        
+        Returns:
+            Tuple (structured array DETECTION_DTYPE, total_boxes)
+        """
+        person_boxes = []
+        total_boxes = 0
+        
+        for result in results:
+            boxes = result.boxes
+            if boxes is None or len(boxes) == 0:
+                continue
+            total_boxes += len(boxes)
+            
+            # Kolom data: x1, y1, x2, y2, [track_id,] confidence, class
+            data = boxes.data.cpu().numpy()
+            keep = (data[:, -1] == self.person_class_id) & (data[:, -2] >= confidence_threshold)
+            person_boxes.append(data[keep])
+        
+        if not person_boxes:
+            return np.empty(0, dtype=self.DETECTION_DTYPE), total_boxes
+        
+        persons = np.concatenate(person_boxes)
+        self.logger.debug(f"Total boxes detected: {total_boxes}, persons: {len(persons)}")
+        detections = self._to_detections(
+            persons[:, :4], persons[:, -2], scale_x, scale_y, pad_x, pad_y, offset_x, offset_y, frame_shape
+        )
+        return detections, total_boxes
+    
+    def _detect_ultralytics(self, image: np.ndarray, size: int, confidence_threshold: float,
+                            verbose: bool, offset_x: int, offset_y: int,
+                            frame_shape: Tuple[int, ...]) -> Tuple[np.ndarray, int]:
+        """
+        Inference ultralytics pada gambar yang sudah di-letterbox
+        
+        imgsz diset sama dengan ukuran letterbox agar ultralytics tidak
+        me-resize ulang (default-nya 640).
+        
+        Args:
+            image: Gambar BGR (frame penuh atau crop region)
+            size: Sisi terpanjang input inference
+            confidence_threshold: Threshold confidence
+            verbose: Tampilkan informasi deteksi
+            offset_x: Posisi x gambar di frame asli
+            offset_y: Posisi y gambar di frame asli
+            frame_shape: Shape frame asli untuk clamp
+        
+        Returns:
+            Tuple (detections, total_boxes)
+        """
+        inference_frame, scale, pad_x, pad_y = self.letterbox(image, size, rectangular=self.rectangular)
+        self.logger.debug(f"Letterbox {image.shape[:2]} -> {inference_frame.shape[:2]} for inference")
+        
+        results = self.model(
+            inference_frame, imgsz=list(inference_frame.shape[:2]),
+            verbose=verbose, conf=confidence_threshold
+        )
+        self.logger.debug(f"YOLO inference completed, {len(results)} result(s)")
+        
+        return self._extract_persons(
+            results, confidence_threshold, 1 / scale, 1 / scale, pad_x, pad_y, offset_x, offset_y, frame_shape
+        )
+    
+    def preprocess(self, image: np.ndarray, size: int) -> Tuple[np.ndarray, float, int, int]:
+        """
+        Letterbox dan konversi gambar ke tensor input model ONNX
+        
+        Dipakai juga oleh tool kuantisasi agar data kalibrasi identik dengan runtime.
+        
+        Args:
+            image: Gambar BGR
+            size: Ukuran input model
+        
+        Returns:
+            Tuple (blob NCHW float32 RGB 0-1, scale, pad_x, pad_y)
+        """
+        inference_frame, scale, pad_x, pad_y = self.letterbox(
+            image, size, rectangular=self.rectangular and self.onnx_dynamic
+        )
+        
+        # BGR HWC uint8 -> RGB NCHW float32 0-1
+        blob = inference_frame[:, :, ::-1].transpose(2, 0, 1)[np.newaxis].astype(np.float32)
+        blob *= 1.0 / 255.0
+        return blob, scale, pad_x, pad_y
+    
+    def _detect_onnx(self, image: np.ndarray, confidence_threshold: float,
+                     offset_x: int, offset_y: int,
+                     frame_shape: Tuple[int, ...]) -> Tuple[np.ndarray, int]:
+        """
+        Inference ONNX Runtime dengan pre/post-processing numpy
+        
+        Args:
+            image: Gambar BGR (frame penuh atau crop region)
+            confidence_threshold: Threshold confidence
+            offset_x: Posisi x gambar di frame asli
+            offset_y: Posisi y gambar di frame asli
+            frame_shape: Shape frame asli untuk clamp
+        
+        Returns:
+            Tuple (structured array DETECTION_DTYPE, jumlah kandidat person sebelum NMS)
+        """
+        blob, scale, pad_x, pad_y = self.preprocess(image, self.onnx_input_size)
+        
+        # Output YOLOv8: [1, 4 + jumlah_class, jumlah_anchor] (cx, cy, w, h, skor class...)
+        output = self.model.run(None, {self._onnx_input_name: blob})[0][0]
+        
+        return self._postprocess_onnx(
+            output, confidence_threshold, scale, pad_x, pad_y, offset_x, offset_y, frame_shape
+        )
+    
+    def _postprocess_onnx(self, output: np.ndarray, confidence_threshold: float,
+                          scale: float, pad_x: int, pad_y: int, offset_x: int, offset_y: int,
+                          frame_shape: Tuple[int, ...]) -> Tuple[np.ndarray, int]:
+        """
+        Filter class/confidence, NMS dan pemetaan box untuk output ONNX satu gambar
+        
+        Args:
+            output: Output model satu gambar [4 + jumlah_class, jumlah_anchor]
+            confidence_threshold: Threshold confidence
+            scale: Skala letterbox
+            pad_x: Padding letterbox horizontal
+            pad_y: Padding letterbox vertikal
+            offset_x: Posisi x gambar di frame asli
+            offset_y: Posisi y gambar di frame asli
+            frame_shape: Shape frame asli untuk clamp
+        
+        Returns:
+            Tuple (structured array DETECTION_DTYPE, jumlah kandidat person sebelum NMS)
+        """
+        # Setiap anchor diberi class dengan skor tertinggi (seperti ultralytics),
+        # lalu hanya anchor 'person' yang dipertahankan
+        class_scores = output[4:]
+        best_class = class_scores.argmax(axis=0)
+        scores = class_scores[self.person_class_id]
+        candidates = (best_class == self.person_class_id) & (scores >= confidence_threshold)
+        if not candidates.any():
+            return np.empty(0, dtype=self.DETECTION_DTYPE), 0
+        
+        cx, cy, w, h = output[:4, candidates]
+        scores = scores[candidates]
+        boxes = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+        keep = self._nms(boxes, scores, self.NMS_IOU_THRESHOLD)[:self.MAX_DETECTIONS]
+        
+        # Letterbox -> koordinat frame asli, clamp ke batas frame
+        detections = self._to_detections(
+            boxes[keep], scores[keep], 1 / scale, 1 / scale, pad_x, pad_y, offset_x, offset_y, frame_shape
+        )
+        
+        return detections, int(candidates.sum())
+    
+    @staticmethod
+    def _nms(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> np.ndarray:
+        """
+        Non-maximum suppression numpy
+        
+        Args:
+            boxes: Array (N, 4) x1, y1, x2, y2
+            scores: Array (N,) confidence
+            iou_threshold: Box dengan IoU di atas nilai ini terhadap box yang lebih
+                yakin dibuang
+        
+        Returns:
+            Index box yang dipertahankan, urut dari confidence tertinggi
+        """
+        x1, y1, x2, y2 = boxes.T
+        areas = (x2 - x1) * (y2 - y1)
+        order = scores.argsort()[::-1]
+        keep = []
+        
+        while order.size > 0:
+            best = order[0]
+            keep.append(best)
+            rest = order[1:]
+            
+            inter_w = np.clip(np.minimum(x2[best], x2[rest]) - np.maximum(x1[best], x1[rest]), 0, None)
+            inter_h = np.clip(np.minimum(y2[best], y2[rest]) - np.maximum(y1[best], y1[rest]), 0, None)
+            inter = inter_w * inter_h
+            iou = inter / (areas[best] + areas[rest] - inter + 1e-9)
+            order = rest[iou <= iou_threshold]
+        
+        return np.array(keep, dtype=np.int64)
+    
+    def letterbox(self, image: np.ndarray, size: int,
+                  rectangular: bool = False) -> Tuple[np.ndarray, float, int, int]:
+        """
+        Resize gambar dengan aspect ratio tetap, sisa diisi abu-abu
+        
+        Args:
+            image: Gambar BGR
+            size: Ukuran sisi terpanjang output
+            rectangular: Output persegi panjang dengan padding minimal (sisi pendek
+                dibulatkan ke kelipatan stride model, misalnya 320x192 untuk 16:9);
+                False = kotak size x size
+        
+        Returns:
+            Tuple (gambar letterbox, scale, pad_x, pad_y); koordinat asli =
+            (koordinat letterbox - pad) / scale
+        """
+        height, width = image.shape[:2]
+        scale = size / max(height, width)
+        new_width = max(1, int(round(width * scale)))
+        new_height = max(1, int(round(height * scale)))
+        
+        if rectangular:
+            stride = self.MODEL_STRIDE
+            out_width = -(-new_width // stride) * stride
+            out_height = -(-new_height // stride) * stride
+        else:
+            out_width = out_height = size
+        
+        pad_x = (out_width - new_width) // 2
+        pad_y = (out_height - new_height) // 2
+        canvas = np.full((out_height, out_width, 3), 114, dtype=np.uint8)
+        canvas[pad_y:pad_y + new_height, pad_x:pad_x + new_width] = cv2.resize(
+            image, (new_width, new_height), interpolation=cv2.INTER_LINEAR
+        )
+        return canvas, scale, pad_x, pad_y
+    
+    def detect_persons_in_regions(self, frame: np.ndarray,
+                                  regions: List[Tuple[int, int, int, int]],
+                                  verbose: bool = False,
+                                  confidence_threshold: Optional[float] = None,
+                                  as_array: bool = False):
+        """
+        Mendeteksi orang hanya di region tertentu (misalnya area gerakan)
+        
+        Setiap region di-crop, di-letterbox ke inference_size dan hasilnya
+        dipetakan kembali ke koordinat frame. Region diharapkan tidak saling
+        beririsan (lihat MotionDetector.get_motion_regions).
+        
+        Args:
+            frame: Frame dari kamera
+            regions: List region (x, y, w, h); kosong = frame penuh
+            verbose: Tampilkan informasi deteksi
+            confidence_threshold: Override threshold untuk panggilan ini
+            as_array: Kembalikan structured array DETECTION_DTYPE alih-alih list tuple
+        
+        Returns:
+            List koordinat dan confidence orang [(x, y, w, h, confidence), ...]
+            atau structured array jika as_array
+        """
+        if not regions:
+            return self.detect_persons(
+                frame, verbose=verbose, confidence_threshold=confidence_threshold, as_array=as_array
+            )
+        
+        if self.model is None:
+            self.logger.warning("Model YOLO tidak dimuat")
+            return self._empty_result(as_array)
+        
+        if confidence_threshold is None:
+            confidence_threshold = self.confidence_threshold
+        
+        try:
+            size = self.inference_size if self.inference_size > 0 else 640
+            region_results = []
             total_boxes = 0
-            person_boxes = 0
             
-            # Hitung scale factor jika frame di-resize
-            if self.inference_size > 0 and inference_frame is not frame:
-                scale_x = original_shape[1] / self.inference_size
-                scale_y = original_shape[0] / self.inference_size
-                self.logger.debug(f"Scale factors: x={scale_x:.2f}, y={scale_y:.2f}")
+            for (x, y, w, h) in regions:
+                crop = frame[y:y + h, x:x + w]
+                if crop.size == 0:
+                    continue
+                
+                if self.backend == self.BACKEND_ONNX:
+                    region_detections, region_boxes = self._detect_onnx(
+                        crop, confidence_threshold, x, y, frame.shape
+                    )
+                else:
+                    region_detections, region_boxes = self._detect_ultralytics(
+                        crop, size, confidence_threshold, verbose, x, y, frame.shape
+                    )
+                region_results.append(region_detections)
+                total_boxes += region_boxes
+            
+            detections = np.concatenate(region_results) if region_results else self._empty_result(True)
+            
+            self.logger.info(
+                f"ROI detection summary: {len(regions)} region, {total_boxes} total boxes, "
+                f"{len(detections)} persons, confidence threshold: {confidence_threshold}"
+            )
+            return detections if as_array else self.to_list(detections)
+        
+        except Exception as e:
+            self.logger.error(f"Error mendeteksi orang di region: {str(e)}", exc_info=True)
+            return self._empty_result(as_array)
+    
+    def detect_persons_batch(self, frames: List[np.ndarray],
+                             regions: Optional[List[Optional[List[Tuple[int, int, int, int]]]]] = None,
+                             confidence_thresholds: Optional[List[Optional[float]]] = None,
+                             verbose: bool = False, as_array: bool = False) -> list:
+        """
+        Mendeteksi orang di beberapa frame (misalnya dari kamera berbeda) sekaligus
+        
+        Setiap frame, atau setiap region-nya, di-letterbox ke ukuran inference;
+        gambar dengan ukuran letterbox sama dijalankan dalam satu forward pass
+        batch dan hasilnya dikembalikan ke frame asalnya.
+        
+        Args:
+            frames: List frame
+            regions: List region per frame (None/kosong = frame penuh)
+            confidence_thresholds: Threshold per frame (None = self.confidence_threshold)
+            verbose: Tampilkan informasi deteksi
+            as_array: Kembalikan structured array DETECTION_DTYPE alih-alih list tuple
+        
+        Returns:
+            List hasil deteksi per frame, urutan sama dengan frames
+        """
+        if self.model is None:
+            self.logger.warning("Model YOLO tidak dimuat")
+            return [self._empty_result(as_array) for _ in frames]
+        
+        regions = regions or [None] * len(frames)
+        thresholds = [
+            self.confidence_threshold if threshold is None else threshold
+            for threshold in (confidence_thresholds or [None] * len(frames))
+        ]
+        
+        try:
+            # Gambar inference: (index frame, gambar, offset_x, offset_y)
+            items = []
+            for index, (frame, frame_regions) in enumerate(zip(frames, regions)):
+                if not frame_regions:
+                    items.append((index, frame, 0, 0))
+                    continue
+                for (x, y, w, h) in frame_regions:
+                    crop = frame[y:y + h, x:x + w]
+                    if crop.size > 0:
+                        items.append((index, crop, x, y))
+            
+            if self.backend == self.BACKEND_ONNX:
+                item_results = self._batch_onnx(items, frames, thresholds)
             else:
-                scale_x = 1.0
-                scale_y = 1.0
-            
-            for result in results:
-                boxes = result.boxes
-                if boxes is not None:
-                    total_boxes = len(boxes)
-                    self.logger.debug(f"Total boxes detected: {total_boxes}")
-                    
-                    for i, box in enumerate(boxes):
-                        class_id = int(box.cls)
-                        confidence = float(box.conf[0])
-                        self.logger.debug(f"Box {i}: class_id={class_id}, confidence={confidence:.3f}")
-                        
-                        # Filter hanya class 'person' (class_id = 0)
-                        if class_id == self.person_class_id:
-                            # Dapatkan koordinat bounding box dari inference frame
-                            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                            
-                            # Scale bounding box ke frame asli
-                            x = int(x1 * scale_x)
-                            y = int(y1 * scale_y)
-                            w = int((x2 - x1) * scale_x)
-                            h = int((y2 - y1) * scale_y)
-                            
-                            # Clamp ke frame boundary
-                            x = max(0, min(x, original_shape[1]))
-                            y = max(0, min(y, original_shape[0]))
-                            w = max(0, min(w, original_shape[1] - x))
-                            h = max(0, min(h, original_shape[0] - y))
-                            
-                            detections.append((x, y, w, h, confidence))
-                            person_boxes += 1
-                            self.logger.info(f"Person detected at ({x},{y}) size: {w}x{h}, confidence: {confidence:.3f}")
-            
-            self.logger.info(f"Detection summary: {total_boxes} total boxes, {person_boxes} persons, confidence threshold: {self.confidence_threshold}")
-            
-            # YOLO sudah memiliki NMS built-in, jadi tidak perlu tambahan
-            return detections
+                item_results = self._batch_ultralytics(items, frames, thresholds, verbose)
             
+            per_frame = [[] for _ in frames]
+            total_boxes = 0
+            for index, detections, boxes in item_results:
+                per_frame[index].append(detections)
+                total_boxes += boxes
+            
+            merged = [np.concatenate(parts) if parts else self._empty_result(True) for parts in per_frame]
+            self.logger.info(
+                f"Batch detection summary: {len(frames)} frame, {len(items)} gambar, {total_boxes} total boxes, "
+                f"{sum(len(d) for d in merged)} persons"
+            )
+            return merged if as_array else [self.to_list(d) for d in merged]
+        
         except Exception as e:
-            self.logger.error(f"Error mendeteksi orang: {str(e)}", exc_info=True)
-            return []
+            self.logger.error(f"Error mendeteksi orang (batch): {str(e)}", exc_info=True)
+            return [self._empty_result(as_array) for _ in frames]
     
+    def _batch_ultralytics(self, items: list, frames: List[np.ndarray],
+                           thresholds: List[float], verbose: bool) -> List[Tuple[int, np.ndarray, int]]:
+        """
+        Inference batch ultralytics, satu panggilan model per ukuran letterbox
+        
+        Args:
+            items: List (index frame, gambar, offset_x, offset_y)
+            frames: List frame asli
+            thresholds: Threshold confidence per frame
+            verbose: Tampilkan informasi deteksi
+        
+        Returns:
+            List (index frame, detections, total_boxes) per gambar
+        """
+        size = self.inference_size if self.inference_size > 0 else 640
+        prepared = [self.letterbox(image, size, rectangular=self.rectangular) for _, image, _, _ in items]
+        
+        groups = {}
+        for item_index, (canvas, _, _, _) in enumerate(prepared):
+            groups.setdefault(canvas.shape[:2], []).append(item_index)
+        
+        item_results = []
+        for shape, members in groups.items():
+            # Threshold terendah di batch, lalu disaring lagi per frame
+            batch_conf = min(thresholds[items[i][0]] for i in members)
+            results = self.model(
+                [prepared[i][0] for i in members], imgsz=list(shape), verbose=verbose, conf=batch_conf
+            )
+            self.logger.debug(f"YOLO batch inference {shape}: {len(members)} gambar")
+            
+            for item_index, result in zip(members, results):
+                index, _, offset_x, offset_y = items[item_index]
+                _, scale, pad_x, pad_y = prepared[item_index]
+                detections, boxes = self._extract_persons(
+                    [result], thresholds[index], 1 / scale, 1 / scale, pad_x, pad_y,
+                    offset_x, offset_y, frames[index].shape
+                )
+                item_results.append((index, detections, boxes))
+        
+        return item_results
+    
+    def _batch_onnx(self, items: list, frames: List[np.ndarray],
+                    thresholds: List[float]) -> List[Tuple[int, np.ndarray, int]]:
+        """
+        Inference batch ONNX Runtime
+        
+        Model dengan dimensi batch statis 1 dijalankan per gambar.
+        
+        Args:
+            items: List (index frame, gambar, offset_x, offset_y)
+            frames: List frame asli
+            thresholds: Threshold confidence per frame
+        
+        Returns:
+            List (index frame, detections, kandidat) per gambar
+        """
+        prepared = [self.preprocess(image, self.onnx_input_size) for _, image, _, _ in items]
+        
+        groups = {}
+        for item_index, (blob, _, _, _) in enumerate(prepared):
+            key = blob.shape if self.onnx_batch else item_index
+            groups.setdefault(key, []).append(item_index)
+        
+        item_results = []
+        for members in groups.values():
+            blob = np.concatenate([prepared[i][0] for i in members])
+            outputs = self.model.run(None, {self._onnx_input_name: blob})[0]
+            
+            for item_index, output in zip(members, outputs):
+                index, _, offset_x, offset_y = items[item_index]
+                _, scale, pad_x, pad_y = prepared[item_index]
+                detections, candidates = self._postprocess_onnx(
+                    output, thresholds[index], scale, pad_x, pad_y, offset_x, offset_y, frames[index].shape
+                )
+                item_results.append((index, detections, candidates))
+        
+        return item_results
     
     def draw_persons(self, frame: np.ndarray,
                      persons: List[Tuple[int, int, int, int, float]],
@@ -0,0 +1,283 @@
+"""
+Person Tracker - Melacak orang antar siklus deteksi (IoU + Kalman, gaya SORT)
+"""
+
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class Track:
+    """
+    Satu orang yang dilacak dengan Kalman filter kecepatan konstan
+    
+    State: [cx, cy, s, r, vx, vy, vs] (pusat, luas, aspect ratio dan kecepatannya
+    per detik); pengukuran: [cx, cy, s, r].
+    """
+    
+    # Noise seperti SORT, kecepatan dalam satuan per detik
+    MEASUREMENT_NOISE = np.diag([1.0, 1.0, 10.0, 10.0])
+    PROCESS_NOISE = np.diag([1.0, 1.0, 1.0, 0.01, 0.01, 0.01, 0.0001])
+    MEASUREMENT_MATRIX = np.eye(4, 7)
+    
+    def __init__(self, track_id: int, bbox: Tuple[int, int, int, int], confidence: float, timestamp: float):
+        """
+        Inisialisasi Track dari deteksi pertama
+        
+        Args:
+            track_id: ID track (unik per kamera)
+            bbox: Bounding box (x, y, w, h)
+            confidence: Confidence deteksi
+            timestamp: Waktu frame deteksi
+        """
+        self.track_id = track_id
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+        self.confidence = confidence
+        self.hits = 1
+        self.unseen = 0.0  # Detik deteksi yang mencakup track ini tanpa menemukannya
+        
+        # Diisi pipeline: alert sudah dikirim, hasil face recognition (cache)
+        # dan jumlah siklus face recognition yang sudah dicoba
+        self.alerted = False
+        self.recognition: Optional[dict] = None
+        self.recognition_attempts = 0
+        
+        self._state = np.zeros(7)
+        self._state[:4] = self._to_measurement(bbox)
+        self._covariance = np.eye(7) * 10.0
+        self._covariance[4:, 4:] *= 1000.0  # Kecepatan awal belum diketahui
+        self._time = timestamp
+    
+    @staticmethod
+    def _to_measurement(bbox: Tuple[int, int, int, int]) -> np.ndarray:
+        """(x, y, w, h) -> [cx, cy, s, r]"""
+        x, y, w, h = bbox
+        return np.array([x + w / 2, y + h / 2, w * h, w / max(h, 1)], dtype=float)
+    
+    def predict(self, timestamp: float, max_dt: Optional[float] = None) -> np.ndarray:
+        """
+        Proyeksikan state ke waktu timestamp
+        
+        Args:
+            timestamp: Waktu frame berikutnya
+            max_dt: Batas detik ekstrapolasi kecepatan (jeda deteksi panjang
+                tidak membuat box orang diam bergeser jauh)
+        
+        Returns:
+            Box prediksi [x1, y1, x2, y2]
+        """
+        dt = max(0.0, timestamp - self._time)
+        if max_dt is not None:
+            dt = min(dt, max_dt)
+        if dt > 0:
+            transition = np.eye(7)
+            transition[0, 4] = transition[1, 5] = transition[2, 6] = dt
+            # Luas tidak boleh menjadi negatif
+            if self._state[2] + self._state[6] * dt <= 0:
+                self._state[6] = 0.0
+            self._state = transition @ self._state
+            self._covariance = transition @ self._covariance @ transition.T + self.PROCESS_NOISE * dt
+        self._time = max(self._time, timestamp)
+        return self.xyxy
+    
+    def update(self, bbox: Tuple[int, int, int, int], confidence: float, timestamp: float):
+        """
+        Koreksi state dengan deteksi yang cocok
+        
+        Args:
+            bbox: Bounding box (x, y, w, h)
+            confidence: Confidence deteksi
+            timestamp: Waktu frame deteksi
+        """
+        projection = self.MEASUREMENT_MATRIX
+        residual = self._to_measurement(bbox) - projection @ self._state
+        innovation = projection @ self._covariance @ projection.T + self.MEASUREMENT_NOISE
+        gain = self._covariance @ projection.T @ np.linalg.inv(innovation)
+        self._state = self._state + gain @ residual
+        self._covariance = (np.eye(7) - gain @ projection) @ self._covariance
+        
+        self.last_seen = timestamp
+        self.confidence = confidence
+        self.hits += 1
+        self.unseen = 0.0
+    
+    @property
+    def xyxy(self) -> np.ndarray:
+        """Box state saat ini [x1, y1, x2, y2]"""
+        cx, cy, s, r = self._state[:4]
+        w = np.sqrt(max(s, 0.0) * max(r, 1e-6))
+        h = s / w if w > 0 else 0.0
+        return np.array([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2])
+    
+    @property
+    def bbox(self) -> Tuple[int, int, int, int]:
+        """Box state saat ini (x, y, w, h)"""
+        x1, y1, x2, y2 = self.xyxy
+        return int(x1), int(y1), int(x2 - x1), int(y2 - y1)
+
+
+class PersonTracker:
+    """
+    Tracker multi-objek ringan di atas output PersonDetector untuk satu kamera
+    
+    Setiap siklus deteksi, track yang ada diprediksi ke waktu frame, lalu
+    dicocokkan dengan deteksi secara greedy berdasarkan IoU tertinggi. Deteksi
+    tanpa pasangan menjadi track baru; track yang tidak terlihat lebih dari
+    max_age detik dihapus. Orang yang tetap di depan kamera mempertahankan ID,
+    sehingga alert dan face recognition cukup dilakukan sekali per kunjungan.
+    
+    Umur track hanya bertambah oleh siklus deteksi yang benar-benar mencakup
+    track tersebut: waktu tanpa deteksi (YOLO di-gate motion) dan deteksi ROI
+    di luar track tidak dihitung sebagai "tidak terlihat".
+    """
+    
+    def __init__(self, iou_threshold: float = 0.3, max_age: float = 5.0, min_hits: int = 1):
+        """
+        Inisialisasi Person Tracker
+        
+        Args:
+            iou_threshold: IoU minimal deteksi dengan prediksi track agar dianggap orang yang sama
+            max_age: Detik deteksi tanpa menemukan track sebelum track dihapus
+            min_hits: Jumlah deteksi sebelum track dianggap terkonfirmasi (menyaring false positive sesaat)
+        """
+        self.iou_threshold = iou_threshold
+        self.max_age = max_age
+        self.min_hits = max(1, min_hits)
+        self.tracks: List[Track] = []
+        self._next_id = 1
+        self._last_update: Optional[float] = None
+        self.logger = logging.getLogger(__name__)
+    
+    @staticmethod
+    def iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+        """
+        IoU setiap pasangan box
+        
+        Args:
+            boxes_a: Array (N, 4) x1, y1, x2, y2
+            boxes_b: Array (M, 4) x1, y1, x2, y2
+        
+        Returns:
+            Array (N, M) IoU
+        """
+        a = boxes_a[:, None, :]
+        b = boxes_b[None, :, :]
+        inter_w = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+        inter_h = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+        inter = inter_w * inter_h
+        area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+        area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+        return inter / (area_a + area_b - inter + 1e-9)
+    
+    def _match(self, iou: np.ndarray) -> List[Tuple[int, int]]:
+        """
+        Pencocokan greedy track-deteksi dari IoU tertinggi
+        
+        Args:
+            iou: Array (jumlah_track, jumlah_deteksi)
+        
+        Returns:
+            List pasangan (index track, index deteksi)
+        """
+        matches = []
+        if iou.size == 0:
+            return matches
+        
+        used_tracks = set()
+        used_detections = set()
+        candidates = np.argwhere(iou >= self.iou_threshold)
+        order = np.argsort(-iou[candidates[:, 0], candidates[:, 1]])
+        for track_index, detection_index in candidates[order].tolist():
+            if track_index in used_tracks or detection_index in used_detections:
+                continue
+            used_tracks.add(track_index)
+            used_detections.add(detection_index)
+            matches.append((track_index, detection_index))
+        return matches
+    
+    @staticmethod
+    def _covers(track: Track, regions: Optional[Sequence[Tuple[int, int, int, int]]]) -> bool:
+        """
+        Cek apakah deteksi pada regions mencakup pusat prediksi track
+        
+        Args:
+            track: Track yang sudah diprediksi ke waktu frame
+            regions: Region deteksi (x, y, w, h); None = frame penuh
+        
+        Returns:
+            True jika track seharusnya terdeteksi jika orangnya masih ada
+        """
+        if not regions:
+            return True
+        x1, y1, x2, y2 = track.xyxy
+        center_x, center_y = (x1 + x2) / 2, (y1 + y2) / 2
+        return any(x <= center_x <= x + w and y <= center_y <= y + h for x, y, w, h in regions)
+    
+    def update(self, detections: Sequence[Tuple[int, int, int, int, float]],
+               timestamp: float,
+               regions: Optional[Sequence[Tuple[int, int, int, int]]] = None) -> List[Optional[Track]]:
+        """
+        Perbarui tracker dengan hasil deteksi satu frame
+        
+        Hanya dipanggil untuk frame yang benar-benar dideteksi. Track yang tidak
+        cocok menua sebesar jarak ke siklus deteksi sebelumnya, dibatasi
+        max_age / 2 agar satu deteksi terlewat setelah jeda panjang (cek paksa
+        gating) belum menghapus track.
+        
+        Args:
+            detections: Deteksi [(x, y, w, h, confidence), ...] dari PersonDetector
+            timestamp: Waktu frame
+            regions: Region yang dideteksi (ROI), None = frame penuh; track di
+                luar region tidak menua
+        
+        Returns:
+            Track untuk setiap deteksi (urutan sama dengan detections); None jika
+            track belum terkonfirmasi (hits < min_hits)
+        """
+        predicted = np.array([track.predict(timestamp, self.max_age) for track in self.tracks]).reshape(-1, 4)
+        boxes = np.array([
+            (x, y, x + w, y + h) for x, y, w, h, _ in detections
+        ], dtype=float).reshape(-1, 4)
+        
+        assigned: List[Optional[Track]] = [None] * len(detections)
+        for track_index, detection_index in self._match(self.iou_matrix(predicted, boxes)):
+            x, y, w, h, confidence = detections[detection_index]
+            track = self.tracks[track_index]
+            track.update((x, y, w, h), confidence, timestamp)
+            assigned[detection_index] = track
+        
+        for detection_index, (x, y, w, h, confidence) in enumerate(detections):
+            if assigned[detection_index] is None:
+                track = Track(self._next_id, (x, y, w, h), confidence, timestamp)
+                self._next_id += 1
+                self.tracks.append(track)
+                assigned[detection_index] = track
+                self.logger.debug(f"Track baru #{track.track_id} di ({x},{y}) {w}x{h}")
+        
+        # Track yang seharusnya terlihat tetapi tidak terdeteksi menua
+        elapsed = 0.0 if self._last_update is None else max(0.0, timestamp - self._last_update)
+        elapsed = min(elapsed, self.max_age / 2)
+        self._last_update = timestamp
+        matched = {id(track) for track in assigned}
+        for track in self.tracks:
+            if id(track) not in matched and self._covers(track, regions):
+                track.unseen += elapsed
+        
+        # Hapus track yang sudah lama tidak terlihat (orang sudah pergi)
+        expired = [track for track in self.tracks if track.unseen > self.max_age]
+        if expired:
+            self.tracks = [track for track in self.tracks if track.unseen <= self.max_age]
+            self.logger.debug(f"Track selesai: {[track.track_id for track in expired]}")
+        
+        return [track if track.hits >= self.min_hits else None for track in assigned]
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Statistik tracker
+        
+        Returns:
+            Dictionary active_tracks dan total_tracks
+        """
+        return {'active_tracks': len(self.tracks), 'total_tracks': self._next_id - 1}
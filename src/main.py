@@ -17,33 +17,54 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from camera.camera_manager import CameraManager
+from camera.camera_manager import CameraHealth
+from camera.camera_pool import CameraPool
 from detection.face_detector import FaceDetector
 from detection.person_detector import PersonDetector
 from detection.face_recognition import FaceRecognition
 from detection.motion_detector import MotionDetector
+from detection.person_tracker import PersonTracker
+from pipeline.inference_batcher import InferenceBatcher
+from pipeline.inference_executor import InferenceExecutor
+from pipeline.stage_queue import FrameJob, StageQueue, DropPolicy, run_stage
 from telegram_bot.bot_handler import BotHandler
 
 
 class CCTVTelebotApp:
     """Kelas utama untuk aplikasi CCTV AI Telegram Bot"""
     
+    # Antrian pipeline default: {nama: (maxsize, policy)}. Tahap analisis membuang
+    # frame tertua agar selalu memproses frame terbaru, notifikasi memberi backpressure
+    PIPELINE_QUEUE_DEFAULTS = {
+        'motion': (2, DropPolicy.DROP_OLDEST),
+        'detection': (2, DropPolicy.DROP_OLDEST),
+        'face': (2, DropPolicy.DROP_OLDEST),
+        'notification': (8, DropPolicy.BLOCK)
+    }
+    
     def __init__(self):
         """Inisialisasi aplikasi"""
         self.logger = self._setup_logging()
         
-        # Komponen sistem
-        self.camera = None
+        # Komponen sistem (model dipakai bersama oleh semua kamera)
+        self.camera_pool = None
+        self.camera = None  # Kamera utama untuk perintah bot
         self.face_detector = None
         self.person_detector = None
         self.face_recognition = None
-        self.motion_detector = None
+        self.motion_detectors = {}  # {camera_id: MotionDetector}, stateful per kamera
+        self.person_trackers = {}  # {camera_id: PersonTracker}, jika detection.tracking_enabled
+        self.inference_executor = None  # Thread/process pool untuk YOLO, Haar dan dlib
+        self.person_batcher = None      # Batch YOLO lintas kamera (detection.batch_size > 1)
         self.bot_handler = None
         
-        # Tracking untuk mencegah duplicate notifications
-        self.last_motion_time = 0
-        self.last_person_detection_time = 0
+        # Jeda minimal antara notifikasi orang dan gerakan (per kamera)
         self.notification_cooldown = 5  # detik
+        self.notification_times = {}  # {camera_id: {'motion': t, 'person': t, 'detection': t}}
+        
+        # Antrian antar tahap pipeline deteksi
+        self.pipeline_queues = {}  # {nama_tahap: StageQueue}
+        self.detection_locks = {}  # {camera_id: asyncio.Lock}, satu job deteksi per kamera
         
         # Konfigurasi
         self.config = None
@@ -64,7 +85,7 @@ class CCTVTelebotApp:
             frame: Frame dari kamera
             bbox: Bounding box (x, y, w, h) dari YOLOv8
             padding: Padding tambahan di sekitar wajah
-            
+        
         Returns:
             Cropped face image
         """
@@ -89,7 +110,7 @@ class CCTVTelebotApp:
             else:
                 self.logger.warning(f"Empty face crop from bbox: {bbox}")
                 return None
-                
+        
         except Exception as e:
             self.logger.error(f"Error cropping face from bbox: {str(e)}")
             return None
@@ -151,7 +172,7 @@ class CCTVTelebotApp:
             self.logger.info("Konfigurasi Telegram berhasil dimuat")
             
             return True
-            
+        
         except Exception as e:
             self.logger.error(f"Error load konfigurasi: {str(e)}")
             return False
@@ -162,73 +183,127 @@ class CCTVTelebotApp:
             self.logger.info("Menginisialisasi komponen sistem...")
             
             # Kamera - support old format (camera) and new format (cameras)
-            camera_config = None
-            if 'camera' in self.config:
-                camera_config = self.config['camera']
-            elif 'cameras' in self.config and len(self.config['cameras']) > 0:
-                camera_config = self.config['cameras'][0]  # Ambil kamera pertama
-            
-            if camera_config is None:
+            self.camera_pool = CameraPool(self.config)
+            if len(self.camera_pool) == 0:
                 raise Exception("Konfigurasi kamera tidak ditemukan")
             
-            self.camera = CameraManager(
-                ip=camera_config['ip'],
-                port=camera_config['port'],
-                username=camera_config['username'],
-                password=camera_config['password'],
-                rtsp_port=camera_config.get('rtsp_port', 554),
-                stream_url=camera_config.get('stream_url', '/1'),
-                buffer_size=camera_config.get('buffer_size', 3),
-                fps=camera_config.get('fps', 15),
-                timeout=camera_config.get('timeout', 10),
-                max_retries=camera_config.get('max_retries', 5),
-                use_vlc_proxy=camera_config.get('use_vlc_proxy', False),
-                vlc_rtsp_port=camera_config.get('vlc_rtsp_port', 8554),
-                vlc_rtsp_path=camera_config.get('vlc_rtsp_path', '/camera'),
-                use_http_stream=camera_config.get('use_http_stream', False),
-                vlc_http_port=camera_config.get('vlc_http_port', 8554),
-                use_gstreamer_proxy=camera_config.get('use_gstreamer_proxy', False),
-                gstreamer_rtsp_port=camera_config.get('gstreamer_rtsp_port', 8554)
-            )
-            
-            # Hubungkan ke kamera
-            if not self.camera.connect():
+            # Hubungkan semua kamera secara paralel, kamera yang gagal reconnect di background
+            if self.camera_pool.connect_all() == 0:
+                # Hentikan thread reconnect/capture yang sudah dimulai connect_all
+                self.camera_pool.close_all()
                 raise Exception("Gagal menghubungkan ke kamera")
             
-            # Face Detector
-            self.face_detector = FaceDetector()
-            self.logger.info("Face detector diinisialisasi")
+            self.camera = self.camera_pool.primary
+            
+            # Face Detector (Haar Cascade atau model DNN YuNet/SSD)
+            face_detector_kwargs = {
+                'backend': self.config['detection'].get('face_detector_backend', 'haar'),
+                'model_path': self.config['detection'].get('face_model') or None,
+                'input_size': self.config['detection'].get('face_input_size', 320),
+                'score_threshold': self.config['detection'].get('face_score_threshold', 0.6)
+            }
+            self.face_detector = FaceDetector(**face_detector_kwargs)
+            self.logger.info(f"Face detector ({self.face_detector.backend}) diinisialisasi")
             
             # Person Detector dengan YOLOv8n - Optimasi CPU
             max_cpu_cores = self.config['detection'].get('max_cpu_cores', 3)
             inference_size = self.config['detection'].get('inference_size', 320)
             model_size = self.config['detection'].get('model_size', 'yolov8n')
             
-            self.person_detector = PersonDetector(
-                confidence_threshold=self.config['detection']['min_confidence'],
-                max_cpu_cores=max_cpu_cores,
-                inference_size=inference_size,
-                model_size=model_size
-            )
-            self.logger.info(f"Person detector (YOLO{model_size[5:]}) diinisialisasi dengan {max_cpu_cores} CPU cores, inference size: {inference_size}")
+            # Inference berjalan di executor agar event loop (bot Telegram) tetap
+            # responsif. Total thread inference dibatasi max_cpu_cores: setiap
+            # worker mendapat max_cpu_cores // workers thread torch
+            executor_mode = self.config['detection'].get('inference_executor', InferenceExecutor.MODE_THREAD)
+            inference_workers = max(1, min(self.config['detection'].get('inference_workers', 1), max_cpu_cores))
+            threads_per_worker = max(1, max_cpu_cores // inference_workers)
+            
+            person_detector_kwargs = {
+                'confidence_threshold': self.config['detection']['min_confidence'],
+                'max_cpu_cores': threads_per_worker,
+                'inference_size': inference_size,
+                'model_size': model_size,
+                'backend': self.config['detection'].get('backend', 'ultralytics'),
+                'onnx_model_path': self.config['detection'].get('onnx_model') or None,
+                'quantized': self.config['detection'].get('quantized', False),
+                'rectangular': self.config['detection'].get('rectangular_inference', True)
+            }
+            face_recognition_kwargs = {
+                'tolerance': self.config['database']['face_encoding_tolerance'],
+                'aggregation': self.config['database'].get('face_match_aggregation', 'min')
+            }
+            
+            # Mode process memuat YOLO di setiap worker, proses utama tidak butuh salinannya
+            if executor_mode == InferenceExecutor.MODE_THREAD:
+                self.person_detector = PersonDetector(**person_detector_kwargs)
+                self.logger.info(
+                    f"Person detector (YOLO{model_size[5:]}, backend {person_detector_kwargs['backend']}) diinisialisasi "
+                    f"dengan {threads_per_worker} CPU cores, inference size: {inference_size}"
+                )
             
             # Face Recognition
-            self.face_recognition = FaceRecognition(
-                tolerance=self.config['database']['face_encoding_tolerance']
-            )
+            self.face_recognition = FaceRecognition(**face_recognition_kwargs)
             self.logger.info("Face recognition diinisialisasi")
             
-            # Motion Detector
-            if self.config['detection'].get('motion_detection_enabled', False):
-                motion_config = self.config.get('motion_detection', {})
-                self.motion_detector = MotionDetector(
-                    min_contour_area=motion_config.get('min_contour_area', 500),
-                    sensitivity=motion_config.get('sensitivity', 25)
+            self.inference_executor = InferenceExecutor(
+                model_specs={
+                    'person_detector': (PersonDetector, person_detector_kwargs),
+                    'face_detector': (FaceDetector, face_detector_kwargs),
+                    'face_recognition': (FaceRecognition, face_recognition_kwargs)
+                },
+                mode=executor_mode,
+                workers=inference_workers,
+                models={
+                    'person_detector': self.person_detector,
+                    'face_detector': self.face_detector,
+                    'face_recognition': self.face_recognition
+                } if executor_mode == InferenceExecutor.MODE_THREAD else {
+                    # Mode process: instance proses utama hanya untuk perintah bot (call_main)
+                    'face_detector': self.face_detector,
+                    'face_recognition': self.face_recognition
+                }
+            )
+            
+            # Batch YOLO lintas kamera: frame dari beberapa kamera digabung menjadi
+            # satu forward pass, ditukar dengan delay maksimal batch_timeout_ms
+            batch_size = self.config['detection'].get('batch_size', 1)
+            if batch_size > 1:
+                self.person_batcher = InferenceBatcher(
+                    self.inference_executor,
+                    max_batch=batch_size,
+                    max_wait_ms=self.config['detection'].get('batch_timeout_ms', 20)
                 )
-                self.logger.info("Motion detector diinisialisasi")
+            
+            # Motion Detector (satu per kamera karena menyimpan frame sebelumnya)
+            if self.config['detection'].get('motion_detection_enabled', False):
+                for camera_id in self.camera_pool.ids():
+                    motion_config = self.camera_pool.get_motion_config(camera_id)
+                    self.motion_detectors[camera_id] = MotionDetector(
+                        min_contour_area=motion_config.get('min_contour_area', 500),
+                        sensitivity=motion_config.get('sensitivity', 25),
+                        analysis_width=motion_config.get('analysis_width', 0),
+                        background_model=motion_config.get('background_model', 'frame_diff'),
+                        learning_rate=motion_config.get('learning_rate', -1),
+                        warmup_frames=motion_config.get('warmup_frames', 0),
+                        zones=motion_config.get('zones'),
+                        exclude_zones=motion_config.get('exclude_zones'),
+                        zone_min_percentage=motion_config.get('zone_min_percentage', 1.0)
+                    )
+                self.logger.info(f"Motion detector diinisialisasi untuk {len(self.motion_detectors)} kamera")
             else:
                 self.logger.info("Motion detector dinonaktifkan")
             
+            # Person Tracker (satu per kamera): alert dan face recognition sekali per track
+            for camera_id in self.camera_pool.ids():
+                detection_config = self.camera_pool.get_detection_config(camera_id)
+                if detection_config.get('tracking_enabled', False):
+                    self.person_trackers[camera_id] = PersonTracker(
+                        iou_threshold=detection_config.get('track_iou_threshold', 0.3),
+                        max_age=detection_config.get('track_max_age', 5.0),
+                        min_hits=detection_config.get('track_min_hits', 1)
+                    )
+            if self.person_trackers:
+                self.logger.info(f"Person tracker diinisialisasi untuk {len(self.person_trackers)} kamera")
+            
             # Telegram Bot
             self.bot_handler = BotHandler(
                 bot_token=self.telegram_config['bot_token'],
@@ -236,7 +311,9 @@ class CCTVTelebotApp:
                 face_detector=self.face_detector,
                 person_detector=self.person_detector,
                 face_recognition=self.face_recognition,
-                config=self.config
+                config=self.config,
+                camera_pool=self.camera_pool,
+                inference_executor=self.inference_executor
             )
             
             # Handle admin_id - convert to int if provided and valid
@@ -257,43 +334,206 @@ class CCTVTelebotApp:
             self.logger.info("Telegram bot diinisialisasi")
             
             return True
-            
+        
         except Exception as e:
             self.logger.error(f"Error inisialisasi komponen: {str(e)}")
             return False
     
+    def _create_pipeline(self):
+        """
+        Membuat antrian antar tahap pipeline dari section 'pipeline' di konfigurasi
+        
+        Tahap: capture -> motion -> detection -> face -> notification. Setiap antrian
+        terbatas dengan kebijakan overflow sendiri (drop_oldest, drop_newest, block).
+        Kapasitas berlaku per kamera dan kamera dilayani bergiliran, sehingga kamera
+        yang sibuk tidak membuang frame kamera lain.
+        """
+        pipeline_config = self.config.get('pipeline', {}) or {}
+        
+        for name, (default_size, default_policy) in self.PIPELINE_QUEUE_DEFAULTS.items():
+            queue_config = pipeline_config.get(name, {}) or {}
+            self.pipeline_queues[name] = StageQueue(
+                name,
+                maxsize=queue_config.get('maxsize', default_size),
+                policy=queue_config.get('policy', default_policy),
+                key=lambda job: job.camera.camera_id
+            )
+        
+        self.logger.info("Pipeline deteksi: " + ", ".join(
+            f"{q.name}(max={q.maxsize}/kamera, {q.policy})" for q in self.pipeline_queues.values()
+        ))
+    
+    def get_pipeline_stats(self) -> dict:
+        """
+        Statistik antrian pipeline (kedalaman, jumlah dibuang, jumlah diproses)
+        
+        Returns:
+            Dictionary {nama_antrian: stats}
+        """
+        return {name: queue.stats() for name, queue in self.pipeline_queues.items()}
+    
+    async def _forward(self, queue_name: str, job: FrameJob) -> bool:
+        """
+        Meneruskan job ke antrian tahap berikutnya
+        
+        Frame dari sumber non-live (replay fast/fixed) tidak pernah dibuang agar
+        hasil replay bisa direproduksi, antrian menunggu tahap berikutnya.
+        
+        Args:
+            queue_name: Nama antrian tujuan
+            job: FrameJob yang diteruskan
+        
+        Returns:
+            True jika job masuk antrian, False jika dibuang
+        """
+        block = None if job.camera.is_live() else True
+        return await self.pipeline_queues[queue_name].put(job, block=block)
+    
     async def run_detection_loop(self):
-        """Loop utama untuk deteksi orang dan wajah"""
-        self.logger.info("Memulai loop deteksi...")
+        """
+        Jalankan pipeline deteksi untuk semua kamera aktif
+        
+        Satu tahap capture per kamera mengisi antrian motion; tahap motion,
+        deteksi orang, pengenalan wajah dan notifikasi dipakai bersama semua
+        kamera dan masing-masing berjalan dengan kecepatannya sendiri, sehingga
+        upload Telegram yang lambat tidak menunda analisis frame berikutnya.
+        """
+        self.logger.info(f"Memulai pipeline deteksi untuk {len(self.camera_pool)} kamera...")
+        
+        self._create_pipeline()
+        stages = [
+            ('motion', self._motion_stage),
+            ('detection', self._detection_stage),
+            ('face', self._face_stage),
+            ('notification', self._notification_stage)
+        ]
+        # Batching butuh beberapa frame deteksi yang menunggu bersamaan (dari kamera
+        # berbeda; frame satu kamera tetap diproses berurutan, lihat _detection_stage)
+        detection_workers = self.person_batcher.max_batch if self.person_batcher else 1
+        workers = [
+            asyncio.create_task(run_stage(self.pipeline_queues[name], handler))
+            for name, handler in stages
+            for _ in range(detection_workers if name == 'detection' else 1)
+        ]
+        workers.append(asyncio.create_task(self._monitor_pipeline()))
+        
+        try:
+            await asyncio.gather(*[
+                self.run_capture_loop(camera_id) for camera_id in self.camera_pool.ids()
+            ])
+            
+            # Semua capture selesai (replay habis): tuntaskan frame yang masih di antrian
+            if self.running:
+                for name, _ in stages:
+                    await self.pipeline_queues[name].join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self.logger.info(f"Pipeline deteksi berhenti: {self.get_pipeline_stats()}")
+            self.logger.info(f"Inference executor: {self.inference_executor.stats()}")
+            if self.person_batcher:
+                self.logger.info(f"Inference batcher: {self.person_batcher.stats()}")
+    
+    async def _monitor_pipeline(self, interval: float = 30.0):
+        """
+        Log kedalaman antrian secara berkala
+        
+        Args:
+            interval: Jeda antar log (detik)
+        """
+        while True:
+            await asyncio.sleep(interval)
+            summary = ", ".join(
+                f"{name}={stats['depth']}/{stats['maxsize']}x{stats['lanes']} (drop {stats['dropped']})"
+                for name, stats in self.get_pipeline_stats().items()
+            )
+            self.logger.info(f"Antrian pipeline: {summary}")
+            
+            stats = self.inference_executor.stats()
+            self.logger.info(
+                f"Inference executor ({stats['mode']}): {stats['in_flight']}/{stats['workers']} berjalan, "
+                f"{stats['completed']} selesai, rata-rata {stats['avg_ms']:.0f}ms, "
+                f"frame bus tertimpa {stats['stale_frames']}"
+            )
+            
+            if self.person_batcher:
+                stats = self.person_batcher.stats()
+                self.logger.info(
+                    f"Inference batcher: {stats['batches']} batch, rata-rata {stats['avg_batch_size']:.1f} frame "
+                    f"(penuh {stats['flush_full']}, timeout {stats['flush_timeout']}), tunggu rata-rata "
+                    f"{stats['avg_wait_ms']:.0f}ms / maks {stats['max_wait_ms']:.0f}ms, "
+                    f"inference {stats['avg_inference_ms']:.0f}ms/batch, latency {stats['avg_latency_ms']:.0f}ms"
+                )
+    
+    async def run_capture_loop(self, camera_id: str):
+        """
+        Tahap capture untuk satu kamera: cek kesehatan, ambil frame sesuai
+        interval deteksi dan masukkan ke antrian motion
+        
+        Args:
+            camera_id: ID kamera di CameraPool
+        """
+        camera = self.camera_pool.get(camera_id)
+        detection_config = self.camera_pool.get_detection_config(camera_id)
         
-        last_detection_time = time.time()
-        detection_interval = self.config['detection']['detection_interval']
+        self.logger.info(f"Tahap capture dimulai untuk kamera {camera.label}")
+        
+        # Tracking per kamera untuk mencegah duplicate notifications
+        # ('detection' = inference YOLO terakhir, untuk cek paksa saat motion gating)
+        self.notification_times[camera_id] = {'motion': 0, 'person': 0, 'detection': 0}
+        
+        # Sumber non-live (replay fast/fixed) dibaca frame demi frame dan memakai
+        # waktu media sebagai jam untuk interval deteksi dan cooldown
+        replay = not camera.is_live()
+        replay_start = time.time()
+        analyzed_count = 0
+        
+        last_detection_time = 0 if replay else time.time()
+        detection_interval = detection_config['detection_interval']
         
         last_camera_check = time.time()
-        camera_check_interval = 30  # Cek kamera setiap 30 detik
+        camera_check_interval = 5  # Watchdog pasif, murah untuk dicek sering
+        last_health_status = CameraHealth.OK
         
         frame_count = 0  # Counter untuk debug
+        last_frame_seq = 0  # Sequence frame terakhir yang dianalisis (threaded capture)
+        frame_ref = None  # Referensi frame bus untuk frame dari thread capture
+        waiting_since = None  # Waktu mulai menunggu frame baru dari thread capture (stall/reconnect)
         
         while self.running:
             try:
-                current_time = time.time()
+                if replay:
+                    if camera.is_finished():
+                        break
+                    # Di thread karena pacing "fixed" menunggu jadwal frame
+                    ret, frame = await asyncio.to_thread(camera.read_frame)
+                    current_time = camera.clock()
+                else:
+                    current_time = time.time()
                 frame_count += 1
                 
                 # Log setiap 30 detik untuk memastikan loop berjalan
                 if frame_count % 300 == 0:
-                    self.logger.info(f"Detection loop running... Frame count: {frame_count}")
+                    self.logger.info(f"Capture [{camera.label}] running... Frame count: {frame_count}")
                 
-                # Cek status kamera
+                # Cek kesehatan kamera secara pasif (tanpa membaca frame tambahan).
+                # Reconnect berjalan di background thread, alert putus/sambung
+                # dikirim BotHandler saat state kamera berubah
                 if current_time - last_camera_check >= camera_check_interval:
-                    self.logger.debug("Checking camera connection...")
-                    if not self.camera.check_connection():
-                        self.logger.warning("Kamera terputus, mencoba reconnect...")
-                        await self.bot_handler.send_camera_disconnected_alert()
-                        
-                        if self.camera.reconnect():
-                            await self.bot_handler.send_camera_reconnected_alert()
-                    else:
-                        self.logger.debug("Camera connection OK")
+                    health = camera.get_health()
+                    status = health['status']
+                    
+                    if status != last_health_status:
+                        self.logger.warning(
+                            f"Status kamera {camera.label}: {last_health_status} -> {status} "
+                            f"(frame age: {health['frame_age']:.1f}s, FPS: {health['measured_fps']:.1f})"
+                        )
+                        last_health_status = status
+                    
+                    if status == CameraHealth.DEAD:
+                        if camera.request_reconnect():
+                            self.logger.warning("Kamera terputus, reconnect dijalankan di background...")
                     
                     last_camera_check = current_time
                 
@@ -307,105 +547,388 @@ class CCTVTelebotApp:
                 if current_time - last_detection_time >= detection_interval:
                     self.logger.debug(f"Attempting to read frame... (frame #{frame_count})")
                     
-                    # Baca frame dari kamera
-                    ret, frame = self.camera.read_frame()
+                    # Baca frame dari kamera live (frame replay sudah dibaca di awal
+                    # iterasi karena clock() replay mengikuti frame yang dibaca)
+                    frame_ref = None
+                    no_new_frame = False
+                    if not replay:
+                        if camera.is_capture_running():
+                            # Ambil frame terbaru dari slot, lewati jika belum ada frame baru
+                            frame, frame_seq, frame_timestamp = camera.get_latest_frame()
+                            ret = frame is not None and frame_seq != last_frame_seq
+                            no_new_frame = not ret
+                            if ret:
+                                last_frame_seq = frame_seq
+                                frame_ref = camera.get_latest_frame_ref(frame_seq, frame)
+                                self.logger.debug(f"Frame #{frame_seq} age: {(current_time - frame_timestamp) * 1000:.0f}ms")
+                        else:
+                            ret, frame = camera.read_frame()
                     
                     if ret and frame is not None:
                         self.logger.debug(f"Frame read successfully: {frame.shape}")
+                        if waiting_since is not None:
+                            self.logger.info(
+                                f"Frame baru dari kamera {camera.label} setelah menunggu "
+                                f"{current_time - waiting_since:.1f}s"
+                            )
+                            waiting_since = None
+                        analyzed_count += 1
                         
-                        # Deteksi gerakan (jika diaktifkan)
-                        has_motion = False
-                        motion_percentage = 0.0
-                        if self.motion_detector is not None:
-                            has_motion, motion_percentage, _ = self.motion_detector.detect_motion(frame)
-                            self.logger.info(f"Motion detection: has_motion={has_motion}, percentage={motion_percentage:.2f}%")
-                            
-                            # Kirim notifikasi jika ada gerakan
-                            motion_config = self.config.get('motion_detection', {})
-                            cooldown = motion_config.get('cooldown_seconds', 5)
-                            min_percentage = motion_config.get('min_motion_percentage', 2)
-                            
-                            if (has_motion and 
-                                motion_percentage >= min_percentage and
-                                current_time - self.last_motion_time >= cooldown):
-                                
-                                # Skip motion notification jika person detection baru saja terjadi
-                                # untuk mencegah duplicate foto
-                                if current_time - self.last_person_detection_time < self.notification_cooldown:
-                                    self.logger.info("Motion detected skipped - person detection sent recently")
-                                elif self.config['notification'].get('send_on_motion', True):
-                                    self.logger.info(f"Motion detected! Percentage: {motion_percentage:.2f}%")
-                                    await self.bot_handler.send_motion_alert(frame, motion_percentage)
-                                    self.last_motion_time = current_time
-                        
-                        # Deteksi orang
-                        if self.config['detection']['person_detection_enabled']:
-                            self.logger.debug("Starting person detection...")
-                            detected_persons = self.person_detector.detect_persons(frame)
-                            self.logger.info(f"Person detection result: {len(detected_persons)} persons detected")
-                            
-                            # Cek cooldown untuk mencegah spam notifikasi
-                            person_cooldown = self.config.get('notification', {}).get('person_detection_cooldown', 30)
-                            
-                            if len(detected_persons) > 0 and current_time - self.last_person_detection_time >= person_cooldown:
-                                self.logger.info(f"Terdeteksi {len(detected_persons)} orang")
-                                
-                                # Gunakan person bbox untuk zoom (lebih akurat dari face detector)
-                                person_bboxes = [(x, y, w, h) for x, y, w, h, conf in detected_persons]
-                                
-                                # Crop zoom dari person bbox
-                                person_crops = []
-                                for bbox in person_bboxes:
-                                    crop = self._crop_face_from_bbox(frame, bbox, padding=20)
-                                    if crop is not None:
-                                        person_crops.append((crop, bbox))
-                                
-                                # Deteksi wajah hanya untuk recognition, zoom gunakan person bbox
-                                recognized_faces = []
-                                if self.config['detection']['face_recognition_enabled']:
-                                    faces = self.face_detector.detect_faces(frame)
-                                    
-                                    if len(faces) > 0:
-                                        face_images = [self._crop_face_from_bbox(frame, bbox) for bbox in faces]
-                                        recognized_faces = self.face_recognition.recognize_faces(face_images)
-                                
-                                # Update statistik
-                                if self.bot_handler.get_commands_instance():
-                                    stats = self.bot_handler.get_commands_instance().detection_stats
-                                    stats['total'] += len(detected_persons)
-                                    for face in recognized_faces:
-                                        if face['status'] == 'known':
-                                            stats['known'] +=1
-                                        else:
-                                            stats['unknown'] +=1
-                                    
-                                # Kirim notifikasi SEGERA tanpa delay
-                                self.logger.info("Sending detection alert to Telegram...")
-                                await self.bot_handler.send_detection_alert(
-                                    frame,
-                                    detected_persons,
-                                    recognized_faces,
-                                    person_crops  # Gunakan person crops untuk zoom
-                                )
-                                
-                                # Update tracking untuk mencegah duplicate motion notification
-                                self.last_person_detection_time = current_time
-                                
-                                # Reset timer agar deteksi berikutnya tidak perlu tunggu lama
-                                last_detection_time = current_time
-                        else:
-                            self.logger.debug("Person detection is disabled")
-                        
+                        job = FrameJob(camera, frame, current_time, sequence=frame_count)
+                        job.frame_ref = frame_ref
+                        await self._forward('motion', job)
                         last_detection_time = current_time
+                    elif no_new_frame:
+                        # Wajar saat stall atau reconnect background: catat sekali per stall,
+                        # kesehatan kamera dipantau watchdog di atas
+                        if waiting_since is None:
+                            waiting_since = current_time
+                            self.logger.debug(f"Belum ada frame baru dari kamera {camera.label}, menunggu...")
                     else:
                         self.logger.warning(f"Failed to read frame (ret={ret}, frame={frame is not None})")
                 
-                # Tunggu sebentar sebelum loop berikutnya
-                await asyncio.sleep(0.1)
-                
+                # Tunggu sebentar sebelum loop berikutnya (replay hanya yield ke event loop)
+                await asyncio.sleep(0 if replay else 0.1)
+            
             except Exception as e:
-                self.logger.error(f"Error dalam loop deteksi: {str(e)}", exc_info=True)
+                self.logger.error(f"Error dalam loop capture: {str(e)}", exc_info=True)
                 await asyncio.sleep(1)
+        
+        if replay:
+            elapsed = time.time() - replay_start
+            self.logger.info(
+                f"Replay {camera.label} selesai: {frame_count} frame dibaca, {analyzed_count} dianalisis "
+                f"dalam {elapsed:.1f}s ({analyzed_count / elapsed if elapsed > 0 else 0:.2f} frame/s)"
+            )
+    
+    def _inference_frame(self, job: FrameJob):
+        """
+        Frame yang dikirim ke inference executor
+        
+        Mode process: referensi frame bus (worker membaca shared memory, frame
+        tidak di-pickle) jika kamera punya frame bus; selain itu ndarray.
+        
+        Args:
+            job: FrameJob
+        
+        Returns:
+            FrameRef atau ndarray
+        """
+        if job.frame_ref is not None and self.inference_executor.mode == InferenceExecutor.MODE_PROCESS:
+            return job.frame_ref
+        return job.frame
+    
+    async def _motion_stage(self, job: FrameJob):
+        """
+        Tahap motion gate: deteksi gerakan, antrikan notifikasi gerakan dan
+        teruskan frame ke tahap deteksi orang
+        
+        Args:
+            job: FrameJob dari tahap capture
+        """
+        camera = job.camera
+        motion_detector = self.motion_detectors.get(camera.camera_id)
+        times = self.notification_times[camera.camera_id]
+        
+        if motion_detector is not None:
+            motion_config = self.camera_pool.get_motion_config(camera.camera_id)
+            job.has_motion, job.motion_percentage, _ = motion_detector.detect_motion(job.frame)
+            job.motion_zones = motion_detector.get_active_zones()
+            armed_motion = motion_detector.armed_motion(job.has_motion)
+            self.logger.info(
+                f"Motion detection [{camera.label}]: has_motion={job.has_motion}, "
+                f"percentage={job.motion_percentage:.2f}%, zones={job.motion_zones}"
+            )
+            
+            # Kirim notifikasi jika ada gerakan (dengan zona: hanya zona armed,
+            # threshold per zona menggantikan min_motion_percentage)
+            cooldown = motion_config.get('cooldown_seconds', 5)
+            min_percentage = motion_config.get('min_motion_percentage', 2)
+            if motion_detector.has_zones():
+                triggered = armed_motion
+            else:
+                triggered = job.has_motion and job.motion_percentage >= min_percentage
+            
+            if triggered and job.timestamp - times['motion'] >= cooldown:
+                
+                # Skip motion notification jika person detection baru saja terjadi
+                # untuk mencegah duplicate foto
+                if job.timestamp - times['person'] < self.notification_cooldown:
+                    self.logger.info("Motion detected skipped - person detection sent recently")
+                elif self.config['notification'].get('send_on_motion', True):
+                    self.logger.info(f"Motion detected! Percentage: {job.motion_percentage:.2f}%")
+                    # Job terpisah karena tahap deteksi bisa mengganti frame dengan main stream
+                    motion_job = FrameJob(camera, job.frame, job.timestamp, job.sequence)
+                    motion_job.motion_percentage = job.motion_percentage
+                    motion_job.alert = "motion"
+                    if await self._forward('notification', motion_job):
+                        times['motion'] = job.timestamp
+            
+            # Lewati YOLO jika tidak ada gerakan (di zona armed), kecuali cek paksa berkala
+            if motion_config.get('gate_person_detection', False) and not armed_motion:
+                force_interval = motion_config.get('force_check_interval', 0)
+                if force_interval <= 0 or job.timestamp - times['detection'] < force_interval:
+                    self.logger.debug(f"Person detection skipped [{camera.label}]: tidak ada gerakan di zona armed")
+                    return
+                self.logger.debug(f"Cek paksa person detection [{camera.label}] setelah {force_interval}s tanpa gerakan")
+            elif job.has_motion and motion_config.get('roi_detection', False):
+                # Gerakan terlokalisasi: YOLO hanya di region gerakan yang digabung
+                job.detection_regions = motion_detector.get_motion_regions(
+                    padding=motion_config.get('roi_padding', 0.2),
+                    min_size=self.config['detection'].get('inference_size', 320),
+                    max_coverage=motion_config.get('roi_max_coverage', 0.6)
+                )
+        
+        if self.config['detection']['person_detection_enabled']:
+            await self._forward('detection', job)
+        else:
+            self.logger.debug("Person detection is disabled")
+    
+    async def _detection_stage(self, job: FrameJob):
+        """
+        Tahap deteksi orang
+        
+        Beberapa worker berjalan bersamaan agar frame dari kamera berbeda bisa
+        digabung dalam satu batch, tetapi frame satu kamera diproses berurutan:
+        tracker dan cooldown butuh timestamp yang selalu maju.
+        
+        Args:
+            job: FrameJob dari tahap motion
+        """
+        camera_id = job.camera.camera_id
+        lock = self.detection_locks.setdefault(camera_id, asyncio.Lock())
+        async with lock:
+            if job.timestamp < self.notification_times[camera_id]['detection']:
+                self.logger.debug(f"Frame deteksi [{job.camera.label}] lebih lama dari frame terakhir, dilewati")
+                return
+            await self._detect_persons(job)
+    
+    async def _detect_persons(self, job: FrameJob):
+        """
+        Deteksi orang satu job: YOLO, cek cooldown, ambil frame bukti dan crop orang
+        
+        Args:
+            job: FrameJob dari tahap motion
+        """
+        camera = job.camera
+        times = self.notification_times[camera.camera_id]
+        detection_config = self.camera_pool.get_detection_config(camera.camera_id)
+        min_confidence = detection_config['min_confidence']
+        
+        self.logger.debug("Starting person detection...")
+        times['detection'] = job.timestamp
+        if self.person_batcher:
+            detected_persons = await self.person_batcher.detect_persons(
+                self._inference_frame(job), regions=job.detection_regions or None, confidence_threshold=min_confidence
+            )
+        elif job.detection_regions:
+            detected_persons = await self.inference_executor.detect_persons_in_regions(
+                self._inference_frame(job), job.detection_regions, confidence_threshold=min_confidence
+            )
+        else:
+            detected_persons = await self.inference_executor.detect_persons(
+                self._inference_frame(job), confidence_threshold=min_confidence
+            )
+        self.logger.info(f"Person detection result: {len(detected_persons)} persons detected")
+        
+        tracker = self.person_trackers.get(camera.camera_id)
+        if tracker is not None:
+            # Alert sekali per track: orang yang masih terlihat bukan orang baru.
+            # Dengan ROI, track di luar region tidak dianggap hilang
+            tracks = tracker.update(detected_persons, job.timestamp, regions=job.detection_regions or None)
+            new_tracks = [track for track in tracks if track is not None and not track.alerted]
+            if not new_tracks:
+                # Wajah orang lama belum dikenali (belum terlihat atau unknown):
+                # coba lagi di frame ini tanpa alert baru, hanya jika tahap wajah
+                # kosong agar tidak mendorong keluar job alert dari antrian
+                max_attempts = detection_config.get('track_recognition_attempts', 3)
+                face_idle = self.pipeline_queues['face'].depth() == 0
+                if self.config['detection']['face_recognition_enabled'] and face_idle and any(
+                    track is not None and track.recognition is None and track.recognition_attempts < max_attempts
+                    for track in tracks
+                ):
+                    job.detected_persons = detected_persons
+                    job.tracks = tracks
+                    await self._forward('face', job)
+                return
+            
+            for track in new_tracks:
+                track.alerted = True
+            job.tracks = tracks
+            self.logger.info(
+                f"Terdeteksi {len(detected_persons)} orang, track baru: "
+                f"{', '.join(f'#{track.track_id}' for track in new_tracks)}"
+            )
+        else:
+            # Cek cooldown untuk mencegah spam notifikasi
+            person_cooldown = self.config.get('notification', {}).get('person_detection_cooldown', 30)
+            
+            if len(detected_persons) == 0 or job.timestamp - times['person'] < person_cooldown:
+                return
+            
+            self.logger.info(f"Terdeteksi {len(detected_persons)} orang")
+        
+        # Cooldown dihitung saat alert diputuskan agar frame berikutnya yang
+        # masih di antrian tidak menghasilkan alert duplikat
+        times['person'] = job.timestamp
+        
+        # Dual stream: ambil foto bukti dari main stream (di thread agar
+        # event loop tidak blocking) dan petakan bbox ke resolusi penuh
+        frame = job.frame
+        if camera.has_dual_stream():
+            evidence_frame = await asyncio.to_thread(camera.capture_main_frame)
+            if evidence_frame is not None and evidence_frame is not frame:
+                detected_persons = [
+                    camera.map_bbox_to_main(person, evidence_frame.shape)
+                    for person in detected_persons
+                ]
+                frame = evidence_frame
+        
+        # Gunakan person bbox untuk zoom (lebih akurat dari face detector)
+        person_bboxes = [(x, y, w, h) for x, y, w, h, conf in detected_persons]
+        
+        # Crop zoom dari person bbox
+        person_crops = []
+        for bbox in person_bboxes:
+            crop = self._crop_face_from_bbox(frame, bbox, padding=20)
+            if crop is not None:
+                person_crops.append((crop, bbox))
+        
+        if frame is not job.frame:
+            job.frame = frame
+            job.frame_ref = None  # Frame bukti main stream tidak ada di frame bus
+        job.detected_persons = detected_persons
+        job.person_crops = person_crops
+        job.alert = "person"
+        await self._forward('face', job)
+    
+    async def _face_stage(self, job: FrameJob):
+        """
+        Tahap pengenalan wajah dan update statistik sebelum notifikasi
+        
+        Args:
+            job: FrameJob dengan hasil deteksi orang
+        """
+        # Deteksi wajah hanya untuk recognition, zoom gunakan person bbox
+        if self.config['detection']['face_recognition_enabled']:
+            if self.config['detection'].get('face_detection_mode', 'frame') == 'person':
+                # Hanya di bagian atas bbox orang dari YOLO, bukan seluruh frame
+                faces = await self.inference_executor.detect_faces_in_persons(
+                    self._inference_frame(job), [(x, y, w, h) for x, y, w, h, _ in job.detected_persons]
+                )
+            else:
+                faces = await self.inference_executor.detect_faces(self._inference_frame(job))
+            
+            if job.tracks:
+                job.recognized_faces = await self._recognize_tracked_faces(job, faces)
+            elif len(faces) > 0:
+                # Semua wajah di frame di-encode dalam satu pass
+                job.recognized_faces = await self.inference_executor.recognize_faces_in_frame(
+                    self._inference_frame(job), faces
+                )
+        
+        # Percobaan ulang recognition track lama: hasil cukup di cache track
+        if job.alert is None:
+            return
+        
+        # Update statistik
+        if self.bot_handler.get_commands_instance():
+            stats = self.bot_handler.get_commands_instance().detection_stats
+            stats['total'] += len(job.detected_persons)
+            for face in job.recognized_faces:
+                if face['status'] == 'known':
+                    stats['known'] += 1
+                else:
+                    stats['unknown'] += 1
+        
+        await self._forward('notification', job)
+    
+    async def _recognize_tracked_faces(self, job: FrameJob, faces: list) -> list:
+        """
+        Face recognition dengan cache per track
+        
+        Wajah di dalam bbox orang yang track-nya sudah pernah dikenali memakai
+        hasil tersimpan, hanya wajah track lain yang di-encode dlib. Hanya hasil
+        "known" yang disimpan; "unknown" disimpan setelah
+        track_recognition_attempts siklus (termasuk siklus tanpa wajah terlihat).
+        
+        Args:
+            job: FrameJob dengan detected_persons dan tracks
+            faces: Bounding box wajah (x, y, w, h)
+        
+        Returns:
+            List hasil recognition per wajah
+        """
+        max_attempts = self.camera_pool.get_detection_config(job.camera.camera_id).get('track_recognition_attempts', 3)
+        for track in job.tracks:
+            if track is not None and track.recognition is None:
+                track.recognition_attempts += 1
+        
+        results = []
+        pending = []  # (box wajah, track pemilik atau None)
+        
+        for bbox in faces:
+            track = self._track_for_face(bbox, job.detected_persons, job.tracks)
+            if track is not None and track.recognition is not None:
+                results.append(track.recognition)
+            else:
+                pending.append((bbox, track))
+        
+        if pending:
+            recognized = await self.inference_executor.recognize_faces_in_frame(
+                self._inference_frame(job), [bbox for bbox, _ in pending]
+            )
+            for (_, track), result in zip(pending, recognized):
+                if track is not None and (result['status'] == 'known' or track.recognition_attempts >= max_attempts):
+                    track.recognition = result
+                    if result['status'] == 'known':
+                        self.logger.info(f"Track #{track.track_id} dikenali: {result['display_name']}")
+                results.append(result)
+        
+        self.logger.debug(f"Face recognition: {len(pending)} di-encode, {len(faces) - len(pending)} dari cache track")
+        return results
+    
+    @staticmethod
+    def _track_for_face(face_bbox, persons: list, tracks: list):
+        """
+        Mencari track orang yang memuat pusat wajah (bbox orang terkecil jika beberapa)
+        
+        Args:
+            face_bbox: Bounding box wajah (x, y, w, h)
+            persons: Deteksi orang [(x, y, w, h, confidence), ...]
+            tracks: Track per deteksi orang (urutan sama dengan persons)
+        
+        Returns:
+            Track atau None jika wajah di luar semua bbox orang
+        """
+        x, y, w, h = face_bbox
+        center_x, center_y = x + w / 2, y + h / 2
+        best_track, best_area = None, None
+        for (px, py, pw, ph, _), track in zip(persons, tracks):
+            if track is None or not (px <= center_x <= px + pw and py <= center_y <= py + ph):
+                continue
+            if best_area is None or pw * ph < best_area:
+                best_track, best_area = track, pw * ph
+        return best_track
+    
+    async def _notification_stage(self, job: FrameJob):
+        """
+        Tahap notifikasi: kirim alert ke Telegram
+        
+        Args:
+            job: FrameJob dengan alert "motion" atau "person"
+        """
+        if job.alert == "motion":
+            await self.bot_handler.send_motion_alert(job.frame, job.motion_percentage, camera=job.camera)
+        elif job.alert == "person":
+            self.logger.info("Sending detection alert to Telegram...")
+            await self.bot_handler.send_detection_alert(
+                job.frame,
+                job.detected_persons,
+                job.recognized_faces,
+                job.person_crops,  # Gunakan person crops untuk zoom
+                camera=job.camera
+            )
     
     async def run(self):
         """Jalankan aplikasi"""
@@ -434,7 +957,7 @@ class CCTVTelebotApp:
             await asyncio.gather(bot_task, detection_task)
             
             return True
-            
+        
         except Exception as e:
             self.logger.error(f"Error menjalankan aplikasi: {str(e)}")
             return False
@@ -449,9 +972,13 @@ class CCTVTelebotApp:
         if self.bot_handler:
             await self.bot_handler.stop_bot()
         
-        # Lepaskan kamera
-        if self.camera:
-            self.camera.release()
+        # Lepaskan semua kamera
+        if self.camera_pool:
+            self.camera_pool.close_all()
+        
+        # Hentikan worker inference
+        if self.inference_executor:
+            self.inference_executor.shutdown()
         
         self.logger.info("Aplikasi dihentikan")
     
@@ -472,7 +999,7 @@ async def main():
             sys.exit(0)
         else:
             sys.exit(1)
-            
+    
     except KeyboardInterrupt:
         await app.stop()
         sys.exit(0)
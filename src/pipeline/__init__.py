@@ -0,0 +1,3 @@
+"""
+Modul Pipeline - Tahapan pemrosesan frame yang dihubungkan antrian terbatas
+"""
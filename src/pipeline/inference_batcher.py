@@ -0,0 +1,171 @@
+"""
+Inference Batcher - Menggabungkan frame dari banyak kamera menjadi satu batch YOLO
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class _PendingFrame:
+    """Satu frame yang menunggu dimasukkan ke batch"""
+    
+    __slots__ = ('frame', 'regions', 'confidence_threshold', 'future', 'enqueued_at')
+    
+    def __init__(self, frame, regions, confidence_threshold, future):
+        self.frame = frame
+        self.regions = regions
+        self.confidence_threshold = confidence_threshold
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+
+class InferenceBatcher:
+    """
+    Mengumpulkan permintaan deteksi orang dari semua kamera selama maksimal
+    max_wait_ms atau sampai max_batch frame, lalu menjalankan satu forward pass
+    batch (PersonDetector.detect_persons_batch) di InferenceExecutor dan
+    mengembalikan hasil ke setiap pemanggil
+    
+    Batch lebih besar menaikkan throughput (overhead per panggilan dan SIMD
+    lebih efisien), tetapi setiap frame bisa tertahan hingga max_wait_ms
+    sebelum inference; stats() dipakai untuk menyeimbangkan keduanya.
+    """
+    
+    def __init__(self, executor, max_batch: int = 4, max_wait_ms: float = 20.0,
+                 model_name: str = 'person_detector'):
+        """
+        Inisialisasi Inference Batcher
+        
+        Args:
+            executor: InferenceExecutor yang menjalankan batch
+            max_batch: Jumlah frame maksimal per batch
+            max_wait_ms: Waktu tunggu maksimal frame pertama sebelum batch dikirim
+            model_name: Nama model PersonDetector di executor
+        """
+        self.executor = executor
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.model_name = model_name
+        self.logger = logging.getLogger(__name__)
+        
+        self._pending: List[_PendingFrame] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+        
+        # Metrik
+        self.batches = 0
+        self.frames = 0
+        self.flush_full = 0
+        self.flush_timeout = 0
+        self.batch_sizes: Dict[int, int] = {}
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.inference_seconds = 0.0
+        self.latency_seconds = 0.0
+        
+        self.logger.info(f"Inference batcher: max_batch={self.max_batch}, max_wait={max_wait_ms:.0f}ms")
+    
+    async def detect_persons(self, frame, regions: Optional[List[Tuple[int, int, int, int]]] = None,
+                             confidence_threshold: Optional[float] = None):
+        """
+        Masukkan frame ke batch berikutnya dan tunggu hasilnya
+        
+        Args:
+            frame: Frame dari kamera
+            regions: Region deteksi (None = frame penuh)
+            confidence_threshold: Threshold confidence frame ini
+        
+        Returns:
+            List koordinat dan confidence orang [(x, y, w, h, confidence), ...]
+        """
+        loop = asyncio.get_running_loop()
+        pending = _PendingFrame(frame, regions, confidence_threshold, loop.create_future())
+        self._pending.append(pending)
+        
+        if len(self._pending) >= self.max_batch:
+            self.flush_full += 1
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._on_timeout)
+        
+        return await pending.future
+    
+    def _on_timeout(self):
+        """Batas waktu tunggu habis: kirim batch walaupun belum penuh"""
+        self._timer = None
+        if self._pending:
+            self.flush_timeout += 1
+            self._flush()
+    
+    def _flush(self):
+        """Kirim semua frame yang menunggu sebagai satu batch"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        
+        batch, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _run_batch(self, batch: List[_PendingFrame]):
+        """
+        Jalankan satu batch di executor dan kembalikan hasil ke setiap pemanggil
+        
+        Args:
+            batch: Frame yang menunggu
+        """
+        start = time.perf_counter()
+        
+        try:
+            results = await self.executor.call(
+                self.model_name, 'detect_persons_batch',
+                [pending.frame for pending in batch],
+                regions=[pending.regions for pending in batch],
+                confidence_thresholds=[pending.confidence_threshold for pending in batch]
+            )
+        except Exception as e:
+            self.logger.error(f"Error menjalankan batch deteksi ({len(batch)} frame): {str(e)}")
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+            return
+        
+        end = time.perf_counter()
+        self.batches += 1
+        self.frames += len(batch)
+        self.batch_sizes[len(batch)] = self.batch_sizes.get(len(batch), 0) + 1
+        self.inference_seconds += end - start
+        
+        for pending, result in zip(batch, results):
+            wait = start - pending.enqueued_at
+            self.wait_seconds += wait
+            self.max_wait_seconds = max(self.max_wait_seconds, wait)
+            self.latency_seconds += end - pending.enqueued_at
+            if not pending.future.done():
+                pending.future.set_result(result)
+    
+    def stats(self) -> dict:
+        """
+        Statistik batching untuk tuning throughput vs delay alert
+        
+        Returns:
+            Dictionary batches, frames, avg_batch_size, batch_sizes (histogram),
+            flush_full, flush_timeout, avg_wait_ms, max_wait_ms, avg_inference_ms
+            (per batch) dan avg_latency_ms (antri sampai hasil, per frame)
+        """
+        return {
+            'batches': self.batches,
+            'frames': self.frames,
+            'pending': len(self._pending),
+            'avg_batch_size': self.frames / self.batches if self.batches else 0.0,
+            'batch_sizes': dict(sorted(self.batch_sizes.items())),
+            'flush_full': self.flush_full,
+            'flush_timeout': self.flush_timeout,
+            'avg_wait_ms': self.wait_seconds * 1000 / self.frames if self.frames else 0.0,
+            'max_wait_ms': self.max_wait_seconds * 1000,
+            'avg_inference_ms': self.inference_seconds * 1000 / self.batches if self.batches else 0.0,
+            'avg_latency_ms': self.latency_seconds * 1000 / self.frames if self.frames else 0.0
+        }
@@ -0,0 +1,313 @@
+"""
+Inference Executor - Menjalankan inference CPU-bound di luar event loop asyncio
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from camera.frame_bus import FrameRef, StaleFrameError, check_frame_ref, resolve_frame_ref
+
+
+# Model milik proses worker (mode process), dibuat sekali oleh initializer
+_worker_models: Dict[str, Any] = {}
+_worker_encoding_mtime: Dict[str, float] = {}
+
+
+def _init_worker(model_specs: Dict[str, Tuple[type, dict]]):
+    """
+    Initializer proses worker: buat semua model sekali per proses
+    
+    Args:
+        model_specs: {nama_model: (kelas, kwargs konstruktor)}
+    """
+    for name, (model_class, kwargs) in model_specs.items():
+        _worker_models[name] = model_class(**kwargs)
+
+
+def _refresh_encodings(name: str, model: Any):
+    """
+    Muat ulang encoding wajah di worker jika file encoding berubah
+    
+    Wajah ditambah/dihapus lewat bot di proses utama; worker hanya melihat
+    perubahan lewat file encoding yang disimpan.
+    
+    Args:
+        name: Nama model
+        model: Instance FaceRecognition di worker
+    """
+    try:
+        mtime = os.path.getmtime(model.encoding_file)
+    except OSError:
+        return
+    if _worker_encoding_mtime.get(name) != mtime:
+        if name in _worker_encoding_mtime:
+            model.load_encodings()
+        _worker_encoding_mtime[name] = mtime
+
+
+def _map_frames(value: Any, convert) -> Any:
+    """
+    Terapkan convert ke setiap FrameRef di argumen (langsung atau di list batch)
+    
+    Args:
+        value: Argumen method
+        convert: Fungsi FrameRef -> ndarray
+    
+    Returns:
+        Argumen dengan FrameRef diganti
+    """
+    if isinstance(value, FrameRef):
+        return convert(value)
+    if isinstance(value, list) and any(isinstance(item, FrameRef) for item in value):
+        return [convert(item) if isinstance(item, FrameRef) else item for item in value]
+    return value
+
+
+def _worker_call(name: str, method: str, args: tuple, kwargs: dict) -> Any:
+    """
+    Panggil method model di proses worker
+    
+    Frame yang dikirim sebagai FrameRef dibaca langsung dari frame bus shared
+    memory (view tanpa copy), lalu dicek ulang setelah inference agar hasil
+    dari slot yang tertimpa di tengah jalan tidak dipakai.
+    
+    Args:
+        name: Nama model
+        method: Nama method
+        args: Argumen posisi
+        kwargs: Argumen keyword
+    
+    Returns:
+        Hasil method (harus bisa di-pickle)
+    
+    Raises:
+        StaleFrameError: Slot frame bus sudah ditimpa
+    """
+    model = _worker_models[name]
+    if hasattr(model, 'encoding_file') and hasattr(model, 'load_encodings'):
+        _refresh_encodings(name, model)
+    
+    refs: List[FrameRef] = []
+    
+    def resolve(ref: FrameRef):
+        refs.append(ref)
+        return resolve_frame_ref(ref)
+    
+    args = tuple(_map_frames(arg, resolve) for arg in args)
+    kwargs = {key: _map_frames(value, resolve) for key, value in kwargs.items()}
+    result = getattr(model, method)(*args, **kwargs)
+    for ref in refs:
+        check_frame_ref(ref)
+    return result
+
+
+def _local_frame(ref: FrameRef):
+    """ndarray asli FrameRef di proses pembuat (fallback saat slot tertimpa)"""
+    if ref.frame is None:
+        raise StaleFrameError(f"Frame {ref} tertimpa dan tidak ada salinan lokal")
+    return ref.frame
+
+
+class InferenceExecutor:
+    """
+    Menjalankan method model (YOLO, Haar, dlib) di thread pool atau process pool
+    dan mengembalikan hasilnya sebagai awaitable
+    
+    Mode "thread" memakai instance model yang sama dengan proses utama; setiap
+    model dikunci agar hanya dipakai satu thread sekaligus (predictor YOLO tidak
+    thread-safe), tetapi model berbeda bisa berjalan paralel karena OpenCV, torch
+    dan dlib melepas GIL. Mode "process" membuat salinan model di setiap proses
+    worker, cocok jika inference masih tertahan GIL. Frame yang diberikan sebagai
+    FrameRef (frame bus kamera) dibaca worker langsung dari shared memory; frame
+    ndarray biasa di-pickle ke worker setiap panggilan.
+    """
+    
+    MODE_THREAD = "thread"
+    MODE_PROCESS = "process"
+    
+    def __init__(self, model_specs: Dict[str, Tuple[type, dict]], mode: str = "thread",
+                 workers: int = 1, models: Optional[Dict[str, Any]] = None):
+        """
+        Inisialisasi Inference Executor
+        
+        Args:
+            model_specs: {nama_model: (kelas, kwargs konstruktor)} untuk membuat
+                model di proses worker (mode process) atau jika models tidak diberikan
+            mode: "thread" atau "process" (default: "thread")
+            workers: Jumlah inference yang boleh berjalan bersamaan
+            models: Instance model yang sudah dibuat di proses utama; dipakai
+                inference mode thread dan call_main() di kedua mode
+        """
+        if mode not in (self.MODE_THREAD, self.MODE_PROCESS):
+            raise ValueError(f"Mode inference executor tidak dikenal: {mode}")
+        
+        self.mode = mode
+        self.workers = max(1, workers)
+        self.logger = logging.getLogger(__name__)
+        
+        self.executor: Executor
+        self.models: Dict[str, Any] = {}
+        self._model_locks: Dict[str, threading.Lock] = {}
+        
+        models = dict(models or {})
+        if mode == self.MODE_THREAD:
+            for name, (model_class, kwargs) in model_specs.items():
+                if name not in models:
+                    models[name] = model_class(**kwargs)
+        self.models = models
+        self._model_locks = {name: threading.Lock() for name in models}
+        
+        if mode == self.MODE_THREAD:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+        else:
+            # spawn: fork setelah torch/OpenCV membuat thread pool bisa deadlock
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(model_specs,)
+            )
+        
+        # Dibuat saat pertama dipakai agar terikat ke event loop yang berjalan
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.completed = 0
+        self.busy_seconds = 0.0
+        self.stale_frames = 0  # Panggilan diulang dengan ndarray karena slot frame bus tertimpa
+        
+        self.logger.info(f"Inference executor: mode={mode}, workers={self.workers}")
+    
+    def _call_local(self, name: str, method: str, args: tuple, kwargs: dict) -> Any:
+        """
+        Panggil method model di thread pool dengan kunci per model
+        
+        Args:
+            name: Nama model
+            method: Nama method
+            args: Argumen posisi
+            kwargs: Argumen keyword
+        
+        Returns:
+            Hasil method
+        """
+        with self._model_locks[name]:
+            return getattr(self.models[name], method)(*args, **kwargs)
+    
+    async def call(self, name: str, method: str, *args, **kwargs) -> Any:
+        """
+        Jalankan method model di executor tanpa memblokir event loop
+        
+        Args:
+            name: Nama model (key model_specs)
+            method: Nama method model
+            *args: Argumen posisi
+            **kwargs: Argumen keyword
+        
+        Returns:
+            Hasil method
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.workers)
+        
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            self.in_flight += 1
+            start = time.perf_counter()
+            try:
+                if self.mode == self.MODE_THREAD:
+                    # Instance model di proses ini: FrameRef cukup diganti ndarray aslinya
+                    args = tuple(_map_frames(arg, _local_frame) for arg in args)
+                    kwargs = {key: _map_frames(value, _local_frame) for key, value in kwargs.items()}
+                    func = functools.partial(self._call_local, name, method, args, kwargs)
+                    return await loop.run_in_executor(self.executor, func)
+                
+                func = functools.partial(_worker_call, name, method, args, kwargs)
+                try:
+                    return await loop.run_in_executor(self.executor, func)
+                except StaleFrameError as e:
+                    # Ring buffer lebih pendek dari latency pipeline: kirim ndarray (pickle)
+                    self.stale_frames += 1
+                    self.logger.debug(f"{str(e)}, diulang dengan frame lokal")
+                    args = tuple(_map_frames(arg, _local_frame) for arg in args)
+                    kwargs = {key: _map_frames(value, _local_frame) for key, value in kwargs.items()}
+                    func = functools.partial(_worker_call, name, method, args, kwargs)
+                    return await loop.run_in_executor(self.executor, func)
+            finally:
+                self.in_flight -= 1
+                self.completed += 1
+                self.busy_seconds += time.perf_counter() - start
+    
+    async def call_main(self, name: str, method: str, *args, **kwargs) -> Any:
+        """
+        Jalankan method instance model proses utama di thread terpisah
+        
+        Untuk operasi di luar pipeline (misalnya perintah bot yang mengubah
+        database wajah): kunci model sama dengan inference mode thread, jadi
+        tidak berjalan bersamaan dengan recognition pada instance yang sama,
+        dan event loop tidak terblokir.
+        
+        Args:
+            name: Nama model (key models)
+            method: Nama method model
+            *args: Argumen posisi
+            **kwargs: Argumen keyword
+        
+        Returns:
+            Hasil method
+        """
+        return await asyncio.to_thread(self._call_local, name, method, args, kwargs)
+    
+    async def detect_persons(self, frame, **kwargs):
+        """Awaitable PersonDetector.detect_persons"""
+        return await self.call('person_detector', 'detect_persons', frame, **kwargs)
+    
+    async def detect_persons_in_regions(self, frame, regions, **kwargs):
+        """Awaitable PersonDetector.detect_persons_in_regions"""
+        return await self.call('person_detector', 'detect_persons_in_regions', frame, regions, **kwargs)
+    
+    async def detect_persons_batch(self, frames, **kwargs):
+        """Awaitable PersonDetector.detect_persons_batch"""
+        return await self.call('person_detector', 'detect_persons_batch', frames, **kwargs)
+    
+    async def detect_faces(self, frame):
+        """Awaitable FaceDetector.detect_faces"""
+        return await self.call('face_detector', 'detect_faces', frame)
+    
+    async def detect_faces_in_persons(self, frame, persons, **kwargs):
+        """Awaitable FaceDetector.detect_faces_in_persons"""
+        return await self.call('face_detector', 'detect_faces_in_persons', frame, persons, **kwargs)
+    
+    async def recognize_faces(self, faces, **kwargs):
+        """Awaitable FaceRecognition.recognize_faces"""
+        return await self.call('face_recognition', 'recognize_faces', faces, **kwargs)
+    
+    async def recognize_faces_in_frame(self, frame, face_boxes):
+        """Awaitable FaceRecognition.recognize_faces_in_frame"""
+        return await self.call('face_recognition', 'recognize_faces_in_frame', frame, face_boxes)
+    
+    def stats(self) -> dict:
+        """
+        Statistik executor
+        
+        Returns:
+            Dictionary mode, workers, in_flight, completed, avg_ms, stale_frames
+        """
+        return {
+            'mode': self.mode,
+            'workers': self.workers,
+            'in_flight': self.in_flight,
+            'completed': self.completed,
+            'avg_ms': self.busy_seconds * 1000 / self.completed if self.completed else 0.0,
+            'stale_frames': self.stale_frames
+        }
+    
+    def shutdown(self):
+        """Hentikan executor (inference yang sedang berjalan diselesaikan dulu)"""
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,211 @@
+"""
+Stage Queue - Antrian terbatas antar tahap pipeline dengan kebijakan overflow
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Optional, Tuple
+
+
+class DropPolicy:
+    """Kebijakan saat antrian penuh"""
+    DROP_OLDEST = "drop_oldest"   # Buang item tertua, item baru selalu masuk (data paling segar)
+    DROP_NEWEST = "drop_newest"   # Tolak item baru, antrian tidak berubah
+    BLOCK = "block"               # Producer menunggu sampai ada tempat (backpressure)
+    
+    ALL = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+
+class FrameJob:
+    """Data satu frame yang mengalir antar tahap pipeline"""
+    
+    def __init__(self, camera, frame, timestamp: float, sequence: int = 0):
+        """
+        Inisialisasi Frame Job
+        
+        Args:
+            camera: FrameSource asal frame
+            frame: Frame (numpy array)
+            timestamp: Waktu frame menurut clock() sumber
+            sequence: Nomor urut frame per kamera
+        """
+        self.camera = camera
+        self.frame = frame
+        self.timestamp = timestamp
+        self.sequence = sequence
+        self.created_at = time.time()
+        self.frame_ref = None  # FrameRef frame bus untuk frame ini (jika ada), lihat camera.frame_bus
+        
+        # Diisi oleh tahap-tahap berikutnya
+        self.has_motion = False
+        self.motion_percentage = 0.0
+        self.motion_zones = []  # Zona armed yang ada gerakan
+        self.detection_regions = []  # Region ROI untuk YOLO, kosong = frame penuh
+        self.detected_persons = []
+        self.tracks = []  # Track per orang di detected_persons (jika tracking aktif)
+        self.person_crops = []
+        self.recognized_faces = []
+        self.alert = None  # "motion" atau "person" untuk tahap notifikasi
+
+
+class StageQueue:
+    """
+    Antrian asyncio terbatas dengan kebijakan overflow dan statistik
+    
+    Dengan key (misalnya ID kamera) setiap key punya jalur sendiri berkapasitas
+    maxsize dan get() mengambil dari jalur secara round-robin, sehingga kamera
+    yang sibuk hanya membuang frame miliknya sendiri dan tidak menunda kamera lain.
+    """
+    
+    def __init__(self, name: str, maxsize: int = 2, policy: str = DropPolicy.DROP_OLDEST,
+                 key: Optional[Callable[[Any], Hashable]] = None):
+        """
+        Inisialisasi Stage Queue
+        
+        Args:
+            name: Nama antrian untuk log dan statistik
+            maxsize: Kapasitas maksimal per jalur (minimal 1)
+            policy: Kebijakan overflow (lihat DropPolicy)
+            key: Fungsi item -> key jalur (None = satu jalur bersama)
+        """
+        if policy not in DropPolicy.ALL:
+            raise ValueError(f"Kebijakan antrian tidak dikenal: {policy}")
+        
+        self.name = name
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.key = key
+        self._lanes: Dict[Hashable, Deque[Any]] = {}
+        self._ready: Deque[Hashable] = deque()  # Key jalur yang berisi item, urutan round-robin
+        self._changed = asyncio.Condition()
+        self._unfinished = 0
+        self._finished = asyncio.Event()
+        self._finished.set()
+        self.enqueued = 0
+        self.dropped = 0
+        self.processed = 0
+        self.logger = logging.getLogger(__name__)
+    
+    def _lane(self, item: Any) -> Tuple[Hashable, Deque[Any]]:
+        """Key dan jalur untuk item"""
+        lane_key = self.key(item) if self.key is not None else None
+        lane = self._lanes.get(lane_key)
+        if lane is None:
+            lane = self._lanes[lane_key] = deque()
+        return lane_key, lane
+    
+    async def put(self, item: Any, block: Optional[bool] = None) -> bool:
+        """
+        Memasukkan item sesuai kebijakan overflow
+        
+        Args:
+            item: Item yang dimasukkan
+            block: Paksa menunggu saat penuh (misalnya sumber replay yang tidak
+                boleh kehilangan frame); None = ikuti kebijakan antrian
+        
+        Returns:
+            True jika item masuk antrian, False jika dibuang
+        """
+        lane_key, lane = self._lane(item)
+        
+        async with self._changed:
+            if block or (block is None and self.policy == DropPolicy.BLOCK):
+                await self._changed.wait_for(lambda: len(lane) < self.maxsize)
+            elif len(lane) >= self.maxsize:
+                if self.policy == DropPolicy.DROP_NEWEST:
+                    self.dropped += 1
+                    self.logger.debug(f"Antrian {self.name} [{lane_key}] penuh, item baru dibuang")
+                    return False
+                
+                # DROP_OLDEST: buang item tertua jalur ini agar item terbaru masuk
+                lane.popleft()
+                self.task_done(processed=False)
+                self.dropped += 1
+                self.logger.debug(f"Antrian {self.name} [{lane_key}] penuh, item tertua dibuang")
+            
+            if not lane:
+                self._ready.append(lane_key)
+            lane.append(item)
+            self._unfinished += 1
+            self._finished.clear()
+            self.enqueued += 1
+            self._changed.notify_all()
+        return True
+    
+    async def get(self) -> Any:
+        """Mengambil item berikutnya secara round-robin antar jalur (menunggu jika kosong)"""
+        async with self._changed:
+            await self._changed.wait_for(lambda: bool(self._ready))
+            lane_key = self._ready.popleft()
+            lane = self._lanes[lane_key]
+            item = lane.popleft()
+            if lane:
+                self._ready.append(lane_key)
+            self._changed.notify_all()
+        return item
+    
+    def task_done(self, processed: bool = True):
+        """
+        Tandai item selesai diproses
+        
+        Args:
+            processed: False untuk item yang dibuang sebelum diproses
+        """
+        if processed:
+            self.processed += 1
+        self._unfinished -= 1
+        if self._unfinished <= 0:
+            self._unfinished = 0
+            self._finished.set()
+    
+    async def join(self):
+        """Tunggu sampai semua item selesai diproses"""
+        await self._finished.wait()
+    
+    def depth(self) -> int:
+        """Jumlah item yang sedang menunggu (semua jalur)"""
+        return sum(len(lane) for lane in self._lanes.values())
+    
+    def stats(self) -> dict:
+        """
+        Statistik antrian
+        
+        Returns:
+            Dictionary depth, maxsize (per jalur), lanes, policy, enqueued, dropped, processed
+        """
+        return {
+            'depth': self.depth(),
+            'maxsize': self.maxsize,
+            'lanes': len(self._lanes),
+            'policy': self.policy,
+            'enqueued': self.enqueued,
+            'dropped': self.dropped,
+            'processed': self.processed
+        }
+
+
+async def run_stage(queue: StageQueue, handler: Callable[[Any], Awaitable[None]]):
+    """
+    Worker satu tahap pipeline: ambil item dari antrian dan proses satu per satu
+    
+    Berjalan sampai task di-cancel. Error pada satu item dicatat dan tidak
+    menghentikan tahap.
+    
+    Args:
+        queue: Antrian input tahap
+        handler: Coroutine function yang memproses satu item
+    """
+    logger = logging.getLogger(__name__)
+    
+    while True:
+        item = await queue.get()
+        try:
+            await handler(item)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error di tahap {queue.name}: {str(e)}", exc_info=True)
+        finally:
+            queue.task_done()
@@ -8,6 +8,7 @@ import hashlib
 import time
 from telegram import Bot
 from telegram.ext import Application, ContextTypes
+from camera.camera_manager import CameraState
 from .commands import BotCommands
 from .messages import Messages
 
@@ -36,23 +37,28 @@ class BotHandler:
     """Kelas untuk mengelola Telegram Bot"""
     
     def __init__(self, bot_token: str, camera_manager, face_detector, 
-                 person_detector, face_recognition, config):
+                 person_detector, face_recognition, config, camera_pool=None,
+                 inference_executor=None):
         """
         Inisialisasi Bot Handler
         
         Args:
             bot_token: Token Telegram Bot
-            camera_manager: Instance CameraManager
+            camera_manager: Instance CameraManager (kamera utama)
             face_detector: Instance FaceDetector
             person_detector: Instance PersonDetector
             face_recognition: Instance FaceRecognition
             config: Konfigurasi sistem
+            camera_pool: Instance CameraPool untuk multi-kamera (opsional)
+            inference_executor: InferenceExecutor pemilik kunci model (opsional)
         """
         self.bot_token = bot_token
         self.camera = camera_manager
+        self.camera_pool = camera_pool
         self.face_detector = face_detector
         self.person_detector = person_detector
         self.face_recognition = face_recognition
+        self.inference_executor = inference_executor
         self.config = config
         self.logger = logging.getLogger(__name__)
         self.messages = Messages()
@@ -69,7 +75,11 @@ class BotHandler:
         self.frame_hashes = {}  # {hash: timestamp}
         self.duplicate_threshold = config.get('notification', {}).get('duplicate_threshold_seconds', 5)
         
-    async def send_detection_alert(self, frame, detected_persons, recognized_faces, face_crops=None):
+        # Event loop tempat alert kamera dikirim (diisi saat start_bot)
+        self.loop = None
+        
+    async def send_detection_alert(self, frame, detected_persons, recognized_faces, face_crops=None,
+                                   camera=None):
         """
         Kirim notifikasi deteksi ke Telegram dengan zoom wajah
         
@@ -78,6 +88,7 @@ class BotHandler:
             detected_persons: List orang yang terdeteksi (dari YOLOv8)
             recognized_faces: List wajah yang dikenali
             face_crops: List wajah yang di-crop untuk zoom (opsional)
+            camera: CameraManager sumber frame (default: kamera utama)
         """
         try:
             if not self.chat_id:
@@ -125,7 +136,9 @@ class BotHandler:
                 ])
                 face_info = self.messages.FACE_DETECTED_INFO.format(face_list=face_list)
             
+            camera = camera or self.camera
             message = self.messages.DETECTION_ALERT.format(
+                camera=camera.label,
                 timestamp=current_time_formatted,
                 person_count=person_count,
                 face_info=face_info
@@ -192,8 +205,13 @@ class BotHandler:
         except Exception as e:
             self.logger.error(f"Error kirim notifikasi deteksi: {str(e)}", exc_info=True)
     
-    async def send_camera_disconnected_alert(self):
-        """Kirim notifikasi kamera terputus"""
+    async def send_camera_disconnected_alert(self, camera=None):
+        """
+        Kirim notifikasi kamera terputus
+        
+        Args:
+            camera: CameraManager yang terputus (default: kamera utama)
+        """
         try:
             if not self.chat_id:
                 return
@@ -201,8 +219,9 @@ class BotHandler:
             from datetime import datetime
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
+            camera = camera or self.camera
             message = self.messages.CAMERA_DISCONNECTED.format(
-                ip=self.camera.ip,
+                ip=camera.label,
                 timestamp=timestamp
             )
             
@@ -215,8 +234,13 @@ class BotHandler:
         except Exception as e:
             self.logger.error(f"Error kirim notifikasi kamera terputus: {str(e)}")
     
-    async def send_camera_reconnected_alert(self):
-        """Kirim notifikasi kamera terhubung kembali"""
+    async def send_camera_reconnected_alert(self, camera=None):
+        """
+        Kirim notifikasi kamera terhubung kembali
+        
+        Args:
+            camera: CameraManager yang terhubung kembali (default: kamera utama)
+        """
         try:
             if not self.chat_id:
                 return
@@ -224,8 +248,9 @@ class BotHandler:
             from datetime import datetime
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
+            camera = camera or self.camera
             message = self.messages.CAMERA_RECONNECTED.format(
-                ip=self.camera.ip,
+                ip=camera.label,
                 timestamp=timestamp
             )
             
@@ -238,6 +263,30 @@ class BotHandler:
         except Exception as e:
             self.logger.error(f"Error kirim notifikasi kamera reconnect: {str(e)}")
     
+    def watch_camera_state(self, loop: asyncio.AbstractEventLoop):
+        """
+        Daftarkan listener perubahan state kamera untuk alert putus/sambung
+        
+        Listener dipanggil dari thread kamera, jadi alert dijadwalkan ke event loop
+        dengan run_coroutine_threadsafe.
+        
+        Args:
+            loop: Event loop tempat bot berjalan
+        """
+        self.loop = loop
+        
+        def make_listener(camera):
+            def on_state_change(old_state, new_state):
+                if old_state == CameraState.CONNECTED and new_state != CameraState.DISCONNECTED:
+                    asyncio.run_coroutine_threadsafe(self.send_camera_disconnected_alert(camera), self.loop)
+                elif new_state == CameraState.CONNECTED and old_state != CameraState.DISCONNECTED:
+                    asyncio.run_coroutine_threadsafe(self.send_camera_reconnected_alert(camera), self.loop)
+            return on_state_change
+        
+        cameras = list(self.camera_pool) if self.camera_pool is not None else [self.camera]
+        for camera in cameras:
+            camera.add_state_listener(make_listener(camera))
+    
     async def send_system_started(self):
         """Kirim notifikasi sistem dimulai"""
         try:
@@ -247,8 +296,9 @@ class BotHandler:
             from datetime import datetime
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
+            cameras = list(self.camera_pool) if self.camera_pool is not None else [self.camera]
             message = self.messages.SYSTEM_STARTED.format(
-                ip=self.camera.ip,
+                ip=", ".join(camera.label for camera in cameras),
                 timestamp=timestamp
             )
             
@@ -282,7 +332,9 @@ class BotHandler:
                 self.face_detector,
                 self.person_detector,
                 self.face_recognition,
-                self.config
+                self.config,
+                camera_pool=self.camera_pool,
+                inference_executor=self.inference_executor
             )
             
             # Add handlers
@@ -304,6 +356,9 @@ class BotHandler:
             await self.application.start()
             await self.application.updater.start_polling()
             
+            # Alert kamera putus/sambung dikirim saat state kamera berubah
+            self.watch_camera_state(asyncio.get_running_loop())
+            
             # Kirim notifikasi sistem dimulai
             await self.send_system_started()
             
@@ -342,13 +397,14 @@ class BotHandler:
         """Cek apakah bot sudah diinisialisasi"""
         return self.application is not None
     
-    async def send_motion_alert(self, frame, motion_percentage):
+    async def send_motion_alert(self, frame, motion_percentage, camera=None):
         """
         Kirim notifikasi deteksi gerakan ke Telegram
         
         Args:
             frame: Frame dari kamera
             motion_percentage: Persentase frame yang berubah
+            camera: CameraManager sumber frame (default: kamera utama)
         """
         try:
             if not self.chat_id:
@@ -385,10 +441,11 @@ class BotHandler:
             temp_path = f"/tmp/motion_{timestamp}.jpg"
             cv2.imwrite(temp_path, frame)
             
+            camera = camera or self.camera
             message = f"📹 *MOTION DETECTED*\n\n" \
                      f"📅 Waktu: {current_time_formatted}\n" \
                      f"📊 Perubahan: {motion_percentage:.2f}%\n" \
-                     f"📍 Kamera: {self.camera.ip}\n\n" \
+                     f"📍 Kamera: {camera.label}\n\n" \
                      f"Aktivitas terdeteksi dalam frame kamera."
             
             await self.application.bot.send_photo(
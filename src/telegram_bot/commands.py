@@ -2,6 +2,7 @@
 Commands - Handler untuk semua perintah Telegram Bot
 """
 
+import asyncio
 import logging
 import cv2
 import numpy as np
@@ -15,21 +16,26 @@ from .messages import Messages
 class BotCommands:
     """Kelas untuk menangani semua perintah Telegram bot"""
     
-    def __init__(self, camera_manager, face_detector, person_detector, face_recognition, config):
+    def __init__(self, camera_manager, face_detector, person_detector, face_recognition, config,
+                 camera_pool=None, inference_executor=None):
         """
         Inisialisasi Bot Commands
         
         Args:
-            camera_manager: Instance CameraManager
+            camera_manager: Instance CameraManager (kamera utama)
             face_detector: Instance FaceDetector
             person_detector: Instance PersonDetector
             face_recognition: Instance FaceRecognition
             config: Konfigurasi sistem
+            camera_pool: Instance CameraPool untuk multi-kamera (opsional)
+            inference_executor: InferenceExecutor pemilik kunci model (opsional)
         """
         self.camera = camera_manager
+        self.camera_pool = camera_pool
         self.face_detector = face_detector
         self.person_detector = person_detector
         self.face_recognition = face_recognition
+        self.inference_executor = inference_executor
         self.config = config
         self.logger = logging.getLogger(__name__)
         self.messages = Messages()
@@ -45,6 +51,27 @@ class BotCommands:
             'confidences': []
         }
     
+    async def _call_model(self, name: str, method: str, *args, **kwargs):
+        """
+        Jalankan method face_detector/face_recognition di thread terpisah
+        
+        Memakai kunci model InferenceExecutor agar perubahan database wajah tidak
+        berjalan bersamaan dengan recognition di pipeline, dan encode dlib tidak
+        memblokir event loop.
+        
+        Args:
+            name: "face_detector" atau "face_recognition"
+            method: Nama method
+            *args: Argumen posisi
+            **kwargs: Argumen keyword
+        
+        Returns:
+            Hasil method
+        """
+        if self.inference_executor is not None:
+            return await self.inference_executor.call_main(name, method, *args, **kwargs)
+        return await asyncio.to_thread(getattr(getattr(self, name), method), *args, **kwargs)
+    
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handler untuk perintah /start"""
         await update.message.reply_text(
@@ -154,7 +181,7 @@ class BotCommands:
                 return
             
             # Deteksi wajah
-            faces = self.face_detector.detect_and_crop_faces(image)
+            faces = await self._call_model('face_detector', 'detect_and_crop_faces', image, relative=True)
             
             if len(faces) == 0:
                 await update.message.reply_text(
@@ -169,10 +196,12 @@ class BotCommands:
                 return
             
             # Ambil wajah pertama
-            face_image, _ = faces[0]
+            face_image, face_location = faces[0]
             
             # Tambah ke database
-            success = self.face_recognition.add_face(self.adding_face_name, face_image)
+            success = await self._call_model(
+                'face_recognition', 'add_face', self.adding_face_name, face_image, face_location=face_location
+            )
             
             if success:
                 timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -196,7 +225,7 @@ class BotCommands:
     async def listfaces_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handler untuk perintah /listfaces"""
         try:
-            names = self.face_recognition.get_all_names()
+            names = await self._call_model('face_recognition', 'get_all_names')
             
             if len(names) == 0:
                 await update.message.reply_text(self.messages.NO_FACES)
@@ -223,7 +252,7 @@ class BotCommands:
             
             name = ' '.join(context.args)
             
-            success = self.face_recognition.remove_face(name)
+            success = await self._call_model('face_recognition', 'remove_face', name)
             
             if success:
                 timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -241,10 +270,21 @@ class BotCommands:
             await update.message.reply_text(f"Error: {str(e)}")
     
     async def screenshot_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handler untuk perintah /screenshot"""
+        """Handler untuk perintah /screenshot [id_kamera]"""
         try:
-            # Ambil foto dari kamera
-            frame = self.camera.capture_photo()
+            # Pilih kamera (default: kamera utama)
+            camera = self.camera
+            if context.args and self.camera_pool is not None:
+                camera = self.camera_pool.get(context.args[0])
+                if camera is None:
+                    await update.message.reply_text(
+                        f"❌ Kamera '{context.args[0]}' tidak ditemukan. "
+                        f"ID tersedia: {', '.join(self.camera_pool.ids())}"
+                    )
+                    return
+            
+            # Ambil foto dari kamera (di thread karena main stream dibuka sesaat)
+            frame = await asyncio.to_thread(camera.capture_photo)
             
             if frame is None:
                 await update.message.reply_text(
@@ -377,7 +417,7 @@ class BotCommands:
                 return
             
             # Deteksi wajah
-            faces = self.face_detector.detect_and_crop_faces(image)
+            faces = await self._call_model('face_detector', 'detect_and_crop_faces', image, relative=True)
             
             if len(faces) == 0:
                 await update.message.reply_text(
@@ -390,10 +430,12 @@ class BotCommands:
                 return
             
             # Ambil wajah pertama
-            face_image, _ = faces[0]
+            face_image, face_location = faces[0]
             
             # Tambah ke database
-            success = self.face_recognition.add_face(name, face_image)
+            success = await self._call_model(
+                'face_recognition', 'add_face', name, face_image, face_location=face_location
+            )
             
             if success:
                 # Hitung confidence (simulasi)
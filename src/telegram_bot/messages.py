@@ -323,6 +323,7 @@ Gunakan /addface [nama] untuk menambahkan wajah baru.
 🚨 **Deteksi Orang!**
 
 📸 Foto terlampir
+📍 Kamera: {camera}
 🕐 Waktu: {timestamp}
 👥 Jumlah Orang: {person_count}
 